@@ -0,0 +1,41 @@
+"""
+Run the benchmark suite.
+
+    python -m benchmarks --output results.json
+    python -m benchmarks --baseline baseline.json --threshold 0.1
+
+Exits with status 1 when any case regresses against the baseline.
+"""
+
+import argparse
+import sys
+
+from . import cases  # noqa: F401
+from .harness import compare, dump, load, run
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks')
+    parser.add_argument('-o', '--output', help='write results as JSON')
+    parser.add_argument('-b', '--baseline', help='compare against a saved run')
+    parser.add_argument('-k', '--select', help='run only cases matching')
+    parser.add_argument('-r', '--repeat', type=int, default=5)
+    parser.add_argument('-t', '--threshold', type=float, default=0.1)
+    args = parser.parse_args(argv)
+
+    results = run(select=args.select, repeat=args.repeat)
+
+    if args.output:
+        dump(results, args.output)
+
+    if args.baseline:
+        regressions = compare(results, load(args.baseline), threshold=args.threshold)
+
+        if regressions:
+            return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
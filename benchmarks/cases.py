@@ -0,0 +1,255 @@
+import random
+import subprocess
+import sys
+from datetime import datetime, timezone
+from decimal import Decimal
+from uuid import UUID
+
+from dynamodx.expressions import (
+    Add,
+    Delete,
+    Remove,
+    Set,
+    UpdateExpr,
+    if_not_exists,
+    list_append,
+)
+from dynamodx.fake import FakeClient
+from dynamodx.transact_writer import TransactWriter
+from dynamodx.types import deserialize, serialize
+from dynamodx.write_behind import WriteBehindBuffer
+
+from .harness import bench
+from .stub import StubClient
+
+SEED = 42
+
+
+def wide_item(size: int = 200) -> dict:
+    rnd = random.Random(SEED)
+    item: dict = {'pk': 'USER#1', 'sk': '0'}
+
+    for idx in range(size):
+        match idx % 5:
+            case 0:
+                item[f'attr_{idx}'] = f'value-{rnd.random()}'
+            case 1:
+                item[f'attr_{idx}'] = rnd.randint(0, 10**9)
+            case 2:
+                item[f'attr_{idx}'] = Decimal(str(round(rnd.random(), 6)))
+            case 3:
+                item[f'attr_{idx}'] = rnd.random() > 0.5
+            case 4:
+                item[f'attr_{idx}'] = datetime(
+                    2024, 1, 1, tzinfo=timezone.utc
+                ).isoformat()
+
+    return item
+
+
+def deep_item(depth: int = 8, width: int = 4) -> dict:
+    def build(level: int) -> dict:
+        if level == depth:
+            return {'leaf': 'value', 'count': level}
+
+        return {
+            'name': f'level-{level}',
+            'created_at': datetime(2024, 1, 1, tzinfo=timezone.utc),
+            'children': [build(level + 1) for _ in range(2)] if level < 3 else [],
+            **{f'key_{idx}': {'value': idx} for idx in range(width)},
+            'next': build(level + 1),
+        }
+
+    return {'pk': 'TREE#1', 'sk': '0', 'root': build(0)}
+
+
+def set_heavy_item(sets: int = 20, size: int = 50) -> dict:
+    rnd = random.Random(SEED)
+    item: dict = {'pk': 'TAGS#1', 'sk': '0'}
+
+    for idx in range(sets):
+        if idx % 2:
+            item[f'set_{idx}'] = {f'tag-{rnd.random()}' for _ in range(size)}
+        else:
+            item[f'set_{idx}'] = [rnd.randint(0, 10**6) for _ in range(size)]
+
+    return item
+
+
+ITEMS = {
+    'wide': wide_item,
+    'deep': deep_item,
+    'set_heavy': set_heavy_item,
+}
+
+
+def _register_items() -> None:
+    for shape, factory in ITEMS.items():
+
+        @bench(f'serialize/{shape}')
+        def _serialize(factory=factory):
+            item = factory()
+            return lambda: serialize(item)
+
+        @bench(f'deserialize/{shape}')
+        def _deserialize(factory=factory):
+            item = serialize(factory())
+            return lambda: deserialize(item)
+
+
+def update_actions(count: int) -> list:
+    actions = []
+
+    for idx in range(count):
+        match idx % 6:
+            case 0:
+                actions.append(Set(**{f'name_{idx}': f'value-{idx}'}))
+            case 1:
+                actions.append(Set(operand='+', **{f'count_{idx}': 1}))
+            case 2:
+                actions.append(Set(**{f'points_{idx}': if_not_exists(points=0) + 1}))
+            case 3:
+                actions.append(Set(**{f'tags_{idx}': list_append(tags=['a'])}))
+            case 4:
+                actions.append(Add(**{f'total_{idx}': Decimal(idx)}))
+            case 5:
+                actions.append(
+                    Remove(f'old_{idx}')
+                    if idx % 4
+                    else Delete(**{f'emails_{idx}': {'a@b.c'}})
+                )
+
+    return actions
+
+
+def _register_update_exprs() -> None:
+    for count in (1, 10, 50, 200):
+
+        @bench(f'update_expr/{count}')
+        def _update_expr(count=count):
+            actions = update_actions(count)
+            return lambda: UpdateExpr(*actions)
+
+
+@bench('transact_writer/put')
+def _transact_put():
+    item = wide_item(20)
+    client = StubClient()
+
+    def run():
+        with TransactWriter('bench', client=client) as transact:
+            for idx in range(100):
+                transact.put(item=item | {'sk': str(idx)})
+
+    return run
+
+
+@bench('transact_writer/update')
+def _transact_update():
+    client = StubClient()
+    update = UpdateExpr(*update_actions(10))
+
+    def run():
+        with TransactWriter('bench', client=client) as transact:
+            for idx in range(100):
+                transact.update(
+                    {'pk': 'USER#1', 'sk': str(idx)},
+                    cond_expr='attribute_exists(sk)',
+                    **update,
+                )
+
+    return run
+
+
+@bench('transact_writer/flush')
+def _transact_flush():
+    client = StubClient()
+    # Distinct keys, so the 100 deletes are sent as one transaction
+    keys = [{'pk': 'USER#1', 'sk': UUID(int=idx)} for idx in range(100)]
+
+    def run():
+        with TransactWriter('bench', client=client, flush_amount=100) as transact:
+            for key in keys:
+                transact.delete(key)
+
+    return run
+
+
+@bench('write_behind/counters')
+def _write_behind_counters():
+    client = StubClient()
+    views = UpdateExpr(Add(views=Decimal(1)))
+    clicks = UpdateExpr(Set(clicks=if_not_exists(clicks=0) + 1))
+
+    def run():
+        # 1000 increments on 10 hot keys, sent as 10 updates
+        with WriteBehindBuffer('bench', client=client, max_delay=None) as buffer:
+            for idx in range(500):
+                key = {'pk': 'PAGE', 'sk': str(idx % 10)}
+                buffer.update(key, views)
+                buffer.update(key, clicks)
+
+    return run
+
+
+def _startup(code: str):
+    # A fresh interpreter each time, so nothing is already imported
+    def run():
+        subprocess.run([sys.executable, '-c', code], check=True)
+
+    return run
+
+
+@bench('startup/interpreter')
+def _startup_interpreter():
+    return _startup('pass')
+
+
+@bench('startup/import')
+def _startup_import():
+    return _startup(
+        'import dynamodx.transact_writer, dynamodx.batch_writer, '
+        'dynamodx.batch_getter, dynamodx.reader, dynamodx.expressions'
+    )
+
+
+@bench('startup/client')
+def _startup_client():
+    return _startup(
+        "from dynamodx.client import get_client\nget_client(region_name='us-east-1')"
+    )
+
+
+@bench('fake/transact_write_items')
+def _fake_transact():
+    client = FakeClient()
+    client.create_table(
+        TableName='bench',
+        KeySchema=[
+            {'AttributeName': 'pk', 'KeyType': 'HASH'},
+            {'AttributeName': 'sk', 'KeyType': 'RANGE'},
+        ],
+        AttributeDefinitions=[],
+    )
+    update = UpdateExpr(
+        Set(name='Bilbo Baggins'),
+        Set(points=if_not_exists(points=0) + 1),
+        Add(total=Decimal(1)),
+    )
+
+    def run():
+        # 10 operations, sent as one transaction per run
+        with TransactWriter('bench', client=client, flush_amount=10) as transact:
+            for idx in range(5):
+                transact.put(
+                    {'pk': 'USER#1', 'sk': str(idx), 'name': 'Bilbo Baggins'},
+                    cond_expr='attribute_not_exists(sk) OR attribute_exists(#name)',
+                    expr_attr_names={'#name': 'name'},
+                )
+                transact.update({'pk': 'USER#2', 'sk': str(idx)}, **update)
+
+    return run
+
+
+_register_items()
+_register_update_exprs()
@@ -0,0 +1,105 @@
+import json
+import math
+import platform
+import statistics
+import sys
+import timeit
+from importlib.metadata import PackageNotFoundError, version
+from typing import Callable
+
+Case = Callable[[], Callable[[], object]]
+
+cases: dict[str, Case] = {}
+
+
+def bench(name: str) -> Callable[[Case], Case]:
+    """
+    Register a benchmark case.
+
+    The decorated function does the setup and returns the callable being
+    measured, so building fixtures never counts towards the timings.
+    """
+
+    def decorator(fn: Case) -> Case:
+        if name in cases:
+            raise ValueError(f'Duplicate benchmark {name!r}')
+
+        cases[name] = fn
+        return fn
+
+    return decorator
+
+
+def run(
+    *,
+    select: str | None = None,
+    repeat: int = 5,
+    min_time: float = 0.2,
+) -> dict:
+    results = {}
+
+    for name, case in cases.items():
+        if select and select not in name:
+            continue
+
+        fn = case()
+        timer = timeit.Timer(fn)
+        # Calibrate on a trial run, so each timing lasts about `min_time`
+        number, elapsed = timer.autorange()
+        number = max(1, math.ceil(number * min_time / elapsed))
+        timings = [t / number for t in timer.repeat(repeat=repeat, number=number)]
+
+        results[name] = {
+            'number': number,
+            'min': min(timings),
+            'median': statistics.median(timings),
+            'ops': 1 / statistics.median(timings),
+        }
+
+        print(f'{name:<48} {results[name]["median"] * 1e6:>12.2f} us', flush=True)
+
+    return {
+        'python': sys.version.split()[0],
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'dynamodx': _version(),
+        'results': results,
+    }
+
+
+def compare(current: dict, baseline: dict, *, threshold: float) -> list[str]:
+    """Return the names of the cases whose median regressed over `threshold`."""
+    regressions = []
+
+    for name, result in current['results'].items():
+        previous = baseline['results'].get(name)
+
+        if not previous:
+            continue
+
+        change = result['median'] / previous['median'] - 1
+        marker = ' REGRESSION' if change > threshold else ''
+        print(f'{name:<48} {change:>+8.1%}{marker}')
+
+        if change > threshold:
+            regressions.append(name)
+
+    return regressions
+
+
+def load(path: str) -> dict:
+    with open(path) as fp:
+        return json.load(fp)
+
+
+def dump(results: dict, path: str) -> None:
+    with open(path, 'w') as fp:
+        json.dump(results, fp, indent=2, sort_keys=True)
+        fp.write('\n')
+
+
+def _version() -> str:
+    try:
+        return version('dynamodx')
+    except PackageNotFoundError:
+        return 'unknown'
@@ -0,0 +1,168 @@
+"""
+Replay a log written by `dynamodx.recording.RecordingClient`.
+
+    python -m benchmarks.replay traffic.jsonl.gz --endpoint-url http://localhost:8000
+    python -m benchmarks.replay traffic.jsonl --concurrency 16 --rate 500
+
+Calls are sent in the recorded order, `--concurrency` at a time, and at
+most `--rate` per second when given. Throughput and latency percentiles
+are printed per operation, and written as JSON with `--output`.
+"""
+
+import argparse
+import statistics
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Iterable
+
+import boto3
+
+from dynamodx.recording import Record, read_log
+
+from .harness import dump
+
+
+def replay(
+    records: Iterable[Record],
+    client: Any,
+    *,
+    concurrency: int = 8,
+    rate: float | None = None,
+    table_name: str | None = None,
+) -> dict:
+    """
+    Send `records` to `client` and return the latencies and errors per
+    operation. With `table_name`, every call is pointed at that table.
+    """
+    latencies: dict[str, list[float]] = {}
+    errors: Counter[str] = Counter()
+    lock = threading.Lock()
+    slots = threading.Semaphore(concurrency * 2)
+
+    def send(record: Record) -> None:
+        params = record['params']
+
+        if table_name:
+            params = _retarget(params, table_name)
+
+        sent_at = time.perf_counter()
+
+        try:
+            getattr(client, record['op'])(**params)
+        except Exception as err:
+            with lock:
+                errors[f'{record["op"]}: {type(err).__name__}'] += 1
+        finally:
+            latency = time.perf_counter() - sent_at
+
+            with lock:
+                latencies.setdefault(record['op'], []).append(latency)
+
+            slots.release()
+
+    started_at = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for idx, record in enumerate(records):
+            if rate:
+                # Pace calls evenly instead of sending them in bursts
+                delay = started_at + idx / rate - time.perf_counter()
+
+                if delay > 0:
+                    time.sleep(delay)
+
+            # Bounds the records read ahead of the workers
+            slots.acquire()
+            executor.submit(send, record)
+
+    elapsed = time.perf_counter() - started_at
+    calls = sum(len(timings) for timings in latencies.values())
+
+    return {
+        'calls': calls,
+        'elapsed': elapsed,
+        'throughput': calls / elapsed if elapsed else 0,
+        'errors': dict(errors),
+        'operations': {
+            op: _percentiles(timings) for op, timings in sorted(latencies.items())
+        },
+    }
+
+
+def _retarget(params: dict, table_name: str) -> dict:
+    # Table names appear either as `TableName` or as keys of `RequestItems`
+    if 'RequestItems' in params:
+        if len(params['RequestItems']) > 1:
+            return params
+
+        (requests,) = params['RequestItems'].values()
+        return params | {'RequestItems': {table_name: requests}}
+
+    if 'TransactItems' in params:
+        items = [
+            {kind: body | {'TableName': table_name} for kind, body in item.items()}
+            for item in params['TransactItems']
+        ]
+        return params | {'TransactItems': items}
+
+    return params | {'TableName': table_name}
+
+
+def _percentiles(timings: list[float]) -> dict:
+    if len(timings) > 1:
+        quantiles = statistics.quantiles(timings, n=100, method='inclusive')
+    else:
+        quantiles = timings * 99
+    return {
+        'calls': len(timings),
+        'p50': quantiles[49],
+        'p90': quantiles[89],
+        'p99': quantiles[98],
+        'max': max(timings),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.replay')
+    parser.add_argument('log', help='log written by RecordingClient')
+    parser.add_argument('--endpoint-url', default='http://localhost:8000')
+    parser.add_argument('--table-name', help='send every call to this table')
+    parser.add_argument('-c', '--concurrency', type=int, default=8)
+    parser.add_argument('--rate', type=float, help='maximum calls per second')
+    parser.add_argument('-o', '--output', help='write results as JSON')
+    args = parser.parse_args(argv)
+
+    client = boto3.client('dynamodb', endpoint_url=args.endpoint_url)
+    results = replay(
+        read_log(args.log),
+        client,
+        concurrency=args.concurrency,
+        rate=args.rate,
+        table_name=args.table_name,
+    )
+
+    print(f'{results["calls"]} calls in {results["elapsed"]:.2f}s', end=' ')
+    print(f'({results["throughput"]:.1f}/s)')
+
+    for op, stats in results['operations'].items():
+        print(
+            f'{op:<24} {stats["calls"]:>8} '
+            f'p50 {stats["p50"] * 1e3:>8.2f} ms  '
+            f'p90 {stats["p90"] * 1e3:>8.2f} ms  '
+            f'p99 {stats["p99"] * 1e3:>8.2f} ms'
+        )
+
+    for error, count in results['errors'].items():
+        print(f'{error:<48} {count:>8}')
+
+    if args.output:
+        dump(results, args.output)
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,23 @@
+class _ClientError(Exception):
+    def __init__(self, response: dict) -> None:
+        super().__init__(response.get('Error', {}).get('Message', ''))
+        self.response = response
+
+
+class _Exceptions:
+    TransactionCanceledException = type(
+        'TransactionCanceledException', (_ClientError,), {}
+    )
+
+
+class StubClient:
+    """A DynamoDB client that accepts every request without doing any I/O."""
+
+    exceptions = _Exceptions()
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def transact_write_items(self, **kwargs) -> dict:
+        self.calls += 1
+        return {}
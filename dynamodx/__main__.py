@@ -0,0 +1,87 @@
+"""
+Bulk import and export JSONL files.
+
+    python -m dynamodx import pytest items.jsonl.gz --checkpoint items.ckpt
+    python -m dynamodx export pytest backup/ --segments 8 --gzip
+
+Progress is printed to stderr, and the throughput report to stdout.
+"""
+
+import argparse
+import sys
+
+from .bulk import ImportStats, export_jsonl, import_jsonl
+from .client import get_client
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m dynamodx')
+    parser.add_argument('--endpoint-url', help='e.g. http://localhost:8000')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    load = commands.add_parser('import', help='put JSONL lines into a table')
+    load.add_argument('table_name')
+    load.add_argument('paths', nargs='+', metavar='path')
+    load.add_argument('-p', '--processes', type=int, help='serializer processes')
+    load.add_argument('-w', '--workers', type=int, default=8, help='writer threads')
+    load.add_argument('--chunk-size', type=int, default=1000)
+    load.add_argument('--max-pending-chunks', type=int)
+    load.add_argument('--checkpoint', help='resume from and save progress to')
+
+    dump = commands.add_parser('export', help='scan a table to JSONL files')
+    dump.add_argument('table_name')
+    dump.add_argument('directory')
+    dump.add_argument('-s', '--segments', type=int, default=4)
+    dump.add_argument('--gzip', action='store_true', help='compress the files')
+    dump.add_argument('--consistent-read', action='store_true')
+
+    args = parser.parse_args(argv)
+    workers = args.workers if args.command == 'import' else args.segments
+    client = get_client(endpoint_url=args.endpoint_url, max_workers=workers)
+
+    if args.command == 'import':
+        stats = import_jsonl(
+            args.paths,
+            args.table_name,
+            client=client,
+            processes=args.processes,
+            max_workers=args.workers,
+            chunk_size=args.chunk_size,
+            max_pending_chunks=args.max_pending_chunks,
+            checkpoint=args.checkpoint,
+            on_progress=_progress,
+        )
+        print(file=sys.stderr)
+        print(
+            f'{stats["items"]} items from {stats["lines"]} lines '
+            f'in {stats["elapsed"]:.2f}s ({stats["throughput"]:.1f}/s), '
+            f'{stats["batches"]} batches, {stats["unprocessed"]} unprocessed, '
+            f'{stats["skipped_lines"]} lines skipped from the checkpoint'
+        )
+        return 0
+
+    stats = export_jsonl(
+        args.table_name,
+        args.directory,
+        client=client,
+        segments=args.segments,
+        compress=args.gzip,
+        consistent_read=args.consistent_read,
+    )
+    print(
+        f'{stats["items"]} items to {len(stats["files"])} files '
+        f'in {stats["elapsed"]:.2f}s ({stats["throughput"]:.1f}/s)'
+    )
+    return 0
+
+
+def _progress(stats: ImportStats) -> None:
+    print(
+        f'\r{stats["items"]} items ({stats["throughput"]:.1f}/s)',
+        end='',
+        file=sys.stderr,
+    )
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,966 @@
+"""
+Parse and evaluate DynamoDB condition, key condition, update and projection
+expressions against wire-format items, the way DynamoDB does.
+
+Expressions are parsed once into closures and cached by their text, so
+evaluating them again only resolves placeholders and walks the item.
+"""
+
+import re
+from decimal import Context, Decimal, InvalidOperation
+from functools import lru_cache
+from typing import Any, Callable, Mapping, NamedTuple
+
+Item = dict[str, dict]
+Path = tuple[str | int, ...]
+Operand = Callable[[Mapping, Mapping, Mapping], dict | None]
+Predicate = Callable[[Mapping, Mapping, Mapping], bool]
+
+# https://docs.aws.amazon.com/amazondynamodb/latest/developerguide/Expressions.OperatorsAndFunctions.html
+_KEYWORDS = frozenset(
+    {'AND', 'OR', 'NOT', 'BETWEEN', 'IN', 'SET', 'REMOVE', 'ADD', 'DELETE'}
+)
+_TYPES = frozenset({'S', 'SS', 'N', 'NS', 'B', 'BS', 'BOOL', 'NULL', 'L', 'M'})
+_CONTEXT = Context(prec=38)
+_TOKEN = re.compile(
+    r"""
+    \s*(?:
+        (?P<name>\#[A-Za-z0-9_]+)
+      | (?P<value>:[A-Za-z0-9_]+)
+      | \[\s*(?P<index>\d+)\s*\]
+      | (?P<op><>|<=|>=|[=<>(),.+\-])
+      | (?P<ident>[A-Za-z_][A-Za-z0-9_]*)
+    )
+    """,
+    re.VERBOSE,
+)
+
+
+class ExpressionError(ValueError):
+    """An expression, or its evaluation, that DynamoDB rejects
+    with a `ValidationException`."""
+
+    def __init__(self, msg: str = '') -> None:
+        super().__init__(msg)
+        self.msg = msg
+
+
+class Condition(NamedTuple):
+    test: Predicate
+    names: frozenset[str]
+    values: frozenset[str]
+
+    def __call__(self, item: Mapping, names: Mapping, values: Mapping) -> bool:
+        return self.test(item, names, values)
+
+
+class KeyCondition(NamedTuple):
+    test: Predicate
+    names: frozenset[str]
+    values: frozenset[str]
+    equalities: tuple[tuple[Path, str], ...]
+
+    def __call__(self, item: Mapping, names: Mapping, values: Mapping) -> bool:
+        return self.test(item, names, values)
+
+
+class Update(NamedTuple):
+    actions: tuple[tuple[str, Path, Operand | None], ...]
+    names: frozenset[str]
+    values: frozenset[str]
+
+    def __call__(self, item: Mapping, names: Mapping, values: Mapping) -> Item:
+        return apply_update(self, item, names, values)
+
+
+class Projection(NamedTuple):
+    paths: tuple[Path, ...]
+    names: frozenset[str]
+    values: frozenset[str] = frozenset()
+
+    def __call__(self, item: Mapping, names: Mapping) -> Item:
+        return project(self, item, names)
+
+
+@lru_cache(maxsize=1024)
+def parse_condition(expr: str) -> Condition:
+    parser = _Parser(expr)
+    test = parser.condition()
+    parser.end()
+    return Condition(test, frozenset(parser.names), frozenset(parser.values))
+
+
+@lru_cache(maxsize=1024)
+def parse_key_condition(expr: str) -> KeyCondition:
+    parser = _Parser(expr)
+    terms = [parser.primary()]
+
+    # Key conditions only allow `AND`, and no nesting
+    while parser.keyword('AND'):
+        terms.append(parser.primary())
+
+    parser.end()
+    return KeyCondition(
+        lambda *args: all(term(*args) for term in terms),
+        frozenset(parser.names),
+        frozenset(parser.values),
+        tuple(parser.equalities),
+    )
+
+
+@lru_cache(maxsize=1024)
+def parse_update(expr: str) -> Update:
+    parser = _Parser(expr)
+    actions = parser.update()
+    parser.end()
+    return Update(actions, frozenset(parser.names), frozenset(parser.values))
+
+
+@lru_cache(maxsize=1024)
+def parse_projection(expr: str) -> Projection:
+    parser = _Parser(expr)
+    paths = [parser.path()]
+
+    while parser.accept(','):
+        paths.append(parser.path())
+
+    parser.end()
+    return Projection(tuple(paths), frozenset(parser.names))
+
+
+def resolve(path: Path, names: Mapping) -> Path:
+    """Replace the `#name` placeholders of a path with attribute names."""
+    if not any(isinstance(seg, str) and seg[0] == '#' for seg in path):
+        return path
+
+    try:
+        return tuple(
+            names[seg] if isinstance(seg, str) and seg[0] == '#' else seg
+            for seg in path
+        )
+    except KeyError as err:
+        raise ExpressionError(
+            'An expression attribute name used in the document path '
+            f'is not defined; attribute name: {err.args[0]}'
+        ) from None
+
+
+def get_path(item: Mapping, path: Path) -> dict | None:
+    value = item.get(path[0])  # type: ignore
+
+    for seg in path[1:]:
+        if value is None:
+            return None
+
+        if isinstance(seg, int):
+            elements = value.get('L')
+
+            if elements is None or seg >= len(elements):
+                return None
+
+            value = elements[seg]
+        else:
+            attrs = value.get('M')
+            value = None if attrs is None else attrs.get(seg)
+
+    return value
+
+
+def copy_item(item: Mapping) -> Item:
+    return {k: _copy(v) for k, v in item.items()}
+
+
+def apply_update(
+    update: Update, item: Mapping, names: Mapping, values: Mapping
+) -> Item:
+    """Return a copy of `item` with the update actions applied."""
+    # Every operand is evaluated against the item as it was before the update
+    actions = [
+        (kind, resolve(path, names), operand(item, names, values) if operand else None)
+        for kind, path, operand in update.actions
+    ]
+    _check_overlaps([path for _, path, _ in actions])
+    new = copy_item(item)
+
+    # Removing list elements by their original index means going backwards
+    removes = sorted(
+        (path for kind, path, _ in actions if kind == 'REMOVE'), reverse=True
+    )
+
+    for kind, path, value in actions:
+        if kind == 'SET':
+            _set(new, path, value)  # type: ignore
+        elif kind == 'ADD':
+            _add(new, path, value)  # type: ignore
+        elif kind == 'DELETE':
+            _delete(new, path, value)  # type: ignore
+
+    for path in removes:
+        _remove(new, path)
+
+    return new
+
+
+def project(projection: Projection, item: Mapping, names: Mapping) -> Item:
+    projected: Item = {}
+
+    for path in projection.paths:
+        path = resolve(path, names)
+        value = get_path(item, path)
+
+        if value is None:
+            continue
+
+        if len(path) == 1:
+            projected[path[0]] = value  # type: ignore
+            continue
+
+        # Rebuild the enclosing maps and lists, keeping only projected elements
+        node = projected.setdefault(path[0], _container(path[1]))  # type: ignore
+
+        for seg, next_seg in zip(path[1:-1], path[2:]):
+            node = _child(node, seg, _container(next_seg))
+
+        _child(node, path[-1], value, replace=True)
+
+    return projected
+
+
+def equal(a: dict, b: dict) -> bool:
+    ((ta, va),) = a.items()
+    ((tb, vb),) = b.items()
+
+    if ta != tb:
+        return False
+
+    match ta:
+        case 'N':
+            return _decimal(va) == _decimal(vb)
+        case 'B':
+            return _bytes(va) == _bytes(vb)
+        case 'SS':
+            return set(va) == set(vb)
+        case 'NS':
+            return set(map(_decimal, va)) == set(map(_decimal, vb))
+        case 'BS':
+            return set(map(_bytes, va)) == set(map(_bytes, vb))
+        case 'L':
+            return len(va) == len(vb) and all(map(equal, va, vb))
+        case 'M':
+            return va.keys() == vb.keys() and all(equal(va[k], vb[k]) for k in va)
+
+    return va == vb
+
+
+def sort_key(value: dict) -> Any:
+    """Order S, N and B key values the way DynamoDB sorts them."""
+    ((dynamodb_type, v),) = value.items()
+
+    match dynamodb_type:
+        case 'N':
+            return _decimal(v)
+        case 'B':
+            return _bytes(v)
+
+    # UTF-8 byte order is the same as code point order
+    return v
+
+
+class _Parser:
+    def __init__(self, expr: str) -> None:
+        self.expr = expr
+        self.tokens = _tokenize(expr)
+        self.pos = 0
+        self.names: set[str] = set()
+        self.values: set[str] = set()
+        self.equalities: list[tuple[Path, str]] = []
+
+    # Tokens
+
+    def peek(self, offset: int = 0) -> tuple[str, str]:
+        return self.tokens[self.pos + offset]
+
+    def next(self) -> tuple[str, str]:
+        token = self.tokens[self.pos]
+        self.pos += 1
+        return token
+
+    def accept(self, op: str) -> bool:
+        if self.peek() == ('op', op):
+            self.pos += 1
+            return True
+
+        return False
+
+    def expect(self, op: str) -> None:
+        if not self.accept(op):
+            self.error()
+
+    def keyword(self, word: str) -> bool:
+        kind, text = self.peek()
+
+        if kind == 'ident' and text.upper() == word:
+            self.pos += 1
+            return True
+
+        return False
+
+    def function(self, *funcs: str) -> str | None:
+        kind, text = self.peek()
+
+        if kind == 'ident' and text in funcs and self.peek(1) == ('op', '('):
+            self.pos += 2
+            return text
+
+        return None
+
+    def end(self) -> None:
+        if self.peek()[0] != 'end':
+            self.error()
+
+    def error(self) -> None:
+        kind, text = self.peek()
+        token = text or '<EOF>'
+        raise ExpressionError(
+            f'Invalid expression: Syntax error; token: "{token}", near: "{self.expr}"'
+        )
+
+    # Operands
+
+    def path(self) -> Path:
+        segments: list[str | int] = [self.segment()]
+
+        while True:
+            kind, text = self.peek()
+
+            if kind == 'index':
+                self.pos += 1
+                segments.append(int(text))
+            elif self.accept('.'):
+                segments.append(self.segment())
+            else:
+                return tuple(segments)
+
+    def segment(self) -> str:
+        kind, text = self.next()
+
+        if kind == 'name':
+            self.names.add(text)
+            return text
+
+        if kind == 'ident' and text.upper() not in _KEYWORDS:
+            return text
+
+        self.pos -= 1
+        self.error()
+        raise AssertionError  # unreachable
+
+    def value(self) -> Operand:
+        _, token = self.next()
+        self.values.add(token)
+
+        def value(item: Mapping, names: Mapping, values: Mapping) -> dict:
+            try:
+                return values[token]
+            except KeyError:
+                raise ExpressionError(
+                    'An expression attribute value used in expression '
+                    f'is not defined; attribute value: {token}'
+                ) from None
+
+        value.token = token  # type: ignore
+        return value
+
+    def path_operand(self) -> Operand:
+        path = self.path()
+
+        def operand(item: Mapping, names: Mapping, values: Mapping) -> dict | None:
+            return get_path(item, resolve(path, names))
+
+        operand.path = path  # type: ignore
+        return operand
+
+    def operand(self) -> Operand:
+        if self.function('size'):
+            inner = self.path_operand()
+            self.expect(')')
+            return lambda *args: _size(inner(*args))
+
+        if self.peek()[0] == 'value':
+            return self.value()
+
+        return self.path_operand()
+
+    def equality(self, left: Operand, right: Operand) -> None:
+        # Remembers `path = :value` terms, so a key condition
+        # can be matched against partitions without a full scan
+        for a, b in ((left, right), (right, left)):
+            if hasattr(a, 'path') and hasattr(b, 'token'):
+                self.equalities.append((a.path, b.token))  # type: ignore
+
+    # Conditions
+
+    def condition(self) -> Predicate:
+        terms = [self.conjunction()]
+
+        while self.keyword('OR'):
+            terms.append(self.conjunction())
+
+        if len(terms) == 1:
+            return terms[0]
+
+        return lambda *args: any(term(*args) for term in terms)
+
+    def conjunction(self) -> Predicate:
+        terms = [self.negation()]
+
+        while self.keyword('AND'):
+            terms.append(self.negation())
+
+        if len(terms) == 1:
+            return terms[0]
+
+        return lambda *args: all(term(*args) for term in terms)
+
+    def negation(self) -> Predicate:
+        if self.keyword('NOT'):
+            inner = self.negation()
+            return lambda *args: not inner(*args)
+
+        return self.primary()
+
+    def primary(self) -> Predicate:
+        if self.accept('('):
+            inner = self.condition()
+            self.expect(')')
+            return inner
+
+        if func := self.function('attribute_exists', 'attribute_not_exists'):
+            inner = self.path_operand()
+            self.expect(')')
+
+            if func == 'attribute_exists':
+                return lambda *args: inner(*args) is not None
+
+            return lambda *args: inner(*args) is None
+
+        if func := self.function('attribute_type', 'begins_with', 'contains'):
+            inner = self.path_operand()
+            self.expect(',')
+            arg = self.operand()
+            self.expect(')')
+            test = _FUNCTIONS[func]
+            return lambda *args: test(inner(*args), arg(*args))
+
+        left = self.operand()
+        kind, text = self.peek()
+
+        if kind == 'op' and text in _COMPARATORS:
+            self.pos += 1
+            right = self.operand()
+
+            if text == '=':
+                self.equality(left, right)
+
+            return lambda *args: _compare(text, left(*args), right(*args))
+
+        if self.keyword('BETWEEN'):
+            low = self.operand()
+
+            if not self.keyword('AND'):
+                self.error()
+
+            high = self.operand()
+            return lambda *args: _between(left(*args), low(*args), high(*args))
+
+        if self.keyword('IN'):
+            self.expect('(')
+            operands = [self.operand()]
+
+            while self.accept(','):
+                operands.append(self.operand())
+
+            self.expect(')')
+
+            if len(operands) > 100:
+                raise ExpressionError('Too many operands for IN; maximum is 100')
+
+            return lambda *args: _is_in(left(*args), [op(*args) for op in operands])
+
+        self.error()
+        raise AssertionError  # unreachable
+
+    # Updates
+
+    def update(self) -> tuple[tuple[str, Path, Operand | None], ...]:
+        actions: list[tuple[str, Path, Operand | None]] = []
+        seen: set[str] = set()
+
+        while self.peek()[0] != 'end':
+            kind, text = self.next()
+            clause = text.upper()
+
+            if kind != 'ident' or clause not in ('SET', 'REMOVE', 'ADD', 'DELETE'):
+                self.pos -= 1
+                self.error()
+
+            if clause in seen:
+                raise ExpressionError(
+                    f'Invalid UpdateExpression: The "{clause}" section '
+                    'can only be used once in an update expression'
+                )
+
+            seen.add(clause)
+
+            while True:
+                actions.append(self.action(clause))
+
+                if not self.accept(','):
+                    break
+
+        if not actions:
+            self.error()
+
+        return tuple(actions)
+
+    def action(self, clause: str) -> tuple[str, Path, Operand | None]:
+        path = self.path()
+
+        if clause == 'REMOVE':
+            return clause, path, None
+
+        if clause == 'SET':
+            self.expect('=')
+            return clause, path, self.set_value()
+
+        if self.peek()[0] != 'value':
+            self.error()
+
+        return clause, path, self.value()
+
+    def set_value(self) -> Operand:
+        left = self.set_operand()
+
+        if self.accept('+'):
+            right = self.set_operand()
+            return lambda *args: _arithmetic('+', left(*args), right(*args))
+
+        if self.accept('-'):
+            right = self.set_operand()
+            return lambda *args: _arithmetic('-', left(*args), right(*args))
+
+        return lambda *args: _required(left(*args))
+
+    def set_operand(self) -> Operand:
+        if self.function('if_not_exists'):
+            path = self.path_operand()
+            self.expect(',')
+            default = self.set_operand()
+            self.expect(')')
+            return lambda *args: path(*args) or _required(default(*args))
+
+        if self.function('list_append'):
+            first = self.set_operand()
+            self.expect(',')
+            second = self.set_operand()
+            self.expect(')')
+            return lambda *args: _list_append(first(*args), second(*args))
+
+        if self.peek()[0] == 'value':
+            return self.value()
+
+        return self.path_operand()
+
+
+def _tokenize(expr: str) -> list[tuple[str, str]]:
+    tokens = []
+    pos = 0
+    end = len(expr.rstrip())
+
+    while pos < end:
+        match = _TOKEN.match(expr, pos)
+
+        if not match:
+            token = expr[pos:].strip()[:1]
+            raise ExpressionError(
+                f'Invalid expression: Syntax error; token: "{token}", near: "{expr}"'
+            )
+
+        kind = match.lastgroup
+        tokens.append((kind, match.group(kind)))  # type: ignore
+        pos = match.end()
+
+    tokens.append(('end', ''))
+    return tokens
+
+
+# Evaluation
+
+
+def _decimal(value: str) -> Decimal:
+    try:
+        return Decimal(value)
+    except InvalidOperation:
+        raise ExpressionError(f'Invalid number: {value}') from None
+
+
+def _bytes(value: Any) -> bytes:
+    return value.encode() if isinstance(value, str) else bytes(value)
+
+
+def _format(value: Decimal) -> str:
+    return format(value.normalize(_CONTEXT), 'f')
+
+
+def _copy(value: dict) -> dict:
+    ((dynamodb_type, v),) = value.items()
+
+    match dynamodb_type:
+        case 'L':
+            return {'L': [_copy(x) for x in v]}
+        case 'M':
+            return {'M': {k: _copy(x) for k, x in v.items()}}
+        case 'SS' | 'NS' | 'BS':
+            return {dynamodb_type: list(v)}
+
+    return {dynamodb_type: v}
+
+
+def _size(value: dict | None) -> dict | None:
+    if value is None:
+        return None
+
+    ((dynamodb_type, v),) = value.items()
+
+    match dynamodb_type:
+        case 'S':
+            return {'N': str(len(v))}
+        case 'B':
+            return {'N': str(len(_bytes(v)))}
+        case 'SS' | 'NS' | 'BS' | 'L' | 'M':
+            return {'N': str(len(v))}
+
+    raise ExpressionError(
+        'Invalid ConditionExpression: Incorrect operand type for operator or '
+        f'function; operator or function: size, operand type: {dynamodb_type}'
+    )
+
+
+_COMPARATORS = frozenset({'=', '<>', '<', '<=', '>', '>='})
+
+
+def _compare(op: str, a: dict | None, b: dict | None) -> bool:
+    # A missing attribute is never equal to, nor ordered against, a value
+    if a is None or b is None:
+        return op == '<>'
+
+    if op == '=':
+        return equal(a, b)
+
+    if op == '<>':
+        return not equal(a, b)
+
+    ((ta, _),) = a.items()
+    ((tb, _),) = b.items()
+
+    if ta != tb or ta not in ('S', 'N', 'B'):
+        return False
+
+    x, y = sort_key(a), sort_key(b)
+
+    match op:
+        case '<':
+            return x < y
+        case '<=':
+            return x <= y
+        case '>':
+            return x > y
+
+    return x >= y
+
+
+def _between(value: dict | None, low: dict | None, high: dict | None) -> bool:
+    if value is None or low is None or high is None:
+        return False
+
+    types = {next(iter(v)) for v in (value, low, high)}
+
+    if len(types) > 1 or types - {'S', 'N', 'B'}:
+        return False
+
+    if sort_key(low) > sort_key(high):
+        raise ExpressionError(
+            'Invalid ConditionExpression: The BETWEEN operator requires upper '
+            'bound to be greater than or equal to lower bound'
+        )
+
+    return sort_key(low) <= sort_key(value) <= sort_key(high)
+
+
+def _is_in(value: dict | None, candidates: list[dict | None]) -> bool:
+    return value is not None and any(
+        c is not None and equal(value, c) for c in candidates
+    )
+
+
+def _attribute_type(value: dict | None, type_: dict | None) -> bool:
+    if type_ is None or 'S' not in type_ or type_['S'] not in _TYPES:
+        raise ExpressionError(
+            'Invalid ConditionExpression: Invalid attribute type name found; '
+            f'type: {type_}, valid types: {{{", ".join(sorted(_TYPES))}}}'
+        )
+
+    return value is not None and type_['S'] in value
+
+
+def _begins_with(value: dict | None, prefix: dict | None) -> bool:
+    if value is None or prefix is None:
+        return False
+
+    if 'S' in value and 'S' in prefix:
+        return value['S'].startswith(prefix['S'])
+
+    if 'B' in value and 'B' in prefix:
+        return _bytes(value['B']).startswith(_bytes(prefix['B']))
+
+    return False
+
+
+def _contains(value: dict | None, operand: dict | None) -> bool:
+    if value is None or operand is None:
+        return False
+
+    ((dynamodb_type, v),) = value.items()
+
+    match dynamodb_type:
+        case 'S':
+            return 'S' in operand and operand['S'] in v
+        case 'B':
+            return 'B' in operand and _bytes(operand['B']) in _bytes(v)
+        case 'SS' | 'NS' | 'BS':
+            element_type = dynamodb_type[0]
+            return element_type in operand and any(
+                equal({element_type: x}, operand) for x in v
+            )
+        case 'L':
+            return any(equal(x, operand) for x in v)
+
+    return False
+
+
+_FUNCTIONS: dict[str, Callable[[dict | None, dict | None], bool]] = {
+    'attribute_type': _attribute_type,
+    'begins_with': _begins_with,
+    'contains': _contains,
+}
+
+
+def _required(value: dict | None) -> dict:
+    if value is None:
+        raise ExpressionError(
+            'The provided expression refers to an attribute '
+            'that does not exist in the item'
+        )
+
+    return value
+
+
+def _arithmetic(op: str, a: dict | None, b: dict | None) -> dict:
+    a, b = _required(a), _required(b)
+
+    if 'N' not in a or 'N' not in b:
+        raise ExpressionError(
+            'An operand in the update expression has an incorrect data type'
+        )
+
+    x, y = _decimal(a['N']), _decimal(b['N'])
+    result = _CONTEXT.add(x, y) if op == '+' else _CONTEXT.subtract(x, y)
+    return {'N': _format(result)}
+
+
+def _list_append(a: dict | None, b: dict | None) -> dict:
+    a, b = _required(a), _required(b)
+
+    if 'L' not in a or 'L' not in b:
+        raise ExpressionError(
+            'Invalid UpdateExpression: Incorrect operand type for operator or '
+            'function; operator or function: list_append'
+        )
+
+    return {'L': [*a['L'], *b['L']]}
+
+
+def _check_overlaps(paths: list[Path]) -> None:
+    for idx, path in enumerate(paths):
+        for other in paths[idx + 1 :]:
+            shortest = min(len(path), len(other))
+
+            if path[:shortest] == other[:shortest]:
+                raise ExpressionError(
+                    'Invalid UpdateExpression: Two document paths overlap with '
+                    'each other; must remove or rewrite one of these paths'
+                )
+
+
+def _parent(item: Item, path: Path) -> dict | None:
+    if len(path) == 1:
+        return None
+
+    parent = get_path(item, path[:-1])
+
+    if parent is None:
+        raise ExpressionError(
+            'The document path provided in the update expression is invalid for update'
+        )
+
+    return parent
+
+
+def _set(item: Item, path: Path, value: dict) -> None:
+    parent = _parent(item, path)
+    last = path[-1]
+
+    if parent is None:
+        item[last] = value  # type: ignore
+    elif isinstance(last, int) and 'L' in parent:
+        elements = parent['L']
+
+        # Setting past the end of a list appends to it
+        if last < len(elements):
+            elements[last] = value
+        else:
+            elements.append(value)
+    elif isinstance(last, str) and 'M' in parent:
+        parent['M'][last] = value
+    else:
+        raise ExpressionError(
+            'The document path provided in the update expression is invalid for update'
+        )
+
+
+def _remove(item: Item, path: Path) -> None:
+    if len(path) == 1:
+        item.pop(path[0], None)  # type: ignore
+        return
+
+    parent = get_path(item, path[:-1])
+    last = path[-1]
+
+    if parent is None:
+        return
+
+    if isinstance(last, int) and 'L' in parent:
+        if last < len(parent['L']):
+            del parent['L'][last]
+    elif isinstance(last, str) and 'M' in parent:
+        parent['M'].pop(last, None)
+    else:
+        raise ExpressionError(
+            'The document path provided in the update expression is invalid for update'
+        )
+
+
+def _add(item: Item, path: Path, value: dict) -> None:
+    ((dynamodb_type, v),) = value.items()
+    current = get_path(item, path)
+
+    if dynamodb_type not in ('N', 'SS', 'NS', 'BS'):
+        raise ExpressionError(
+            'Invalid UpdateExpression: Incorrect operand type for operator or '
+            f'function; operator: ADD, operand type: {_type_name(dynamodb_type)}'
+        )
+
+    if current is None:
+        _set(item, path, _copy(value))
+    elif dynamodb_type not in current:
+        raise ExpressionError(
+            'An operand in the update expression has an incorrect data type'
+        )
+    elif dynamodb_type == 'N':
+        result = _CONTEXT.add(_decimal(current['N']), _decimal(v))
+        _set(item, path, {'N': _format(result)})
+    else:
+        _set(
+            item,
+            path,
+            {dynamodb_type: _union(dynamodb_type, current[dynamodb_type], v)},
+        )
+
+
+def _delete(item: Item, path: Path, value: dict) -> None:
+    ((dynamodb_type, v),) = value.items()
+    current = get_path(item, path)
+
+    if dynamodb_type not in ('SS', 'NS', 'BS'):
+        raise ExpressionError(
+            'Invalid UpdateExpression: Incorrect operand type for operator or '
+            f'function; operator: DELETE, operand type: {_type_name(dynamodb_type)}'
+        )
+
+    if current is None:
+        return
+
+    if dynamodb_type not in current:
+        raise ExpressionError(
+            'An operand in the update expression has an incorrect data type'
+        )
+
+    removed = {_element_key(dynamodb_type, x) for x in v}
+    elements = [
+        x
+        for x in current[dynamodb_type]
+        if _element_key(dynamodb_type, x) not in removed
+    ]
+
+    # Sets can't be empty, so removing the last element removes the attribute
+    if elements:
+        _set(item, path, {dynamodb_type: elements})
+    else:
+        _remove(item, path)
+
+
+def _union(dynamodb_type: str, current: list, added: list) -> list:
+    seen = {_element_key(dynamodb_type, x) for x in current}
+    elements = list(current)
+
+    for x in added:
+        key = _element_key(dynamodb_type, x)
+
+        if key not in seen:
+            seen.add(key)
+            elements.append(x)
+
+    return elements
+
+
+def _element_key(dynamodb_type: str, value: Any) -> Any:
+    match dynamodb_type:
+        case 'NS':
+            return _decimal(value)
+        case 'BS':
+            return _bytes(value)
+
+    return value
+
+
+def _type_name(dynamodb_type: str) -> str:
+    return {'L': 'LIST', 'M': 'MAP', 'BOOL': 'BOOLEAN'}.get(
+        dynamodb_type, dynamodb_type
+    )
+
+
+def _container(next_seg: str | int) -> dict:
+    return {'L': []} if isinstance(next_seg, int) else {'M': {}}
+
+
+def _child(node: dict, seg: str | int, default: dict, replace: bool = False) -> dict:
+    if isinstance(seg, int):
+        # Projected list elements are packed in the order they're requested
+        node['L'].append(default)
+        return default
+
+    if replace:
+        node['M'][seg] = default
+        return default
+
+    return node['M'].setdefault(seg, default)
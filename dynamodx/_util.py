@@ -0,0 +1,29 @@
+import gzip
+import random
+from itertools import islice
+from typing import IO, Iterable, Iterator, TypeVar
+
+T = TypeVar('T')
+
+
+def full_jitter(attempt: int, base: float, cap: float) -> float:
+    """
+    Return how long to wait before retry `attempt`, with exponential backoff
+    and full jitter, see https://aws.amazon.com/blogs/architecture/exponential-backoff-and-jitter/
+    """
+    return random.uniform(0, min(cap, base * 2 ** (attempt - 1)))
+
+
+def batched(values: Iterable[T], size: int) -> Iterator[list[T]]:
+    values = iter(values)
+
+    while chunk := list(islice(values, size)):
+        yield chunk
+
+
+def open_text(path: str, mode: str) -> IO[str]:
+    """Open a UTF-8 text file, gzip-compressed when `path` ends with `.gz`."""
+    if path.endswith('.gz'):
+        return gzip.open(path, mode, encoding='utf-8')  # type: ignore
+
+    return open(path, mode[0], encoding='utf-8')
@@ -0,0 +1,168 @@
+import asyncio
+import inspect
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Awaitable, Callable, Protocol, Self
+
+from .cache import ItemCache
+from .transact_writer import (
+    TRANSACT_WRITE_LIMIT,
+    BaseTransactWriter,
+    FlushStats,
+    RetryPolicy,
+    TransactOperation,
+)
+
+
+class AsyncDynamoDBClient(Protocol):
+    """The subset of an aiobotocore-style DynamoDB client used by the writer."""
+
+    exceptions: Any
+
+    async def transact_write_items(self, **kwargs) -> dict: ...
+
+
+class AsyncTransactWriter(BaseTransactWriter):
+    """
+    An asyncio counterpart of `TransactWriter`, with the same `put`, `update`,
+    `delete` and `condition` methods, awaited instead of called.
+
+    ```python
+    async with AsyncTransactWriter('pytest', client=client) as transact:
+        await transact.put(item={'pk': 'USER', 'sk': '0'})
+    ```
+
+    Works with async clients (e.g. aiobotocore). A plain boto3 client is
+    called from a thread pool so it doesn't block the event loop. Up to
+    `max_workers` chunks are sent concurrently.
+    """
+
+    def __init__(
+        self,
+        table_name: str,
+        *,
+        flush_amount: int = TRANSACT_WRITE_LIMIT,
+        client: AsyncDynamoDBClient | Any,
+        fail_fast: bool = True,
+        max_workers: int = 4,
+        ordered: bool = True,
+        key_attrs: tuple[str, ...] = ('pk', 'sk'),
+        retry: RetryPolicy | None = None,
+        cache: ItemCache | None = None,
+        on_flush: Callable[[FlushStats], None] | None = None,
+    ) -> None:
+        super().__init__(
+            table_name,
+            flush_amount=flush_amount,
+            client=client,
+            fail_fast=fail_fast,
+            max_workers=max_workers,
+            ordered=ordered,
+            key_attrs=key_attrs,
+            retry=retry,
+            cache=cache,
+            on_flush=on_flush,
+        )
+        self._is_async = inspect.iscoroutinefunction(client.transact_write_items)
+        self._executor: ThreadPoolExecutor | None = None
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(self, *exc_details) -> None:
+        try:
+            while self._items_buffer:
+                await self._flush()
+        finally:
+            await self._drain()
+
+    def _add_op_and_process(self, op: TransactOperation) -> Awaitable[None]:
+        self._buffer(op)
+        return self._flush_if_needed()
+
+    async def _flush_if_needed(self) -> None:
+        if self._should_flush():
+            await self._flush()
+
+    async def _flush(self) -> None:
+        items_to_send = self._next_chunk()
+        keys, conflicts = self._conflicts(items_to_send)
+        await self._wait(conflicts)
+
+        while len(self._in_flight) >= self._max_workers:
+            done, _ = await asyncio.wait(
+                self._in_flight,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            await self._wait(done)
+
+        task = asyncio.create_task(self._send(items_to_send))
+        self._in_flight[task] = keys
+
+    async def _wait(self, tasks) -> None:
+        for task in tasks:
+            del self._in_flight[task]
+            # Re-raises the exception mapped by `_send`, if any
+            await task
+
+    async def _drain(self) -> None:
+        try:
+            await self._wait(list(self._in_flight))
+        finally:
+            tasks = list(self._in_flight)
+            self._in_flight.clear()
+
+            for task in tasks:
+                task.cancel()
+
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+            if self._executor:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+
+    async def _send(self, items_to_send: list[TransactOperation]) -> bool:
+        started_at = time.perf_counter()
+        request = self._request(items_to_send)
+        stats = self._flush_stats(items_to_send)
+        attempt = 0
+
+        try:
+            while True:
+                attempt += 1
+                sent_at = time.perf_counter()
+
+                try:
+                    response = await self._transact_write_items(**request)
+                except self._client.exceptions.TransactionCanceledException as err:
+                    self._record(stats, sent_at, err.response)
+                    delay = self._retry_delay(err, attempt)
+
+                    if delay is None:
+                        raise self._canceled(err, items_to_send) from err
+
+                    await asyncio.sleep(delay)
+                else:
+                    self._record(stats, sent_at, response)
+                    self._committed(items_to_send)
+                    stats['committed'] = True
+                    return True
+        finally:
+            self._report(stats, started_at)
+
+    async def _transact_write_items(self, **kwargs) -> dict:
+        if self._is_async:
+            return await self._client.transact_write_items(**kwargs)
+
+        if not self._executor:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self._max_workers,
+                thread_name_prefix='AsyncTransactWriter',
+            )
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor,
+            partial(self._client.transact_write_items, **kwargs),
+        )
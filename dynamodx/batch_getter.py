@@ -0,0 +1,140 @@
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from itertools import islice
+from typing import TYPE_CHECKING, Iterable, Iterator, Mapping
+
+from ._util import batched, full_jitter
+from .expressions import CompactPlaceholders
+from .types import NumberMode, deserialize, hashable_key, serialize
+
+if TYPE_CHECKING:
+    from mypy_boto3_dynamodb.client import DynamoDBClient
+else:
+    DynamoDBClient = object
+
+BATCH_GET_LIMIT = 100
+
+
+class UnprocessedKeysError(Exception):
+    def __init__(
+        self,
+        msg: str = '',
+        *,
+        unprocessed_keys: dict,
+    ) -> None:
+        super().__init__(msg)
+        self.msg = msg
+        self.unprocessed_keys = unprocessed_keys
+
+
+class BatchGetter:
+    """
+    Fetch items by key with `batch_get_item`.
+
+    ```python
+    getter = BatchGetter('pytest', client=client)
+
+    for item in getter.get({'pk': 'USER', 'sk': str(idx)} for idx in range(1000)):
+        ...
+    ```
+
+    Keys are de-duplicated and split into 100-key requests, sent up to
+    `max_workers` at a time. `UnprocessedKeys` are resubmitted with
+    exponential backoff and full jitter. Items are yielded as chunks
+    complete, in no particular order, and missing keys are skipped.
+    """
+
+    def __init__(
+        self,
+        table_name: str,
+        *,
+        client: DynamoDBClient,
+        max_workers: int = 4,
+        consistent_read: bool = False,
+        projection: Iterable[str] | None = None,
+        number: NumberMode = 'decimal',
+        max_retries: int = 8,
+        backoff_base: float = 0.05,
+        backoff_max: float = 5.0,
+    ) -> None:
+        if max_workers < 1:
+            raise ValueError('max_workers must be at least 1')
+
+        self._table_name = table_name
+        self._client = client
+        self._max_workers = max_workers
+        self._number = number
+        self._max_retries = max_retries
+        self._backoff_base = backoff_base
+        self._backoff_max = backoff_max
+        self._request: dict = {'ConsistentRead': consistent_read}
+
+        if projection:
+            placeholders = CompactPlaceholders()
+            self._request['ProjectionExpression'] = ', '.join(
+                placeholders.name(path) for path in projection
+            )
+            self._request['ExpressionAttributeNames'] = placeholders.names
+
+    def get(self, keys: Iterable[Mapping]) -> Iterator[dict]:
+        chunks = batched(_unique(keys), BATCH_GET_LIMIT)
+        executor = ThreadPoolExecutor(
+            max_workers=self._max_workers,
+            thread_name_prefix='BatchGetter',
+        )
+        in_flight: set[Future] = set()
+
+        try:
+            # Keep the pool busy while never holding
+            # more than `max_workers` chunks in memory
+            for chunk in islice(chunks, self._max_workers):
+                in_flight.add(executor.submit(self._fetch, chunk))
+
+            while in_flight:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    if chunk := next(chunks, None):
+                        in_flight.add(executor.submit(self._fetch, chunk))
+
+                    for item in future.result():
+                        yield deserialize(item, number=self._number)
+        finally:
+            for future in in_flight:
+                future.cancel()
+
+            executor.shutdown(wait=False)
+
+    def _fetch(self, keys: list[dict]) -> list[dict]:
+        items: list[dict] = []
+        request_items = {self._table_name: self._request | {'Keys': keys}}
+        attempts = 0
+
+        while request_items:
+            if attempts > self._max_retries:
+                raise UnprocessedKeysError(
+                    f'Keys still unprocessed after {self._max_retries} retries',
+                    unprocessed_keys=request_items,
+                )
+
+            if attempts:
+                time.sleep(full_jitter(attempts, self._backoff_base, self._backoff_max))
+
+            attempts += 1
+            response = self._client.batch_get_item(RequestItems=request_items)
+            items.extend(response['Responses'].get(self._table_name, []))
+            request_items = response.get('UnprocessedKeys') or {}
+
+        return items
+
+
+def _unique(keys: Iterable[Mapping]) -> Iterator[dict]:
+    seen = set()
+
+    for key in keys:
+        serialized = serialize(key)
+        hashable = hashable_key(serialized)
+
+        if hashable not in seen:
+            seen.add(hashable)
+            yield serialized
@@ -0,0 +1,158 @@
+import time
+from typing import TYPE_CHECKING, Callable, Self, TypedDict
+
+from ._util import full_jitter
+from .types import hashable_key, serialize
+
+if TYPE_CHECKING:
+    from mypy_boto3_dynamodb.client import DynamoDBClient
+else:
+    DynamoDBClient = object
+
+BATCH_WRITE_LIMIT = 25
+
+
+class BatchWriteStats(TypedDict):
+    items: int
+    attempts: int
+    unprocessed: int
+    elapsed: float
+
+
+class UnprocessedItemsError(Exception):
+    def __init__(
+        self,
+        msg: str = '',
+        *,
+        unprocessed_items: dict,
+    ) -> None:
+        super().__init__(msg)
+        self.msg = msg
+        self.unprocessed_items = unprocessed_items
+
+
+class BatchWriter:
+    """
+    Group puts and deletes into `batch_write_item` calls.
+
+    Unlike `TransactWriter`, writes aren't atomic, but they cost half the WCU.
+    Operations on the same key within a batch replace each other, since
+    DynamoDB rejects batches that touch a key twice. `UnprocessedItems` are
+    resubmitted with exponential backoff and full jitter.
+    """
+
+    def __init__(
+        self,
+        table_name: str,
+        *,
+        client: DynamoDBClient,
+        flush_amount: int = BATCH_WRITE_LIMIT,
+        key_attrs: tuple[str, ...] = ('pk', 'sk'),
+        max_retries: int = 8,
+        backoff_base: float = 0.05,
+        backoff_max: float = 5.0,
+        on_batch: Callable[[BatchWriteStats], None] | None = None,
+    ) -> None:
+        if not 0 < flush_amount <= BATCH_WRITE_LIMIT:
+            raise ValueError(f'flush_amount must be between 1 and {BATCH_WRITE_LIMIT}')
+
+        self._table_name = table_name
+        self._client = client
+        self._flush_amount = flush_amount
+        self._key_attrs = key_attrs
+        self._max_retries = max_retries
+        self._backoff_base = backoff_base
+        self._backoff_max = backoff_max
+        self._on_batch = on_batch
+        self._items_buffer: dict[tuple, tuple[str, dict]] = {}
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_details) -> None:
+        while self._items_buffer:
+            self._flush()
+
+    def put(
+        self,
+        item: dict,
+        *,
+        table_name: str | None = None,
+    ) -> None:
+        serialized = serialize(item)
+        self._add_request_and_process(
+            table_name or self._table_name,
+            serialized,
+            {'PutRequest': {'Item': serialized}},
+        )
+
+    def delete(
+        self,
+        key: dict,
+        *,
+        table_name: str | None = None,
+    ) -> None:
+        serialized = serialize(key)
+        self._add_request_and_process(
+            table_name or self._table_name,
+            serialized,
+            {'DeleteRequest': {'Key': serialized}},
+        )
+
+    def _add_request_and_process(
+        self,
+        table_name: str,
+        item: dict,
+        request: dict,
+    ) -> None:
+        try:
+            key = (
+                table_name,
+                hashable_key({name: item[name] for name in self._key_attrs}),
+            )
+        except KeyError as err:
+            raise ValueError(f'Missing key attribute {err}') from None
+
+        # The last request for a key wins
+        self._items_buffer.pop(key, None)
+        self._items_buffer[key] = (table_name, request)
+        self._flush_if_needed()
+
+    def _flush_if_needed(self) -> None:
+        if len(self._items_buffer) >= self._flush_amount:
+            self._flush()
+
+    def _flush(self) -> None:
+        keys = list(self._items_buffer)[: self._flush_amount]
+        request_items: dict[str, list] = {}
+
+        for key in keys:
+            table_name, request = self._items_buffer.pop(key)
+            request_items.setdefault(table_name, []).append(request)
+
+        stats = BatchWriteStats(items=len(keys), attempts=0, unprocessed=0, elapsed=0)
+        started_at = time.perf_counter()
+
+        while request_items:
+            if stats['attempts'] > self._max_retries:
+                raise UnprocessedItemsError(
+                    f'Items still unprocessed after {self._max_retries} retries',
+                    unprocessed_items=request_items,
+                )
+
+            if stats['attempts']:
+                time.sleep(
+                    full_jitter(
+                        stats['attempts'], self._backoff_base, self._backoff_max
+                    )
+                )
+
+            stats['attempts'] += 1
+            response = self._client.batch_write_item(RequestItems=request_items)
+            request_items = response.get('UnprocessedItems') or {}
+            stats['unprocessed'] += sum(len(v) for v in request_items.values())
+
+        stats['elapsed'] = time.perf_counter() - started_at
+
+        if self._on_batch:
+            self._on_batch(stats)
@@ -0,0 +1,330 @@
+"""
+Bulk import and export of JSONL files, optionally gzip-compressed.
+
+    python -m dynamodx import pytest items.jsonl.gz --checkpoint items.ckpt
+    python -m dynamodx export pytest backup/ --segments 8 --gzip
+"""
+
+import base64
+import json
+import os
+import time
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from decimal import Decimal
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator, TypedDict
+
+from ._util import batched, open_text
+from .batch_writer import BatchWriter, BatchWriteStats
+from .reader import PageStats, Scan
+from .types import Serialized, serialize
+
+if TYPE_CHECKING:
+    from mypy_boto3_dynamodb.client import DynamoDBClient
+else:
+    DynamoDBClient = object
+
+
+class ImportStats(TypedDict):
+    lines: int
+    items: int
+    batches: int
+    unprocessed: int
+    skipped_lines: int
+    elapsed: float
+    throughput: float
+
+
+class ExportStats(TypedDict):
+    items: int
+    files: list[str]
+    elapsed: float
+    throughput: float
+
+
+class Checkpoint(TypedDict):
+    paths: list[str]
+    chunk_size: int
+    chunks: int
+    lines: int
+
+
+def import_jsonl(
+    paths: str | Iterable[str],
+    table_name: str,
+    *,
+    client: DynamoDBClient,
+    processes: int | None = None,
+    max_workers: int = 8,
+    chunk_size: int = 1000,
+    max_pending_chunks: int | None = None,
+    checkpoint: str | None = None,
+    key_attrs: tuple[str, ...] = ('pk', 'sk'),
+    on_progress: Callable[[ImportStats], None] | None = None,
+) -> ImportStats:
+    """
+    Put every line of one or more JSONL files into a table.
+
+    Lines are read `chunk_size` at a time. Each chunk is serialized in a
+    pool of `processes`, or in the writing thread when `processes` is 0,
+    and written by one of `max_workers` threads with `BatchWriter`. At most
+    `max_pending_chunks` chunks are read ahead of the writes, which bounds
+    memory; reading waits for a chunk to finish once the limit is reached.
+    Floats are read as `Decimal`, so they're stored as written.
+
+    With `checkpoint`, the number of chunks written so far, in order, is
+    saved to that file. An interrupted import then resumes after them,
+    rewriting at most the chunks that were in flight. The file is removed
+    once the import completes. `on_progress` is called with the running
+    `ImportStats` as chunks finish.
+    """
+    paths = [paths] if isinstance(paths, str) else list(paths)
+    max_pending_chunks = max_pending_chunks or max_workers * 2
+    state = _load_checkpoint(checkpoint, paths, chunk_size)
+    stats = ImportStats(
+        lines=0,
+        items=0,
+        batches=0,
+        unprocessed=0,
+        skipped_lines=state['lines'],
+        elapsed=0.0,
+        throughput=0.0,
+    )
+    started_at = time.perf_counter()
+    # Chunks that finished out of order, waiting for the ones before them
+    finished: dict[int, int] = {}
+    in_flight: dict[Future, tuple[int, int]] = {}
+    serializer = ProcessPoolExecutor(processes) if processes != 0 else None
+    writer = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='import')
+
+    def put(lines: list[str] | Future) -> tuple[int, list[BatchWriteStats]]:
+        items = lines.result() if isinstance(lines, Future) else _decode(lines)
+        batches: list[BatchWriteStats] = []
+
+        with BatchWriter(
+            table_name,
+            client=client,
+            key_attrs=key_attrs,
+            on_batch=batches.append,
+        ) as batch:
+            for item in items:
+                batch.put(Serialized(item))
+
+        return len(items), batches
+
+    def collect(futures: Iterable[Future]) -> None:
+        error = None
+
+        for future in futures:
+            idx, lines = in_flight.pop(future)
+
+            # Chunks written alongside a failed one still reach the checkpoint
+            if future.exception():
+                error = error or future.exception()
+                continue
+
+            items, batches = future.result()
+            stats['lines'] += lines
+            stats['items'] += items
+            stats['batches'] += len(batches)
+            stats['unprocessed'] += sum(b['unprocessed'] for b in batches)
+            finished[idx] = lines
+
+        # Only chunks written without gaps before them are checkpointed
+        advanced = False
+
+        while state['chunks'] in finished:
+            state['lines'] += finished.pop(state['chunks'])
+            state['chunks'] += 1
+            advanced = True
+
+        if checkpoint and advanced:
+            _save_checkpoint(checkpoint, state)
+
+        if error:
+            raise error
+
+        stats['elapsed'] = time.perf_counter() - started_at
+        stats['throughput'] = (
+            stats['items'] / stats['elapsed'] if stats['elapsed'] else 0
+        )
+
+        if on_progress:
+            on_progress(ImportStats(**stats))
+
+    try:
+        chunks = batched(_read_lines(paths), chunk_size)
+
+        for idx, lines in enumerate(chunks):
+            if idx < state['chunks']:
+                continue
+
+            while len(in_flight) >= max_pending_chunks:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                collect(done)
+
+            work = serializer.submit(_decode, lines) if serializer else lines
+            in_flight[writer.submit(put, work)] = (idx, len(lines))
+
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            collect(done)
+    finally:
+        for future in in_flight:
+            future.cancel()
+
+        writer.shutdown(wait=True)
+
+        if serializer:
+            serializer.shutdown(wait=True, cancel_futures=True)
+
+    if checkpoint and os.path.exists(checkpoint):
+        os.remove(checkpoint)
+
+    stats['elapsed'] = time.perf_counter() - started_at
+    stats['throughput'] = stats['items'] / stats['elapsed'] if stats['elapsed'] else 0
+    return stats
+
+
+def export_jsonl(
+    table_name: str,
+    directory: str,
+    *,
+    client: DynamoDBClient,
+    segments: int = 4,
+    compress: bool = False,
+    consistent_read: bool = False,
+    max_buffered_pages: int = 8,
+    on_page: Callable[[PageStats], None] | None = None,
+) -> ExportStats:
+    """
+    Write every item of a table to `directory`, one JSONL file per scan
+    segment (`segment-0000.jsonl`, ...), gzip-compressed with `compress`.
+
+    Segments are scanned in parallel by `Scan`. Each line holds an item in
+    the DynamoDB JSON of S3 table exports, `{"Item": {"pk": {"S": ...}}}`,
+    with binary values base64-encoded. `import_jsonl` writes it back
+    unchanged, so numbers, sets and lists keep their exact type and value.
+    """
+    started_at = time.perf_counter()
+    suffix = '.jsonl.gz' if compress else '.jsonl'
+    files = [
+        os.path.join(directory, f'segment-{segment:04d}{suffix}')
+        for segment in range(segments)
+    ]
+
+    os.makedirs(directory, exist_ok=True)
+    scan = Scan(
+        table_name,
+        client=client,
+        segments=segments,
+        consistent_read=consistent_read,
+        max_buffered_pages=max_buffered_pages,
+        lazy=True,
+        on_page=on_page,
+    )
+    fps = [open_text(path, 'wt') for path in files]
+    items = 0
+
+    try:
+        for stats, page in scan.pages_with_stats():
+            fp = fps[stats['segment'] or 0]
+
+            for item in page:
+                fp.write(json.dumps({'Item': item.raw}, default=_encode))
+                fp.write('\n')
+
+            items += len(page)
+    finally:
+        for fp in fps:
+            fp.close()
+
+    elapsed = time.perf_counter() - started_at
+    return ExportStats(
+        items=items,
+        files=files,
+        elapsed=elapsed,
+        throughput=items / elapsed if elapsed else 0,
+    )
+
+
+def _decode(lines: list[str]) -> list[dict]:
+    # Runs in the process pool, so it returns plain wire-format dicts
+    return [_decode_line(line) for line in lines if line.strip()]
+
+
+def _decode_line(line: str) -> dict:
+    item = json.loads(line, parse_float=Decimal)
+
+    # DynamoDB JSON, as written by `export_jsonl`
+    if item.keys() == {'Item'}:
+        # Only a binary attribute value puts `"B"` or `"BS"` in a line
+        return _decode_binary(item['Item']) if '"B' in line else item['Item']
+
+    return serialize(item)
+
+
+def _decode_binary(item: dict) -> dict:
+    return {name: _decode_binary_value(value) for name, value in item.items()}
+
+
+def _decode_binary_value(value: dict) -> dict:
+    ((kind, v),) = value.items()
+
+    match kind:
+        case 'B':
+            return {'B': base64.b64decode(v)}
+        case 'BS':
+            return {'BS': [base64.b64decode(x) for x in v]}
+        case 'M':
+            return {'M': _decode_binary(v)}
+        case 'L':
+            return {'L': [_decode_binary_value(x) for x in v]}
+
+    return value
+
+
+def _encode(value: Any) -> Any:
+    # Binary attribute values are the only non-JSON type in the wire format
+    if isinstance(value, (bytes, bytearray)):
+        return base64.b64encode(value).decode()
+
+    raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
+
+
+def _read_lines(paths: list[str]) -> Iterator[str]:
+    for path in paths:
+        with open_text(path, 'rt') as fp:
+            yield from fp
+
+
+def _load_checkpoint(path: str | None, paths: list[str], chunk_size: int) -> Checkpoint:
+    empty = Checkpoint(paths=paths, chunk_size=chunk_size, chunks=0, lines=0)
+
+    if not path or not os.path.exists(path):
+        return empty
+
+    with open(path, encoding='utf-8') as fp:
+        state: Checkpoint = json.load(fp)
+
+    if state['paths'] != paths or state['chunk_size'] != chunk_size:
+        raise ValueError(
+            f'Checkpoint {path} was written for other files or another chunk size'
+        )
+
+    return state
+
+
+def _save_checkpoint(path: str, state: Checkpoint) -> None:
+    # Replaced atomically, so a crash never leaves a partial checkpoint
+    tmp = f'{path}.tmp'
+
+    with open(tmp, 'w', encoding='utf-8') as fp:
+        json.dump(state, fp)
+
+    os.replace(tmp, path)
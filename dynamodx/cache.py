@@ -0,0 +1,139 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Hashable, Mapping, TypedDict
+
+from .types import LazyItem, NumberMode, hashable_key, serialize
+
+if TYPE_CHECKING:
+    from mypy_boto3_dynamodb.client import DynamoDBClient
+else:
+    DynamoDBClient = object
+
+
+class CacheStats(TypedDict):
+    size: int
+    hits: int
+    misses: int
+    evictions: int
+
+
+class ItemCache:
+    """
+    An in-process LRU cache of items keyed by table and primary key, with
+    entries expiring `ttl` seconds after they were stored.
+
+    ```python
+    cache = ItemCache(max_size=10_000, ttl=30)
+    item = cache.get_item('pytest', {'pk': 'CONFIG', 'sk': '0'}, client=client)
+
+    with TransactWriter('pytest', client=client, cache=cache) as transact:
+        ...
+    ```
+
+    Items are returned as read-only `LazyItem`s shared between callers.
+    Missing items are cached too, as `None`. A `TransactWriter` given the
+    cache refreshes the items it puts and invalidates the ones it updates
+    or deletes once their transaction commits. All methods are thread-safe.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_size: int = 1024,
+        ttl: float = 60.0,
+        number: NumberMode = 'decimal',
+    ) -> None:
+        if max_size < 1:
+            raise ValueError('max_size must be at least 1')
+
+        self._max_size = max_size
+        self._ttl = ttl
+        self._number = number
+        self._items: OrderedDict[Hashable, tuple[float, LazyItem | None]] = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+        # Bumped on every invalidation, so a read that started before a
+        # write can't put the item it fetched back into the cache
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_item(
+        self,
+        table_name: str,
+        key: Mapping,
+        *,
+        client: DynamoDBClient,
+        consistent_read: bool = False,
+    ) -> LazyItem | None:
+        """Return the cached item, fetching it with `get_item` on a miss."""
+        serialized = serialize(key)
+        cache_key = (table_name, hashable_key(serialized))
+
+        with self._lock:
+            entry = self._items.get(cache_key)
+
+            if entry and entry[0] > time.monotonic():
+                self._items.move_to_end(cache_key)
+                self.hits += 1
+                return entry[1]
+
+            self.misses += 1
+            generation = self._generation
+
+        response = client.get_item(
+            TableName=table_name,
+            Key=serialized,
+            ConsistentRead=consistent_read,
+        )
+        item = response.get('Item')
+        value = LazyItem(item, number=self._number) if item else None
+
+        with self._lock:
+            if generation == self._generation:
+                self._store(cache_key, value)
+
+        return value
+
+    def refresh(self, table_name: str, key: Mapping, item: Mapping | None) -> None:
+        """Replace the cached value of a serialized key."""
+        cache_key = (table_name, hashable_key(key))
+        value = LazyItem(item, number=self._number) if item else None
+
+        with self._lock:
+            self._generation += 1
+            self._store(cache_key, value)
+
+    def invalidate(self, table_name: str, key: Mapping) -> None:
+        """Drop a serialized key from the cache."""
+        cache_key = (table_name, hashable_key(key))
+
+        with self._lock:
+            self._generation += 1
+            self._items.pop(cache_key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._items.clear()
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                size=len(self._items),
+                hits=self.hits,
+                misses=self.misses,
+                evictions=self.evictions,
+            )
+
+    def _store(self, cache_key: Hashable, value: LazyItem | None) -> None:
+        # Callers hold the lock
+        self._items[cache_key] = (time.monotonic() + self._ttl, value)
+        self._items.move_to_end(cache_key)
+
+        while len(self._items) > self._max_size:
+            self._items.popitem(last=False)
+            self.evictions += 1
@@ -0,0 +1,86 @@
+import threading
+from typing import TYPE_CHECKING, Any, Literal
+
+if TYPE_CHECKING:
+    from mypy_boto3_dynamodb.client import DynamoDBClient
+else:
+    DynamoDBClient = object
+
+# Enough connections for the default concurrency of every helper sharing
+# the client at once: `BatchGetter` (4), `import_jsonl` (8), `Scan` segments
+DEFAULT_MAX_POOL_CONNECTIONS = 16
+
+_clients: dict[tuple, Any] = {}
+_lock = threading.Lock()
+
+
+def get_client(
+    *,
+    region_name: str | None = None,
+    endpoint_url: str | None = None,
+    max_workers: int | None = None,
+    connect_timeout: float = 2.0,
+    read_timeout: float = 10.0,
+    max_attempts: int = 5,
+    retry_mode: Literal['standard', 'adaptive', 'legacy'] = 'standard',
+) -> DynamoDBClient:
+    """
+    Return the process-wide DynamoDB client for these settings, creating it
+    on the first call.
+
+    ```python
+    client = get_client()
+
+    with TransactWriter('pytest', client=client, max_workers=8) as transact:
+        ...
+    ```
+
+    The connection pool holds `max_workers` connections, which should cover
+    the calls made at once by every writer and reader sharing the client,
+    e.g. the sum of their `max_workers` and `segments`. Connections are
+    kept alive between calls, with TCP keep-alive on, and timeouts are
+    shorter than botocore's defaults so a stuck connection fails fast and
+    is retried, up to `max_attempts` calls in total. botocore is only
+    imported by the first call, and clients are thread-safe, so one can be
+    shared by every thread in the process.
+    """
+    max_pool_connections = max(max_workers or 0, DEFAULT_MAX_POOL_CONNECTIONS)
+    settings = (
+        region_name,
+        endpoint_url,
+        max_pool_connections,
+        connect_timeout,
+        read_timeout,
+        max_attempts,
+        retry_mode,
+    )
+
+    with _lock:
+        try:
+            return _clients[settings]
+        except KeyError:
+            pass
+
+        from botocore.config import Config
+        from botocore.session import get_session
+
+        config = Config(
+            max_pool_connections=max_pool_connections,
+            tcp_keepalive=True,
+            connect_timeout=connect_timeout,
+            read_timeout=read_timeout,
+            retries={'mode': retry_mode, 'total_max_attempts': max_attempts},
+        )
+        client = _clients[settings] = get_session().create_client(
+            'dynamodb',
+            region_name=region_name,
+            endpoint_url=endpoint_url,
+            config=config,
+        )
+        return client
+
+
+def clear_clients() -> None:
+    """Forget the clients created so far, e.g. after credentials change."""
+    with _lock:
+        _clients.clear()
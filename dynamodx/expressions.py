@@ -1,26 +1,112 @@
 """
 - https://docs.aws.amazon.com/amazondynamodb/latest/developerguide/Expressions.UpdateExpressions.html
+- https://docs.aws.amazon.com/amazondynamodb/latest/developerguide/Expressions.OperatorsAndFunctions.html
 """
 
+import re
+import threading
 from abc import ABC, abstractmethod
 from decimal import Decimal
-from functools import reduce
-from typing import Any, Literal
+from typing import Any, Hashable, Literal, Mapping, NamedTuple
+
+from ._expr_eval import ExpressionError as ExpressionError
+from ._expr_eval import parse_condition, parse_update
+from .types import LazyItem, NumberMode, deserialize, serialize
 
 
 class _Unset:
     pass
 
 
+class Placeholders:
+    """
+    Hands out the placeholders used while compiling an expression and
+    records the attribute names and the order of the value slots.
+
+    Placeholders are derived from the attribute path, e.g. `#n_brand_name`
+    and `:v_brand.name`.
+    """
+
+    def __init__(self) -> None:
+        self.names: dict[str, str] = {}
+        self.values: list[str] = []
+
+    def name(self, path: str) -> str:
+        placeholder = f'#n_{path}'.replace('.', '_')
+        self.names[placeholder] = path
+        return placeholder
+
+    def value(self, path: str, suffix: str = '') -> str:
+        placeholder = f':v_{path}{suffix}'
+        self.values.append(placeholder)
+        return placeholder
+
+
+_PATH_SEGMENT = re.compile(r'([^.\[\]]+)((?:\[\d+\])*)')
+
+
+def _token(idx: int) -> str:
+    # a, b, ..., z, aa, ab, ...
+    token = ''
+
+    while True:
+        idx, rem = divmod(idx, 26)
+        token = chr(ord('a') + rem) + token
+
+        if not idx:
+            return token
+
+        idx -= 1
+
+
+class CompactPlaceholders(Placeholders):
+    """
+    Hands out short placeholders (`#a`, `:a`, `#b`, ...) instead of deriving
+    them from the path, keeping expressions well under DynamoDB's 4 KB limit.
+
+    Paths are split into segments, so `brand.name` becomes `#a.#b` and
+    `tags[0]` becomes `#c[0]`. Each attribute name gets a single token,
+    however many paths it appears in.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._tokens: dict[str, str] = {}
+
+    def name(self, path: str) -> str:
+        segments = []
+
+        for attr, indexes in _PATH_SEGMENT.findall(path):
+            try:
+                placeholder = self._tokens[attr]
+            except KeyError:
+                placeholder = self._tokens[attr] = f'#{_token(len(self._tokens))}'
+                self.names[placeholder] = attr
+
+            segments.append(placeholder + indexes)
+
+        return '.'.join(segments)
+
+    def value(self, path: str, suffix: str = '') -> str:
+        placeholder = f':{_token(len(self.values))}'
+        self.values.append(placeholder)
+        return placeholder
+
+
 class Expr(ABC):
     path: str
     value: str | set | Decimal | _Unset
+    clause: str | None = None
 
     def expr_attr_names(self) -> dict:
-        return {self.name_placeholder: self.path}
+        placeholders = Placeholders()
+        self.compile(placeholders)
+        return placeholders.names
 
     def expr_attr_values(self) -> dict:
-        return {self.value_placeholder: self.value}
+        placeholders = Placeholders()
+        self.compile(placeholders)
+        return dict(zip(placeholders.values, self.values()))
 
     @property
     def name_placeholder(self) -> str:
@@ -30,8 +116,20 @@ class Expr(ABC):
     def value_placeholder(self) -> str:
         return f':v_{self.path}'
 
+    def expr(self) -> str:
+        return self.compile(Placeholders())
+
     @abstractmethod
-    def expr(self) -> str: ...
+    def compile(self, placeholders: Placeholders) -> str:
+        """Return the expression, requesting placeholders in the
+        same order as the values returned by `values()`."""
+
+    @abstractmethod
+    def shape(self) -> Hashable:
+        """Everything `compile()` depends on, except the values."""
+
+    def values(self) -> tuple:
+        return (self.value,)
 
 
 class FuncExpr(Expr, ABC):
@@ -45,11 +143,13 @@ class FuncExpr(Expr, ABC):
         self.path = path
         self.value = value
 
-    def expr(self) -> str:
-        func = self.func
-        name = self.name_placeholder
-        value = self.value_placeholder
-        return f'{func}({name}, {value})'
+    def compile(self, placeholders: Placeholders) -> str:
+        name = placeholders.name(self.path)
+        value = placeholders.value(self.path)
+        return f'{self.func}({name}, {value})'
+
+    def shape(self) -> Hashable:
+        return (type(self), self.func, self.path)
 
 
 class IfNotExistsExpr(FuncExpr):
@@ -66,24 +166,23 @@ class IfNotExistsExpr(FuncExpr):
         self.operand = operand
         self.r_value = r_value
 
-    def expr(self) -> str:
-        expr = super().expr()
+    def compile(self, placeholders: Placeholders) -> str:
+        expr = super().compile(placeholders)
         operand = self.operand
 
         if not self.r_value:
             return expr
 
-        return f'{expr} {operand} {self.value_placeholder}_r'
+        return f'{expr} {operand} {placeholders.value(self.path, "_r")}'
 
-    def expr_attr_values(self) -> dict:
-        attrs = super().expr_attr_values()
+    def shape(self) -> Hashable:
+        return (type(self), self.path, self.operand, bool(self.r_value))
 
+    def values(self) -> tuple:
         if not self.r_value:
-            return attrs
+            return (self.value,)
 
-        return attrs | {
-            f'{self.value_placeholder}_r': self.r_value,
-        }
+        return (self.value, self.r_value)
 
     def __add__(self, right_op: int) -> 'IfNotExistsExpr':
         return IfNotExistsExpr(
@@ -126,6 +225,8 @@ class Set(Expr):
     be used in an update expression.
     """
 
+    clause = 'SET'
+
     def __init__(
         self,
         *,
@@ -138,15 +239,16 @@ class Set(Expr):
         self.value = v
         self.operand = operand
 
-    def expr(self) -> str:
-        name = self.name_placeholder
-        value = self.value_placeholder
+    def compile(self, placeholders: Placeholders) -> str:
+        name = placeholders.name(self.path)
         operand = self.operand
 
         if isinstance(self.value, FuncExpr):
-            expr = self.value.expr()
+            expr = self.value.compile(placeholders)
             return f'{name} = {expr}'
 
+        value = placeholders.value(self.path)
+
         if operand in ('+', '-'):
             # Incrementing and decrementing numeric attributes
             # You can add to or subtract from an existing numeric attribute.
@@ -155,22 +257,22 @@ class Set(Expr):
 
         return f'{name} = {value}'
 
-    def expr_attr_names(self) -> dict:
-        attrs = super().expr_attr_names()
-
+    def shape(self) -> Hashable:
         if isinstance(self.value, FuncExpr):
-            return attrs | self.value.expr_attr_names()
+            return (type(self), self.path, self.value.shape())
 
-        return attrs
+        return (type(self), self.path, self.operand in ('+', '-') and self.operand)
 
-    def expr_attr_values(self) -> dict:
+    def values(self) -> tuple:
         if isinstance(self.value, FuncExpr):
-            return self.value.expr_attr_values()
+            return self.value.values()
 
-        return super().expr_attr_values()
+        return (self.value,)
 
 
 class Add(Expr):
+    clause = 'ADD'
+
     def __init__(self, **kwargs) -> None:
         (k, v), *_ = kwargs.items()
 
@@ -180,23 +282,35 @@ class Add(Expr):
         self.path = k
         self.value = v
 
-    def expr(self) -> str:
-        return f'{self.name_placeholder} {self.value_placeholder}'
+    def compile(self, placeholders: Placeholders) -> str:
+        name = placeholders.name(self.path)
+        value = placeholders.value(self.path)
+        return f'{name} {value}'
+
+    def shape(self) -> Hashable:
+        return (type(self), self.path)
 
 
 class Remove(Expr):
+    clause = 'REMOVE'
+
     def __init__(self, path: str) -> None:
         self.path = path
         self.value = _Unset()
 
-    def expr(self) -> str:
-        return self.name_placeholder
+    def compile(self, placeholders: Placeholders) -> str:
+        return placeholders.name(self.path)
 
-    def expr_attr_values(self) -> dict:
-        return {}
+    def shape(self) -> Hashable:
+        return (type(self), self.path)
+
+    def values(self) -> tuple:
+        return ()
 
 
 class Delete(Expr):
+    clause = 'DELETE'
+
     def __init__(self, **kwargs) -> None:
         (k, v), *_ = kwargs.items()
 
@@ -206,50 +320,513 @@ class Delete(Expr):
         self.path = k
         self.value = v
 
-    def expr(self) -> str:
-        return f'{self.name_placeholder} {self.value_placeholder}'
+    def compile(self, placeholders: Placeholders) -> str:
+        name = placeholders.name(self.path)
+        value = placeholders.value(self.path)
+        return f'{name} {value}'
+
+    def shape(self) -> Hashable:
+        return (type(self), self.path)
+
+
+def action_reads(action: Expr) -> set[str]:
+    """The paths whose current value an update action reads."""
+    if isinstance(action.value, FuncExpr):
+        return {action.value.path}
+
+    if is_plain_set(action) or isinstance(action, Remove):
+        return set()
+
+    return {action.path}
+
+
+def is_plain_set(action: Expr) -> bool:
+    """Whether an action is a `SET path = value` of a literal value."""
+    return (
+        isinstance(action, Set)
+        and action.operand in (None, '=')
+        and not isinstance(action.value, FuncExpr)
+    )
+
+
+def top_level(path: str) -> str:
+    """The top-level attribute of a document path, `a` for `a.b[0]`."""
+    return path.split('.')[0].split('[')[0]
+
+
+class _Operand(ABC):
+    path: str
+
+    @abstractmethod
+    def compile(self, placeholders: Placeholders) -> str: ...
+
+    def shape(self) -> Hashable:
+        return (type(self), self.path)
+
+    def eq(self, value: Any) -> 'Comparison':
+        return Comparison(self, '=', value)
+
+    def ne(self, value: Any) -> 'Comparison':
+        return Comparison(self, '<>', value)
+
+    def lt(self, value: Any) -> 'Comparison':
+        return Comparison(self, '<', value)
+
+    def lte(self, value: Any) -> 'Comparison':
+        return Comparison(self, '<=', value)
+
+    def gt(self, value: Any) -> 'Comparison':
+        return Comparison(self, '>', value)
+
+    def gte(self, value: Any) -> 'Comparison':
+        return Comparison(self, '>=', value)
+
+    def between(self, low: Any, high: Any) -> 'Between':
+        return Between(self, low, high)
+
+    def is_in(self, *values: Any) -> 'In':
+        return In(self, *values)
+
+
+class Attr(_Operand):
+    """
+    An attribute path used as an operand in a condition expression.
+
+    ```python
+    Attr('sk').not_exists() | Attr('version').lt(3)
+    ```
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+    def compile(self, placeholders: Placeholders) -> str:
+        return placeholders.name(self.path)
+
+    def exists(self) -> 'Function':
+        return Function('attribute_exists', self)
+
+    def not_exists(self) -> 'Function':
+        return Function('attribute_not_exists', self)
+
+    def attribute_type(self, type_: str) -> 'Function':
+        return Function('attribute_type', self, type_)
+
+    def begins_with(self, prefix: str) -> 'Function':
+        return Function('begins_with', self, prefix)
+
+    def contains(self, value: Any) -> 'Function':
+        return Function('contains', self, value)
+
+    def size(self) -> 'Size':
+        return Size(self.path)
+
+
+class Size(_Operand):
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+    def compile(self, placeholders: Placeholders) -> str:
+        return f'size({placeholders.name(self.path)})'
+
+
+def _compile_operand(
+    value: Any,
+    path: str,
+    placeholders: Placeholders,
+    suffix: str = '',
+) -> str:
+    if isinstance(value, _Operand):
+        return value.compile(placeholders)
+
+    return placeholders.value(path, suffix)
+
+
+def _operand_shape(value: Any) -> Hashable:
+    return value.shape() if isinstance(value, _Operand) else None
+
+
+def _operand_values(*values: Any) -> tuple:
+    return tuple(v for v in values if not isinstance(v, _Operand))
+
+
+class Condition(ABC):
+    """
+    A condition expression, built from `Attr` and `Size` operands and
+    combined with `&` (AND), `|` (OR) and `~` (NOT).
+    """
+
+    @abstractmethod
+    def compile(self, placeholders: Placeholders) -> str:
+        """Return the expression, requesting placeholders in the
+        same order as the values returned by `values()`."""
+
+    @abstractmethod
+    def shape(self) -> Hashable:
+        """Everything `compile()` depends on, except the values."""
+
+    @abstractmethod
+    def values(self) -> tuple: ...
+
+    def __and__(self, other: 'Condition') -> 'And':
+        return And(self, other)
+
+    def __or__(self, other: 'Condition') -> 'Or':
+        return Or(self, other)
+
+    def __invert__(self) -> 'Not':
+        return Not(self)
+
+
+class Comparison(Condition):
+    def __init__(self, operand: _Operand, op: str, value: Any) -> None:
+        self.operand = operand
+        self.op = op
+        self.value = value
+
+    def compile(self, placeholders: Placeholders) -> str:
+        left = self.operand.compile(placeholders)
+        right = _compile_operand(self.value, self.operand.path, placeholders)
+        return f'{left} {self.op} {right}'
+
+    def shape(self) -> Hashable:
+        return (type(self), self.operand.shape(), self.op, _operand_shape(self.value))
+
+    def values(self) -> tuple:
+        return _operand_values(self.value)
+
+
+class Between(Condition):
+    def __init__(self, operand: _Operand, low: Any, high: Any) -> None:
+        self.operand = operand
+        self.low = low
+        self.high = high
+
+    def compile(self, placeholders: Placeholders) -> str:
+        path = self.operand.path
+        operand = self.operand.compile(placeholders)
+        low = _compile_operand(self.low, path, placeholders, '_low')
+        high = _compile_operand(self.high, path, placeholders, '_high')
+        return f'{operand} BETWEEN {low} AND {high}'
+
+    def shape(self) -> Hashable:
+        return (
+            type(self),
+            self.operand.shape(),
+            _operand_shape(self.low),
+            _operand_shape(self.high),
+        )
+
+    def values(self) -> tuple:
+        return _operand_values(self.low, self.high)
+
+
+class In(Condition):
+    def __init__(self, operand: _Operand, *values: Any) -> None:
+        if not values:
+            raise ValueError('IN requires at least one value')
+
+        self.operand = operand
+        self.operands = values
+
+    def compile(self, placeholders: Placeholders) -> str:
+        path = self.operand.path
+        operand = self.operand.compile(placeholders)
+        values = ', '.join(
+            _compile_operand(v, path, placeholders, f'_{idx}')
+            for idx, v in enumerate(self.operands)
+        )
+        return f'{operand} IN ({values})'
+
+    def shape(self) -> Hashable:
+        return (
+            type(self),
+            self.operand.shape(),
+            tuple(_operand_shape(v) for v in self.operands),
+        )
+
+    def values(self) -> tuple:
+        return _operand_values(*self.operands)
+
+
+class Function(Condition):
+    def __init__(self, func: str, operand: _Operand, *args: Any) -> None:
+        self.func = func
+        self.operand = operand
+        self.args = args
+
+    def compile(self, placeholders: Placeholders) -> str:
+        path = self.operand.path
+        args = [self.operand.compile(placeholders)] + [
+            _compile_operand(arg, path, placeholders) for arg in self.args
+        ]
+        return f'{self.func}({", ".join(args)})'
+
+    def shape(self) -> Hashable:
+        return (
+            type(self),
+            self.func,
+            self.operand.shape(),
+            tuple(_operand_shape(arg) for arg in self.args),
+        )
+
+    def values(self) -> tuple:
+        return _operand_values(*self.args)
+
+
+class _Logical(Condition):
+    op: str
+
+    def __init__(self, *conditions: Condition) -> None:
+        # Flatten `a & b & c` into a single AND
+        self.conditions = tuple(
+            nested
+            for cond in conditions
+            for nested in (cond.conditions if type(cond) is type(self) else (cond,))
+        )
+
+    def compile(self, placeholders: Placeholders) -> str:
+        return f' {self.op} '.join(
+            f'({cond.compile(placeholders)})'
+            if isinstance(cond, _Logical)
+            else cond.compile(placeholders)
+            for cond in self.conditions
+        )
+
+    def shape(self) -> Hashable:
+        return (type(self), tuple(cond.shape() for cond in self.conditions))
+
+    def values(self) -> tuple:
+        return tuple(value for cond in self.conditions for value in cond.values())
+
+
+class And(_Logical):
+    op = 'AND'
+
+
+class Or(_Logical):
+    op = 'OR'
+
+
+class Not(Condition):
+    def __init__(self, condition: Condition) -> None:
+        self.condition = condition
+
+    def compile(self, placeholders: Placeholders) -> str:
+        return f'NOT ({self.condition.compile(placeholders)})'
+
+    def shape(self) -> Hashable:
+        return (type(self), self.condition.shape())
+
+    def values(self) -> tuple:
+        return self.condition.values()
+
+
+class _Compiled(NamedTuple):
+    update_expr: str
+    cond_expr: str | None
+    names: dict[str, str]
+    values: list[str]
+
+
+_CLAUSES = ('SET', 'ADD', 'REMOVE', 'DELETE')
+_CACHE_SIZE = 1024
+_cache: dict[Hashable, _Compiled] = {}
+# Expressions are compiled from writer threads as well as the caller's
+_cache_lock = threading.Lock()
+
+
+def _compile(
+    exprs: list[Expr],
+    cond: Condition | None,
+    placeholders: Placeholders,
+) -> _Compiled:
+    clauses: dict[str | None, list[str]] = {clause: [] for clause in _CLAUSES}
+
+    for attr in exprs:
+        clauses.setdefault(attr.clause, []).append(attr.compile(placeholders))
+
+    update_expr = ' '.join(
+        f'{clause} {", ".join(clauses[clause])}'
+        for clause in _CLAUSES
+        if clauses[clause]
+    )
+    # The condition is compiled after the update actions,
+    # so both share a single placeholder namespace
+    cond_expr = cond.compile(placeholders) if cond else None
+
+    return _Compiled(update_expr, cond_expr, placeholders.names, placeholders.values)
+
+
+def _cached(shape: Hashable, compile: Any) -> Any:
+    try:
+        return _cache[shape]
+    except KeyError:
+        pass
+
+    compiled = compile()
+
+    with _cache_lock:
+        if shape not in _cache and len(_cache) >= _CACHE_SIZE:
+            # Evict the oldest entry; dicts keep insertion order
+            del _cache[next(iter(_cache))]
+
+        _cache[shape] = compiled
+
+    return compiled
+
+
+class ConditionExpr(dict):
+    """
+    Build the `cond_expr`, `expr_attr_names` and `expr_attr_values` for a
+    condition, compiled once per shape and cached.
+
+    ```python
+    transact.put(item, **ConditionExpr(Attr('sk').not_exists()))
+    ```
+    """
+
+    def __init__(
+        self,
+        cond: Condition,
+        *,
+        placeholders: type[Placeholders] = CompactPlaceholders,
+    ) -> None:
+        super().__init__()
+        shape = (ConditionExpr, placeholders, cond.shape())
+        compiled = _cached(shape, lambda: _compile([], cond, placeholders()))
+
+        self.condition = cond
+        self['cond_expr'] = compiled.cond_expr
+        self['expr_attr_names'] = dict(compiled.names)
+        self['expr_attr_values'] = dict(zip(compiled.values, cond.values()))
 
 
 class UpdateExpr(dict):
-    def __init__(self, *args) -> None:
+    """
+    Build the `update_expr`, `expr_attr_names` and `expr_attr_values` for an
+    update from a list of actions.
+
+    The expression and placeholders are compiled once per shape (action types,
+    paths and operands) and cached, so repeated updates only bind new values.
+
+    Pass `placeholders=CompactPlaceholders` for short placeholders and
+    nested paths split into per-segment names.
+
+    With `cond`, a `cond_expr` is compiled into the same placeholder namespace.
+    Compact placeholders are then used by default, since path-derived value
+    placeholders could collide between the update and the condition.
+    """
+
+    def __init__(
+        self,
+        *args,
+        cond: Condition | None = None,
+        placeholders: type[Placeholders] | None = None,
+    ) -> None:
         super().__init__()
         exprs = [x for x in args if x.value is not None]
-        self.update(self.__asdict(exprs))
 
-    def __asdict(self, exprs: list[Expr] = []) -> dict:
-        expr_attr_names = reduce(
-            lambda acc, attr: {**acc, **attr.expr_attr_names()}, exprs, {}
-        )
-        expr_attr_values = reduce(
-            lambda acc, attr: {**acc, **attr.expr_attr_values()}, exprs, {}
+        if placeholders is None:
+            placeholders = CompactPlaceholders if cond else Placeholders
+
+        self.actions = exprs
+        self.condition = cond
+        self.placeholders = placeholders
+        self.update(self.__asdict(exprs, cond, placeholders))
+
+    def __asdict(
+        self,
+        exprs: list[Expr],
+        cond: Condition | None,
+        placeholders: type[Placeholders],
+    ) -> dict:
+        shape = (
+            UpdateExpr,
+            placeholders,
+            cond.shape() if cond else None,
+            *(attr.shape() for attr in exprs),
         )
+        compiled = _cached(shape, lambda: _compile(exprs, cond, placeholders()))
+        values = [value for attr in exprs for value in attr.values()]
 
-        sets = list(filter(lambda attr: isinstance(attr, Set), exprs))
-        adds = list(filter(lambda attr: isinstance(attr, Add), exprs))
-        removes = list(filter(lambda attr: isinstance(attr, Remove), exprs))
-        deletes = list(filter(lambda attr: isinstance(attr, Delete), exprs))
+        if cond:
+            values.extend(cond.values())
 
-        expr_parts = []
-        if sets:
-            set_expr = ', '.join(attr.expr() for attr in sets)
-            expr_parts.append(f'SET {set_expr}')
+        attrs = {
+            'update_expr': compiled.update_expr,
+            'expr_attr_names': dict(compiled.names),
+            'expr_attr_values': dict(zip(compiled.values, values)),
+        }
 
-        if adds:
-            add_expr = ', '.join(attr.expr() for attr in adds)
-            expr_parts.append(f'ADD {add_expr}')
+        if cond:
+            attrs['cond_expr'] = compiled.cond_expr
 
-        if removes:
-            remove_expr = ', '.join(attr.expr() for attr in removes)
-            expr_parts.append(f'REMOVE {remove_expr}')
+        return attrs
 
-        if deletes:
-            delete_expr = ', '.join(attr.expr() for attr in deletes)
-            expr_parts.append(f'DELETE {delete_expr}')
 
-        update_expr = ' '.join(expr_parts)
+def evaluate(cond: Condition | Mapping, item: Mapping | None) -> bool:
+    """
+    Evaluate a condition against an item the way DynamoDB would, where
+    `None` stands for an item that doesn't exist.
 
-        return {
-            'update_expr': update_expr,
-            'expr_attr_names': expr_attr_names,
-            'expr_attr_values': expr_attr_values,
-        }
+    `cond` is a `Condition`, or the keyword arguments of a write with a
+    `cond_expr`, such as a `ConditionExpr` or an `UpdateExpr` built with
+    `cond`.
+
+    ```python
+    cond = ConditionExpr(Attr('stock').gte(1))
+
+    if evaluate(cond, cache.get_item('pytest', key, client=client)):
+        transact.update(key, **UpdateExpr(Add(stock=-1), cond=cond.condition))
+    ```
+
+    Raises `ExpressionError` where DynamoDB would reject the expression
+    with a `ValidationException`.
+    """
+    if isinstance(cond, Condition):
+        cond = ConditionExpr(cond)
+
+    test = parse_condition(cond['cond_expr'])
+    return test(
+        _wire(item),
+        cond.get('expr_attr_names') or {},
+        serialize(cond.get('expr_attr_values') or {}),
+    )
+
+
+def apply(
+    update: Mapping,
+    item: Mapping | None,
+    *,
+    number: NumberMode = 'decimal',
+) -> dict:
+    """
+    Return the item DynamoDB would store after applying the actions of an
+    `UpdateExpr`, or of keyword arguments with an `update_expr`, to `item`.
+
+    Numbers come back as `Decimal`, or per `number` like `deserialize`.
+    The condition of the update isn't checked, use `evaluate()` for that.
+    `item` is left untouched.
+
+    Raises `ExpressionError` where DynamoDB would reject the update
+    with a `ValidationException`.
+    """
+    actions = parse_update(update['update_expr'])
+    new = actions(
+        _wire(item),
+        update.get('expr_attr_names') or {},
+        serialize(update.get('expr_attr_values') or {}),
+    )
+    return deserialize(new, number=number)
+
+
+def _wire(item: Mapping | None) -> Mapping:
+    if item is None:
+        return {}
+
+    # Items read through the cache or a reader are already in wire format
+    if isinstance(item, LazyItem):
+        return item.raw
+
+    return serialize(item)
@@ -0,0 +1,891 @@
+import math
+import threading
+import zlib
+from types import SimpleNamespace
+from typing import Any, Callable, Iterable, NamedTuple
+
+from botocore.exceptions import ClientError
+
+from ._expr_eval import (
+    Condition,
+    ExpressionError,
+    Item,
+    Update,
+    copy_item,
+    equal,
+    parse_condition,
+    parse_key_condition,
+    parse_projection,
+    parse_update,
+    resolve,
+    sort_key,
+)
+from .types import item_size
+
+# https://docs.aws.amazon.com/amazondynamodb/latest/developerguide/ServiceQuotas.html
+ITEM_MAX_BYTES = 400 * 1024
+PAGE_MAX_BYTES = 1024 * 1024
+
+
+class ConditionalCheckFailedException(ClientError): ...
+
+
+class TransactionCanceledException(ClientError): ...
+
+
+class ResourceNotFoundException(ClientError): ...
+
+
+class ResourceInUseException(ClientError): ...
+
+
+class IdempotentParameterMismatchException(ClientError): ...
+
+
+class _Table:
+    def __init__(
+        self,
+        name: str,
+        key_schema: list[dict],
+        indexes: list[dict],
+    ) -> None:
+        self.name = name
+        self.key_attrs = _key_attrs(key_schema)
+        self.indexes = {
+            index['IndexName']: _key_attrs(index['KeySchema']) for index in indexes
+        }
+        # Items by partition key, then by sort key
+        self.partitions: dict[Any, dict[Any, Item]] = {}
+
+    def key(self, key: dict, *, operation: str) -> tuple:
+        if key.keys() != set(self.key_attrs):
+            raise _validation(
+                'The provided key element does not match the schema', operation
+            )
+
+        return self.item_key(key)
+
+    def item_key(self, item: dict) -> tuple:
+        hash_key, *range_key = self.key_attrs
+        return (
+            _hashable(item[hash_key]),
+            _hashable(item[range_key[0]]) if range_key else None,
+        )
+
+    def get(self, key: tuple) -> Item | None:
+        hash_key, range_key = key
+        return self.partitions.get(hash_key, {}).get(range_key)
+
+    def store(self, key: tuple, item: Item | None) -> None:
+        hash_key, range_key = key
+
+        if item is not None:
+            self.partitions.setdefault(hash_key, {})[range_key] = item
+            return
+
+        partition = self.partitions.get(hash_key, {})
+        partition.pop(range_key, None)
+
+        if not partition:
+            self.partitions.pop(hash_key, None)
+
+    def items(self) -> Iterable[Item]:
+        for partition in self.partitions.values():
+            yield from partition.values()
+
+    def description(self) -> dict:
+        return {
+            'TableName': self.name,
+            'TableStatus': 'ACTIVE',
+            'KeySchema': _key_schema(self.key_attrs),
+            'ItemCount': sum(len(p) for p in self.partitions.values()),
+        }
+
+
+class _Write(NamedTuple):
+    table: _Table
+    key: tuple
+    body: dict
+    condition: Condition | None
+    update: Update | None
+    kind: str
+
+
+class _ConditionFailed(Exception):
+    def __init__(self, item: Item | None) -> None:
+        self.item = item
+
+
+class FakeClient:
+    """
+    An in-memory stand-in for a boto3 DynamoDB client, for tests and
+    benchmarks that shouldn't need DynamoDB Local.
+
+    ```python
+    client = FakeClient()
+    client.create_table(
+        TableName='pytest',
+        KeySchema=[
+            {'AttributeName': 'pk', 'KeyType': 'HASH'},
+            {'AttributeName': 'sk', 'KeyType': 'RANGE'},
+        ],
+        AttributeDefinitions=[...],
+    )
+    ```
+
+    Condition, update, key condition, filter and projection expressions
+    are evaluated like DynamoDB does. Transactions are all-or-nothing and
+    fail with the same `CancellationReasons`. Errors are raised as
+    `botocore.exceptions.ClientError` subclasses, found on `exceptions`
+    as on a real client. Reserved words aren't enforced, and there's no
+    throttling, so nothing is ever left unprocessed.
+    """
+
+    exceptions = SimpleNamespace(
+        ClientError=ClientError,
+        ConditionalCheckFailedException=ConditionalCheckFailedException,
+        TransactionCanceledException=TransactionCanceledException,
+        ResourceNotFoundException=ResourceNotFoundException,
+        ResourceInUseException=ResourceInUseException,
+        IdempotentParameterMismatchException=IdempotentParameterMismatchException,
+    )
+
+    def __init__(self) -> None:
+        self._tables: dict[str, _Table] = {}
+        self._tokens: dict[str, str] = {}
+        self._lock = threading.RLock()
+
+    # Tables
+
+    def create_table(
+        self,
+        *,
+        TableName: str,
+        KeySchema: list[dict],
+        GlobalSecondaryIndexes: list[dict] = [],
+        LocalSecondaryIndexes: list[dict] = [],
+        **kwargs: Any,
+    ) -> dict:
+        with self._lock:
+            if TableName in self._tables:
+                raise _error(
+                    ResourceInUseException,
+                    'ResourceInUseException',
+                    f'Table already exists: {TableName}',
+                    'CreateTable',
+                )
+
+            table = self._tables[TableName] = _Table(
+                TableName,
+                KeySchema,
+                GlobalSecondaryIndexes + LocalSecondaryIndexes,
+            )
+            return {'TableDescription': table.description()}
+
+    def delete_table(self, *, TableName: str) -> dict:
+        with self._lock:
+            table = self._table(TableName, 'DeleteTable')
+            del self._tables[TableName]
+            return {'TableDescription': table.description()}
+
+    def describe_table(self, *, TableName: str) -> dict:
+        with self._lock:
+            return {'Table': self._table(TableName, 'DescribeTable').description()}
+
+    # Items
+
+    def get_item(
+        self,
+        *,
+        TableName: str,
+        Key: dict,
+        ProjectionExpression: str | None = None,
+        ExpressionAttributeNames: dict | None = None,
+        ConsistentRead: bool = False,
+        ReturnConsumedCapacity: str = 'NONE',
+    ) -> dict:
+        with self._lock:
+            table = self._table(TableName, 'GetItem')
+            item = table.get(table.key(Key, operation='GetItem'))
+            response: dict = {}
+
+            if item is not None:
+                response['Item'] = _project(
+                    item,
+                    ProjectionExpression,
+                    ExpressionAttributeNames,
+                    'GetItem',
+                )
+
+            units = _read_units(item_size(item) if item else 0, ConsistentRead)
+            return _with_capacity(response, table, units, ReturnConsumedCapacity)
+
+    def put_item(self, **kwargs: Any) -> dict:
+        return self._write('Put', kwargs, 'PutItem')
+
+    def update_item(self, **kwargs: Any) -> dict:
+        return self._write('Update', kwargs, 'UpdateItem')
+
+    def delete_item(self, **kwargs: Any) -> dict:
+        return self._write('Delete', kwargs, 'DeleteItem')
+
+    def transact_write_items(
+        self,
+        *,
+        TransactItems: list[dict],
+        ClientRequestToken: str | None = None,
+        ReturnConsumedCapacity: str = 'NONE',
+        ReturnItemCollectionMetrics: str = 'NONE',
+    ) -> dict:
+        operation = 'TransactWriteItems'
+
+        if not 0 < len(TransactItems) <= 100:
+            raise _validation(
+                'Member must have length less than or equal to 100', operation
+            )
+
+        with self._lock:
+            if ClientRequestToken is not None:
+                fingerprint = repr(TransactItems)
+                previous = self._tokens.get(ClientRequestToken)
+
+                if previous == fingerprint:
+                    # Already committed, retrying is a no-op
+                    return {}
+
+                if previous is not None:
+                    raise _error(
+                        IdempotentParameterMismatchException,
+                        'IdempotentParameterMismatchException',
+                        'The request uses the same client token as a previous, '
+                        'but non-identical request.',
+                        operation,
+                    )
+
+            writes = []
+
+            for transact_item in TransactItems:
+                ((kind, body),) = transact_item.items()
+                writes.append(self._parse(kind, body, operation))
+
+            keys = [(write.table.name, write.key) for write in writes]
+
+            if len(set(keys)) < len(keys):
+                raise _validation(
+                    'Transaction request cannot include multiple operations '
+                    'on one item',
+                    operation,
+                )
+
+            images: list[tuple[Item | None, Item | None]] = []
+            reasons: list[dict] = []
+
+            for write in writes:
+                try:
+                    images.append(self._evaluate(write, operation))
+                    reasons.append({'Code': 'None'})
+                except _ConditionFailed as err:
+                    reason = {
+                        'Code': 'ConditionalCheckFailed',
+                        'Message': 'The conditional request failed',
+                    }
+
+                    if (
+                        err.item is not None
+                        and write.body.get('ReturnValuesOnConditionCheckFailure')
+                        == 'ALL_OLD'
+                    ):
+                        reason['Item'] = copy_item(err.item)
+
+                    reasons.append(reason)
+                except ExpressionError as err:
+                    reasons.append({'Code': 'ValidationError', 'Message': err.msg})
+
+            if any(reason['Code'] != 'None' for reason in reasons):
+                codes = ', '.join(reason['Code'] for reason in reasons)
+                raise _error(
+                    TransactionCanceledException,
+                    'TransactionCanceledException',
+                    'Transaction cancelled, please refer cancellation reasons '
+                    f'for specific reasons [{codes}]',
+                    operation,
+                    CancellationReasons=reasons,
+                )
+
+            capacity: dict[str, float] = {}
+
+            for write, (old, new) in zip(writes, images):
+                if write.kind != 'ConditionCheck':
+                    write.table.store(write.key, new)
+
+                # Transactional writes cost twice as much
+                units = 2 * _write_units(old, new)
+                capacity[write.table.name] = capacity.get(write.table.name, 0) + units
+
+            if ClientRequestToken is not None:
+                self._tokens[ClientRequestToken] = fingerprint
+
+            response: dict = {}
+
+            if ReturnConsumedCapacity in ('TOTAL', 'INDEXES'):
+                response['ConsumedCapacity'] = [
+                    _capacity(self._tables[name], units, ReturnConsumedCapacity)
+                    for name, units in capacity.items()
+                ]
+
+            return response
+
+    # Batches
+
+    def batch_write_item(
+        self,
+        *,
+        RequestItems: dict[str, list[dict]],
+        ReturnConsumedCapacity: str = 'NONE',
+        ReturnItemCollectionMetrics: str = 'NONE',
+    ) -> dict:
+        operation = 'BatchWriteItem'
+
+        if not 0 < sum(len(r) for r in RequestItems.values()) <= 25:
+            raise _validation(
+                'Too many items requested for the BatchWriteItem call', operation
+            )
+
+        with self._lock:
+            writes = []
+
+            for table_name, requests in RequestItems.items():
+                table = self._table(table_name, operation)
+
+                for request in requests:
+                    if 'PutRequest' in request:
+                        item = request['PutRequest']['Item']
+                        key = _put_key(table, item, operation)
+                        _check_size(item, operation)
+                        writes.append((table, key, copy_item(item)))
+                    else:
+                        key = table.key(
+                            request['DeleteRequest']['Key'], operation=operation
+                        )
+                        writes.append((table, key, None))
+
+            keys = [(table.name, key) for table, key, _ in writes]
+
+            if len(set(keys)) < len(keys):
+                raise _validation(
+                    'Provided list of item keys contains duplicates', operation
+                )
+
+            for table, key, item in writes:
+                table.store(key, item)
+
+            return {'UnprocessedItems': {}}
+
+    def batch_get_item(
+        self,
+        *,
+        RequestItems: dict[str, dict],
+        ReturnConsumedCapacity: str = 'NONE',
+    ) -> dict:
+        operation = 'BatchGetItem'
+
+        if not 0 < sum(len(r['Keys']) for r in RequestItems.values()) <= 100:
+            raise _validation(
+                'Too many items requested for the BatchGetItem call', operation
+            )
+
+        with self._lock:
+            responses: dict[str, list] = {}
+
+            for table_name, request in RequestItems.items():
+                table = self._table(table_name, operation)
+                keys = [table.key(key, operation=operation) for key in request['Keys']]
+
+                if len(set(keys)) < len(keys):
+                    raise _validation(
+                        'Provided list of item keys contains duplicates', operation
+                    )
+
+                responses[table_name] = [
+                    _project(
+                        item,
+                        request.get('ProjectionExpression'),
+                        request.get('ExpressionAttributeNames'),
+                        operation,
+                    )
+                    for key in keys
+                    if (item := table.get(key)) is not None
+                ]
+
+            return {'Responses': responses, 'UnprocessedKeys': {}}
+
+    # Reads
+
+    def query(
+        self,
+        *,
+        TableName: str,
+        KeyConditionExpression: str,
+        IndexName: str | None = None,
+        ScanIndexForward: bool = True,
+        **kwargs: Any,
+    ) -> dict:
+        operation = 'Query'
+
+        with self._lock:
+            table = self._table(TableName, operation)
+            key_attrs = self._key_attrs(table, IndexName, operation)
+            names = kwargs.get('ExpressionAttributeNames') or {}
+            values = kwargs.get('ExpressionAttributeValues') or {}
+
+            try:
+                key_cond = parse_key_condition(KeyConditionExpression)
+                partition = _partition(key_cond.equalities, key_attrs[0], names, values)
+            except ExpressionError as err:
+                raise _validation(err.msg, operation) from None
+
+            if partition is None:
+                raise _validation(
+                    'Query condition missed key schema element', operation
+                )
+
+            if IndexName:
+                candidates = [
+                    item
+                    for item in table.items()
+                    if all(attr in item for attr in key_attrs)
+                    and equal(item[key_attrs[0]], partition)
+                ]
+            else:
+                candidates = list(
+                    table.partitions.get(_hashable(partition), {}).values()
+                )
+
+            # Ordered by sort key within the partition,
+            # then by the table keys to break ties in indexes
+            order = key_attrs[1:] + table.key_attrs
+            return self._read(
+                table,
+                candidates,
+                order,
+                key_cond,
+                not ScanIndexForward,
+                operation,
+                **kwargs,
+            )
+
+    def scan(
+        self,
+        *,
+        TableName: str,
+        IndexName: str | None = None,
+        Segment: int | None = None,
+        TotalSegments: int | None = None,
+        **kwargs: Any,
+    ) -> dict:
+        operation = 'Scan'
+
+        with self._lock:
+            table = self._table(TableName, operation)
+            key_attrs = self._key_attrs(table, IndexName, operation)
+            candidates = [
+                item
+                for item in table.items()
+                if all(attr in item for attr in key_attrs)
+                and (
+                    TotalSegments is None
+                    or _segment(item[key_attrs[0]], TotalSegments) == Segment
+                )
+            ]
+            return self._read(
+                table,
+                candidates,
+                key_attrs + table.key_attrs,
+                None,
+                False,
+                operation,
+                **kwargs,
+            )
+
+    # Helpers
+
+    def _table(self, table_name: str, operation: str) -> _Table:
+        try:
+            return self._tables[table_name]
+        except KeyError:
+            raise _error(
+                ResourceNotFoundException,
+                'ResourceNotFoundException',
+                'Requested resource not found',
+                operation,
+            ) from None
+
+    def _key_attrs(
+        self,
+        table: _Table,
+        index_name: str | None,
+        operation: str,
+    ) -> tuple[str, ...]:
+        if not index_name:
+            return table.key_attrs
+
+        try:
+            return table.indexes[index_name]
+        except KeyError:
+            raise _validation(
+                'The table does not have the specified index: ' + index_name,
+                operation,
+            ) from None
+
+    def _parse(self, kind: str, body: dict, operation: str) -> _Write:
+        """Validate a write and parse its expressions, without evaluating them."""
+        table = self._table(body['TableName'], operation)
+
+        if kind == 'Put':
+            _check_size(body['Item'], operation)
+            key = _put_key(table, body['Item'], operation)
+        else:
+            key = table.key(body['Key'], operation=operation)
+
+        try:
+            condition = update = None
+            used_names: set[str] = set()
+            used_values: set[str] = set()
+
+            if cond_expr := body.get('ConditionExpression'):
+                condition = parse_condition(cond_expr)
+                used_names |= condition.names
+                used_values |= condition.values
+
+            if kind == 'Update':
+                update = parse_update(body['UpdateExpression'])
+                used_names |= update.names
+                used_values |= update.values
+        except ExpressionError as err:
+            raise _validation(err.msg, operation) from None
+
+        _check_unused(body, used_names, used_values, operation)
+        return _Write(table, key, body, condition, update, kind)
+
+    def _evaluate(
+        self,
+        write: _Write,
+        operation: str,
+    ) -> tuple[Item | None, Item | None]:
+        """Return the item before and after a write, if its condition holds."""
+        old = write.table.get(write.key)
+        names = write.body.get('ExpressionAttributeNames') or {}
+        values = write.body.get('ExpressionAttributeValues') or {}
+
+        if write.condition and not write.condition(old or {}, names, values):
+            raise _ConditionFailed(old)
+
+        match write.kind:
+            case 'Put':
+                return old, copy_item(write.body['Item'])
+            case 'Delete':
+                return old, None
+            case 'ConditionCheck':
+                return old, old
+
+        base = old or dict(write.body['Key'])
+        new = write.update(base, names, values)  # type: ignore
+
+        for attr in write.table.key_attrs:
+            if not (attr in new and equal(new[attr], base[attr])):
+                raise ExpressionError(
+                    f'Cannot update attribute {attr}. This attribute is part of the key'
+                )
+
+        if item_size(new) > ITEM_MAX_BYTES:
+            raise ExpressionError('Item size has exceeded the maximum allowed size')
+
+        return old, new
+
+    def _write(self, kind: str, body: dict, operation: str) -> dict:
+        with self._lock:
+            write = self._parse(kind, body, operation)
+
+            try:
+                old, new = self._evaluate(write, operation)
+            except _ConditionFailed as err:
+                response: dict = {}
+
+                if (
+                    err.item is not None
+                    and body.get('ReturnValuesOnConditionCheckFailure') == 'ALL_OLD'
+                ):
+                    response['Item'] = copy_item(err.item)
+
+                raise _error(
+                    ConditionalCheckFailedException,
+                    'ConditionalCheckFailedException',
+                    'The conditional request failed',
+                    operation,
+                    **response,
+                ) from None
+            except ExpressionError as err:
+                raise _validation(err.msg, operation) from None
+
+            write.table.store(write.key, new)
+            response = {}
+            returned = _returned(body.get('ReturnValues', 'NONE'), old, new)
+
+            if returned:
+                response['Attributes'] = returned
+
+            units = _write_units(old, new)
+            return _with_capacity(
+                response,
+                write.table,
+                units,
+                body.get('ReturnConsumedCapacity', 'NONE'),
+            )
+
+    def _read(
+        self,
+        table: _Table,
+        candidates: list[Item],
+        order: tuple[str, ...],
+        key_cond: Callable | None,
+        reverse: bool,
+        operation: str,
+        *,
+        FilterExpression: str | None = None,
+        ProjectionExpression: str | None = None,
+        ExpressionAttributeNames: dict | None = None,
+        ExpressionAttributeValues: dict | None = None,
+        Limit: int | None = None,
+        ExclusiveStartKey: dict | None = None,
+        Select: str = 'ALL_ATTRIBUTES',
+        ConsistentRead: bool = False,
+        ReturnConsumedCapacity: str = 'NONE',
+    ) -> dict:
+        names = ExpressionAttributeNames or {}
+        values = ExpressionAttributeValues or {}
+        order = tuple(dict.fromkeys(order))
+
+        def position(item: dict) -> tuple:
+            return tuple(sort_key(item[attr]) for attr in order)
+
+        try:
+            used_names: set[str] = set()
+            used_values: set[str] = set()
+            filter_expr = None
+
+            for expr in (key_cond, FilterExpression):
+                if isinstance(expr, str):
+                    expr = filter_expr = parse_condition(expr)
+
+                if expr:
+                    used_names |= expr.names  # type: ignore
+                    used_values |= expr.values  # type: ignore
+
+            if ProjectionExpression:
+                used_names |= parse_projection(ProjectionExpression).names
+
+            _check_unused(
+                {
+                    'ExpressionAttributeNames': names,
+                    'ExpressionAttributeValues': values,
+                },
+                used_names,
+                used_values,
+                operation,
+            )
+
+            candidates = sorted(candidates, key=position, reverse=reverse)
+
+            if ExclusiveStartKey:
+                start = position(ExclusiveStartKey)
+                candidates = [
+                    item
+                    for item in candidates
+                    if (position(item) < start if reverse else position(item) > start)
+                ]
+
+            items: list[Item] = []
+            scanned = 0
+            scanned_bytes = 0
+            last_key = None
+
+            for item in candidates:
+                if key_cond and not key_cond(item, names, values):
+                    continue
+
+                scanned += 1
+                scanned_bytes += item_size(item)
+
+                if filter_expr is None or filter_expr(item, names, values):
+                    items.append(item)
+
+                if scanned == Limit or scanned_bytes >= PAGE_MAX_BYTES:
+                    last_key = {attr: item[attr] for attr in order}
+                    break
+        except ExpressionError as err:
+            raise _validation(err.msg, operation) from None
+
+        response: dict = {'Count': len(items), 'ScannedCount': scanned}
+
+        if Select != 'COUNT':
+            response['Items'] = [
+                _project(item, ProjectionExpression, names, operation) for item in items
+            ]
+
+        if last_key:
+            response['LastEvaluatedKey'] = copy_item(last_key)
+
+        units = _read_units(scanned_bytes, ConsistentRead)
+        return _with_capacity(response, table, units, ReturnConsumedCapacity)
+
+
+def _key_attrs(key_schema: list[dict]) -> tuple[str, ...]:
+    # The partition key comes first
+    ordered = sorted(key_schema, key=lambda k: k['KeyType'] != 'HASH')
+    return tuple(k['AttributeName'] for k in ordered)
+
+
+def _key_schema(key_attrs: tuple[str, ...]) -> list[dict]:
+    return [
+        {'AttributeName': attr, 'KeyType': key_type}
+        for attr, key_type in zip(key_attrs, ('HASH', 'RANGE'))
+    ]
+
+
+def _hashable(value: dict) -> tuple:
+    ((dynamodb_type, v),) = value.items()
+    return (dynamodb_type, sort_key(value) if dynamodb_type != 'S' else v)
+
+
+def _put_key(table: _Table, item: dict, operation: str) -> tuple:
+    for attr in table.key_attrs:
+        if attr not in item:
+            raise _validation(
+                'One or more parameter values were invalid: '
+                f'Missing the key {attr} in the item',
+                operation,
+            )
+
+    return table.item_key(item)
+
+
+def _partition(
+    equalities: tuple,
+    hash_key: str,
+    names: dict,
+    values: dict,
+) -> dict | None:
+    for path, token in equalities:
+        if resolve(path, names) == (hash_key,):
+            try:
+                return values[token]
+            except KeyError:
+                raise ExpressionError(
+                    'An expression attribute value used in expression '
+                    f'is not defined; attribute value: {token}'
+                ) from None
+
+    return None
+
+
+def _segment(value: dict, total_segments: int) -> int:
+    return zlib.crc32(repr(_hashable(value)).encode()) % total_segments
+
+
+def _check_size(item: dict, operation: str) -> None:
+    if item_size(item) > ITEM_MAX_BYTES:
+        raise _validation('Item size has exceeded the maximum allowed size', operation)
+
+
+def _check_unused(
+    body: dict,
+    used_names: set[str],
+    used_values: set[str],
+    operation: str,
+) -> None:
+    for param, used in (
+        ('ExpressionAttributeNames', used_names),
+        ('ExpressionAttributeValues', used_values),
+    ):
+        unused = set(body.get(param) or {}) - used
+
+        if unused:
+            raise _validation(
+                f'Value provided in {param} unused in expressions: '
+                f'keys: {{{", ".join(sorted(unused))}}}',
+                operation,
+            )
+
+
+def _project(
+    item: Item,
+    projection: str | None,
+    names: dict | None,
+    operation: str,
+) -> Item:
+    if not projection:
+        return copy_item(item)
+
+    try:
+        return copy_item(parse_projection(projection)(item, names or {}))
+    except ExpressionError as err:
+        raise _validation(err.msg, operation) from None
+
+
+def _returned(return_values: str, old: Item | None, new: Item | None) -> Item | None:
+    match return_values:
+        case 'ALL_OLD':
+            return copy_item(old) if old else None
+        case 'ALL_NEW':
+            return copy_item(new) if new else None
+        case 'UPDATED_OLD' | 'UPDATED_NEW':
+            old, new = old or {}, new or {}
+            source = old if return_values == 'UPDATED_OLD' else new
+            changed = {
+                k: v
+                for k, v in source.items()
+                if k not in old or k not in new or not equal(old[k], new[k])
+            }
+            return copy_item(changed) if changed else None
+
+    return None
+
+
+def _write_units(old: Item | None, new: Item | None) -> float:
+    size = max(item_size(old) if old else 0, item_size(new) if new else 0)
+    return max(1, math.ceil(size / 1024))
+
+
+def _read_units(size: int, consistent_read: bool) -> float:
+    units = max(1, math.ceil(size / 4096))
+    return units if consistent_read else units / 2
+
+
+def _capacity(table: _Table, units: float, mode: str) -> dict:
+    capacity: dict = {'TableName': table.name, 'CapacityUnits': units}
+
+    if mode == 'INDEXES':
+        capacity['Table'] = {'CapacityUnits': units}
+
+    return capacity
+
+
+def _with_capacity(response: dict, table: _Table, units: float, mode: str) -> dict:
+    if mode in ('TOTAL', 'INDEXES'):
+        response['ConsumedCapacity'] = _capacity(table, units, mode)
+
+    return response
+
+
+def _validation(msg: str, operation: str) -> ClientError:
+    return _error(ClientError, 'ValidationException', msg, operation)
+
+
+def _error(
+    cls: type[ClientError],
+    code: str,
+    msg: str,
+    operation: str,
+    **extra: Any,
+) -> ClientError:
+    return cls({'Error': {'Code': code, 'Message': msg}, **extra}, operation)  # type: ignore
@@ -0,0 +1,294 @@
+import queue
+import threading
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Iterable,
+    Iterator,
+    Literal,
+    Mapping,
+    TypedDict,
+)
+
+from .expressions import CompactPlaceholders, Condition
+from .types import LazyItem, NumberMode, deserialize, serialize
+
+if TYPE_CHECKING:
+    from mypy_boto3_dynamodb.client import DynamoDBClient
+else:
+    DynamoDBClient = object
+
+
+class PageStats(TypedDict):
+    segment: int | None
+    count: int
+    scanned_count: int
+    consumed_capacity: dict | None
+
+
+class _Done:
+    """Put on the queue by a worker once its segment is exhausted."""
+
+
+class BaseReader(ABC):
+    """
+    Iterate over the items of a query or scan, fetching pages in background
+    threads while the current one is being processed.
+
+    Fetched pages wait in a queue of `max_buffered_pages`. Each page is at
+    most 1 MB, so at most `max_buffered_pages` plus one page per worker
+    are held in memory at any time.
+    """
+
+    def __init__(
+        self,
+        table_name: str,
+        *,
+        client: DynamoDBClient,
+        filter_expr: str | Condition | None = None,
+        projection: Iterable[str] | None = None,
+        index_name: str | None = None,
+        consistent_read: bool = False,
+        page_size: int | None = None,
+        expr_attr_names: dict | None = None,
+        expr_attr_values: dict | None = None,
+        lazy: bool = False,
+        number: NumberMode = 'decimal',
+        max_buffered_pages: int = 2,
+        return_consumed_capacity: Literal['INDEXES', 'TOTAL', 'NONE'] = 'TOTAL',
+        on_page: Callable[[PageStats], None] | None = None,
+    ) -> None:
+        if max_buffered_pages < 1:
+            raise ValueError('max_buffered_pages must be at least 1')
+
+        self._client = client
+        self._lazy = lazy
+        self._number = number
+        self._max_buffered_pages = max_buffered_pages
+        self._on_page = on_page
+
+        request: dict = {
+            'TableName': table_name,
+            'ConsistentRead': consistent_read,
+            'ReturnConsumedCapacity': return_consumed_capacity,
+        }
+
+        if index_name:
+            request['IndexName'] = index_name
+
+        if page_size:
+            request['Limit'] = page_size
+
+        self._request = request
+        self._filter_expr = filter_expr
+        self._projection = list(projection or [])
+        self._expr_attr_names = expr_attr_names or {}
+        self._expr_attr_values = expr_attr_values or {}
+
+    def __iter__(self) -> Iterator[dict | LazyItem]:
+        for page in self.pages():
+            yield from page
+
+    def pages(self) -> Iterator[list[dict | LazyItem]]:
+        """Yield the items one page at a time, as pages arrive."""
+        with closing(self.pages_with_stats()) as pages:
+            for _, items in pages:
+                yield items
+
+    def pages_with_stats(self) -> Iterator[tuple[PageStats, list[dict | LazyItem]]]:
+        """Like `pages`, but yield each page with its `PageStats`."""
+        requests = self._segments(self._compile())
+        pages: queue.Queue = queue.Queue(maxsize=self._max_buffered_pages)
+        stop = threading.Event()
+        executor = ThreadPoolExecutor(
+            max_workers=len(requests),
+            thread_name_prefix=type(self).__name__,
+        )
+        running = len(requests)
+
+        for segment, request in requests:
+            executor.submit(self._produce, segment, request, pages, stop)
+
+        try:
+            while running:
+                page = pages.get()
+
+                if isinstance(page, _Done):
+                    running -= 1
+                    continue
+
+                if isinstance(page, BaseException):
+                    raise page
+
+                stats, items = page
+
+                if self._on_page:
+                    self._on_page(stats)
+
+                yield stats, items
+        finally:
+            # Stops the workers, even if the caller stopped iterating early
+            stop.set()
+            executor.shutdown(wait=False)
+
+    def _compile(self) -> dict:
+        request = dict(self._request)
+        placeholders = CompactPlaceholders()
+        values: list = []
+
+        for param, cond in self._conditions():
+            if isinstance(cond, Condition):
+                request[param] = cond.compile(placeholders)
+                values.extend(cond.values())
+            elif cond:
+                request[param] = cond
+
+        if self._projection:
+            request['ProjectionExpression'] = ', '.join(
+                placeholders.name(path) for path in self._projection
+            )
+
+        names = placeholders.names | self._expr_attr_names
+        values = dict(zip(placeholders.values, values)) | self._expr_attr_values
+
+        if names:
+            request['ExpressionAttributeNames'] = names
+
+        if values:
+            request['ExpressionAttributeValues'] = serialize(values)
+
+        return request
+
+    def _produce(
+        self,
+        segment: int | None,
+        request: dict,
+        pages: queue.Queue,
+        stop: threading.Event,
+    ) -> None:
+        try:
+            while not stop.is_set():
+                response = self._call(**request)
+                stats = PageStats(
+                    segment=segment,
+                    count=response['Count'],
+                    scanned_count=response['ScannedCount'],
+                    consumed_capacity=response.get('ConsumedCapacity'),
+                )
+
+                if not _put(pages, (stats, self._decode(response['Items'])), stop):
+                    return
+
+                if 'LastEvaluatedKey' not in response:
+                    break
+
+                request = request | {'ExclusiveStartKey': response['LastEvaluatedKey']}
+        except Exception as err:
+            _put(pages, err, stop)
+        else:
+            _put(pages, _Done(), stop)
+
+    def _decode(self, items: list[Mapping]) -> list[dict | LazyItem]:
+        if self._lazy:
+            return [LazyItem(item, number=self._number) for item in items]
+
+        return [deserialize(item, number=self._number) for item in items]
+
+    def _conditions(self) -> list[tuple[str, str | Condition | None]]:
+        return [('FilterExpression', self._filter_expr)]
+
+    def _segments(self, request: dict) -> list[tuple[int | None, dict]]:
+        return [(None, request)]
+
+    @abstractmethod
+    def _call(self, **kwargs) -> dict: ...
+
+
+class Query(BaseReader):
+    """
+    Iterate over the items matching a key condition.
+
+    ```python
+    for item in Query(
+        'pytest',
+        Attr('pk').eq('USER') & Attr('sk').begins_with('ORDER#'),
+        client=client,
+    ):
+        ...
+    ```
+    """
+
+    def __init__(
+        self,
+        table_name: str,
+        key_cond: str | Condition,
+        *,
+        client: DynamoDBClient,
+        scan_forward: bool = True,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(table_name, client=client, **kwargs)
+        self._key_cond = key_cond
+        self._request['ScanIndexForward'] = scan_forward
+
+    def _conditions(self) -> list[tuple[str, str | Condition | None]]:
+        # The key condition is compiled first, then the filter
+        return [('KeyConditionExpression', self._key_cond), *super()._conditions()]
+
+    def _call(self, **kwargs) -> dict:
+        return self._client.query(**kwargs)
+
+
+class Scan(BaseReader):
+    """
+    Iterate over every item in a table or index.
+
+    With `segments` above one, the table is split into `TotalSegments`
+    scanned in parallel, and items arrive in no particular order.
+    """
+
+    def __init__(
+        self,
+        table_name: str,
+        *,
+        client: DynamoDBClient,
+        segments: int = 1,
+        **kwargs: Any,
+    ) -> None:
+        if segments < 1:
+            raise ValueError('segments must be at least 1')
+
+        super().__init__(table_name, client=client, **kwargs)
+        self._total_segments = segments
+
+    def _segments(self, request: dict) -> list[tuple[int | None, dict]]:
+        if self._total_segments == 1:
+            return [(None, request)]
+
+        return [
+            (
+                segment,
+                request | {'Segment': segment, 'TotalSegments': self._total_segments},
+            )
+            for segment in range(self._total_segments)
+        ]
+
+    def _call(self, **kwargs) -> dict:
+        return self._client.scan(**kwargs)
+
+
+def _put(pages: queue.Queue, page: Any, stop: threading.Event) -> bool:
+    # Waits for room in the queue, giving up once the reader is closed
+    while not stop.is_set():
+        try:
+            pages.put(page, timeout=0.1)
+        except queue.Full:
+            continue
+        else:
+            return True
+
+    return False
@@ -0,0 +1,127 @@
+import base64
+import contextlib
+import json
+import threading
+import time
+from typing import IO, Any, Iterator, TypedDict
+
+from ._util import open_text
+
+RECORDED_OPERATIONS = frozenset(
+    {
+        'transact_write_items',
+        'batch_write_item',
+        'batch_get_item',
+        'get_item',
+        'put_item',
+        'update_item',
+        'delete_item',
+        'query',
+        'scan',
+    }
+)
+
+
+class Record(TypedDict):
+    op: str
+    at: float
+    latency: float
+    params: dict
+    error: str | None
+
+
+class RecordingClient:
+    """
+    Wrap a DynamoDB client and append the parameters of every call it makes
+    to a JSONL log, gzip-compressed when `path` ends with `.gz`.
+
+    ```python
+    with RecordingClient(client, 'traffic.jsonl.gz') as recording:
+        with TransactWriter('pytest', client=recording) as transact:
+            ...
+    ```
+
+    Any other attribute, such as `exceptions`, is read from the wrapped
+    client. Records are written as calls finish, so the log can be shared
+    between threads. Replay it with `python -m benchmarks.replay`.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        path: str,
+        *,
+        operations: frozenset[str] = RECORDED_OPERATIONS,
+    ) -> None:
+        self._client = client
+        self._operations = operations
+        self._fp: IO[str] = open_text(path, 'wt')
+        self._lock = threading.Lock()
+        self._started_at = time.perf_counter()
+
+    def __enter__(self) -> 'RecordingClient':
+        return self
+
+    def __exit__(self, *exc_details) -> None:
+        self.close()
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._client, name)
+
+        if name not in self._operations:
+            return attr
+
+        def call(**kwargs) -> Any:
+            sent_at = time.perf_counter()
+
+            try:
+                response = attr(**kwargs)
+            except Exception as err:
+                # A closed or broken log mustn't hide the original error
+                with contextlib.suppress(Exception):
+                    self._record(name, sent_at, kwargs, type(err).__name__)
+                raise
+
+            self._record(name, sent_at, kwargs, None)
+            return response
+
+        return call
+
+    def close(self) -> None:
+        with self._lock:
+            self._fp.close()
+
+    def _record(self, op: str, sent_at: float, params: dict, error: str | None) -> None:
+        record = Record(
+            op=op,
+            at=sent_at - self._started_at,
+            latency=time.perf_counter() - sent_at,
+            params=params,
+            error=error,
+        )
+        line = json.dumps(record, separators=(',', ':'), default=_encode)
+
+        with self._lock:
+            self._fp.write(line + '\n')
+
+
+def read_log(path: str) -> Iterator[Record]:
+    """Yield the records of a log written by `RecordingClient`."""
+    with open_text(path, 'rt') as fp:
+        for line in fp:
+            yield json.loads(line, object_hook=_decode)
+
+
+def _encode(value: Any) -> Any:
+    # Binary attribute values are the only non-JSON type in the wire format
+    if isinstance(value, (bytes, bytearray)):
+        return {'__b64__': base64.b64encode(value).decode()}
+
+    raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
+
+
+def _decode(obj: dict) -> Any:
+    if obj.keys() == {'__b64__'}:
+        return base64.b64decode(obj['__b64__'])
+
+    return obj
@@ -0,0 +1,166 @@
+import itertools
+import random
+from decimal import Decimal
+from typing import TYPE_CHECKING, Awaitable, Literal
+
+from .batch_getter import BatchGetter
+from .expressions import Add, Attr, UpdateExpr
+from .transact_writer import (
+    BaseTransactWriter,
+    RetryPolicy,
+    TransactionOperationFailed,
+    TransactWriter,
+)
+from .types import serialize
+from .write_behind import WriteBehindBuffer
+
+if TYPE_CHECKING:
+    from mypy_boto3_dynamodb.client import DynamoDBClient
+else:
+    DynamoDBClient = object
+
+
+class ShardedCounter:
+    """
+    A counter spread over `shards` items, so increments on a hot key
+    don't all land on the same item.
+
+    ```python
+    visits = ShardedCounter('pytest', {'pk': 'STATS', 'sk': 'VISITS'}, client=client)
+    visits.add(1)
+    visits.value()
+    ```
+
+    Each shard is the counter's key with `#0` to `#N-1` appended to
+    `shard_attr`, the sort key by default, and holds its part of the total
+    in `attr`. `add` picks a shard at random or round-robin, and `value`
+    sums every shard with a parallel `BatchGetter`.
+
+    `reshard` changes the number of shards online. Growing only spreads
+    the next writes further; shrinking folds each dropped shard into a
+    remaining one with a transaction conditioned on its value, so
+    concurrent increments aren't lost. Reads cover `max_shards` shards, so
+    keep it at least the largest shard count any writer still uses, and
+    run `reshard` again once every writer has switched to fold what was
+    written to the dropped shards in the meantime.
+    """
+
+    def __init__(
+        self,
+        table_name: str,
+        key: dict,
+        *,
+        client: DynamoDBClient,
+        shards: int = 10,
+        max_shards: int | None = None,
+        attr: str = 'total',
+        shard_attr: str = 'sk',
+        strategy: Literal['random', 'round_robin'] = 'random',
+        max_workers: int = 4,
+    ) -> None:
+        if shards < 1:
+            raise ValueError('shards must be at least 1')
+
+        self._table_name = table_name
+        self._key = key
+        self._client = client
+        self._shards = shards
+        self._max_shards = max(shards, max_shards or 0)
+        self._attr = attr
+        self._shard_attr = shard_attr
+        self._strategy = strategy
+        self._max_workers = max_workers
+        self._next = itertools.count()
+
+    @property
+    def shards(self) -> int:
+        return self._shards
+
+    def shard_key(self, idx: int) -> dict:
+        return self._key | {self._shard_attr: f'{self._key[self._shard_attr]}#{idx}'}
+
+    def add(
+        self,
+        amount: int | Decimal = 1,
+        *,
+        transact: BaseTransactWriter | WriteBehindBuffer | None = None,
+    ) -> Awaitable[None] | None:
+        """
+        Add `amount` to a shard, through `transact` when given, so the
+        increment is written along with its other operations. Through an
+        `AsyncTransactWriter`, await the result as you would its `update`.
+        """
+        if self._strategy == 'round_robin':
+            idx = next(self._next) % self._shards
+        else:
+            idx = random.randrange(self._shards)
+
+        update_expr = UpdateExpr(Add(**{self._attr: Decimal(amount)}))
+
+        if transact is not None:
+            return transact.update(
+                self.shard_key(idx), update_expr, table_name=self._table_name
+            )
+
+        with TransactWriter(self._table_name, client=self._client) as transact:
+            transact.update(self.shard_key(idx), update_expr)
+
+        return None
+
+    def value(self, *, consistent_read: bool = False) -> Decimal:
+        getter = BatchGetter(
+            self._table_name,
+            client=self._client,
+            max_workers=self._max_workers,
+            consistent_read=consistent_read,
+            projection=[self._attr],
+        )
+        items = getter.get(self.shard_key(idx) for idx in range(self._max_shards))
+        return sum((item.get(self._attr, 0) for item in items), Decimal(0))
+
+    def reshard(self, shards: int) -> None:
+        """Spread the counter over `shards` items from now on."""
+        if shards < 1:
+            raise ValueError('shards must be at least 1')
+
+        self._shards = shards
+        self._max_shards = max(self._max_shards, shards)
+
+        for idx in range(shards, self._max_shards):
+            self._fold(idx, idx % shards)
+
+    def _fold(self, source: int, target: int) -> None:
+        key = self.shard_key(source)
+        response = self._client.get_item(
+            TableName=self._table_name,
+            Key=serialize(key),
+            ConsistentRead=True,
+        )
+        amount = response.get('Item', {}).get(self._attr)
+
+        while amount is not None:
+            value = Decimal(amount['N'])
+
+            try:
+                with TransactWriter(
+                    self._table_name,
+                    client=self._client,
+                    retry=RetryPolicy(),
+                ) as transact:
+                    transact.delete(
+                        key,
+                        cond_expr=Attr(self._attr).eq(value),
+                        return_on_cond_fail='ALL_OLD',
+                    )
+                    transact.update(
+                        self.shard_key(target),
+                        UpdateExpr(Add(**{self._attr: value})),
+                    )
+            except TransactionOperationFailed as err:
+                if err.reason['code'] != 'ConditionalCheckFailed':
+                    raise
+
+                # Incremented since it was read, try again with its new value
+                amount = err.reason['old_item'].raw.get(self._attr)
+            else:
+                return
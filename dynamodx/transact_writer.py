@@ -1,22 +1,53 @@
-from typing import TYPE_CHECKING, Any, Literal, Self, Type, TypedDict
-
-import jmespath
-
-from .types import deserialize, serialize
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import suppress
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Hashable,
+    Literal,
+    Mapping,
+    Self,
+    Type,
+    TypedDict,
+)
+from uuid import uuid4
+
+from ._util import full_jitter
+from .cache import ItemCache
+from .expressions import (
+    CompactPlaceholders,
+    Condition,
+    ConditionExpr,
+    Expr,
+    Remove,
+    UpdateExpr,
+    action_reads,
+    is_plain_set,
+    top_level,
+)
+from .types import (
+    LazyItem,
+    Serialized,
+    attribute_value_size,
+    hashable_key,
+    item_size,
+    serialize,
+)
 
 if TYPE_CHECKING:
     from mypy_boto3_dynamodb.client import DynamoDBClient
-    from mypy_boto3_dynamodb.type_defs import TransactWriteItemTypeDef
 else:
     DynamoDBClient = object
-    TransactWriteItemTypeDef = Any
 
 
 class TransactionCanceledReason(TypedDict):
     code: str
     message: str
     operation: dict
-    old_item: dict
+    old_item: Mapping[str, Any]
 
 
 class TransactionOperationFailed(Exception):
@@ -46,73 +77,162 @@ class TransactionCanceledException(Exception):
         self.reasons = reasons
 
 
+# https://docs.aws.amazon.com/amazondynamodb/latest/developerguide/ServiceQuotas.html
+TRANSACT_WRITE_LIMIT = 100
+TRANSACT_WRITE_MAX_BYTES = 4 * 1024 * 1024
+ITEM_MAX_BYTES = 400 * 1024
+
+
+class ItemTooLargeError(ValueError):
+    def __init__(self, msg: str = '', *, size: int) -> None:
+        super().__init__(msg)
+        self.msg = msg
+        self.size = size
+
+
+class FlushStats(TypedDict):
+    operations: int
+    payload_bytes: int
+    attempts: int
+    cancellation_codes: list[str]
+    serialize_time: float
+    network_time: float
+    elapsed: float
+    consumed_wcu: dict[str, float]
+    item_collection_metrics: dict[str, list]
+    committed: bool
+
+
 class TransactOperation:
     def __init__(
         self,
         operation: dict,
         exc_cls: type[Exception] | None = None,
+        *,
+        actions: list[Expr] | None = None,
+        condition: Condition | None = None,
+        started_at: float | None = None,
     ) -> None:
         self.operation = operation
         self.exc_cls = exc_cls
+        self.size = _operation_size(operation)
+        # Kept for updates built only from expression objects,
+        # so they can be merged with other operations on the same key
+        self.actions = actions
+        self.condition = condition
+        # Time spent serializing and compiling the operation
+        self.encode_time = time.perf_counter() - started_at if started_at else 0.0
+
+
+class RetryPolicy:
+    """
+    Retry transaction cancellations whose reasons are all transient, with
+    exponential backoff and full jitter.
+
+    `ConditionalCheckFailed`, and any other code not in `retryable_codes`,
+    is never retried.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_attempts: int = 5,
+        backoff_base: float = 0.05,
+        backoff_max: float = 2.0,
+        retryable_codes: frozenset[str] = frozenset(
+            {
+                'TransactionConflict',
+                'ThrottlingError',
+                'ProvisionedThroughputExceeded',
+            }
+        ),
+    ) -> None:
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retryable_codes = retryable_codes
+
+    def delay(self, codes: list[str], attempt: int) -> float | None:
+        """Return how long to wait before retrying, or `None` to give up."""
+        if attempt >= self.max_attempts:
+            return None
+
+        codes = [code for code in codes if code != 'None']
 
+        if not codes or any(code not in self.retryable_codes for code in codes):
+            return None
+
+        return full_jitter(attempt, self.backoff_base, self.backoff_max)
+
+
+class BaseTransactWriter(ABC):
+    """
+    Build and buffer transactional operations. Subclasses decide how the
+    buffered chunks are sent, and what `put`, `update`, `delete` and
+    `condition` return: `None`, or an awaitable for async writers.
+    """
 
-class TransactWriter:
     def __init__(
         self,
         table_name: str,
         *,
-        flush_amount: int = 50,
+        flush_amount: int = TRANSACT_WRITE_LIMIT,
         client: DynamoDBClient,
         fail_fast: bool = True,
+        max_workers: int = 1,
+        ordered: bool = True,
+        key_attrs: tuple[str, ...] = ('pk', 'sk'),
+        retry: RetryPolicy | None = None,
+        cache: ItemCache | None = None,
+        on_flush: Callable[[FlushStats], None] | None = None,
     ) -> None:
+        if not 0 < flush_amount <= TRANSACT_WRITE_LIMIT:
+            raise ValueError(
+                f'flush_amount must be between 1 and {TRANSACT_WRITE_LIMIT}'
+            )
+
         self._table_name = table_name
         self._items_buffer: list[TransactOperation] = []
+        self._buffer_size = 0
         self._flush_amount = flush_amount
         self._client = client
         self._fail_fast = fail_fast
-
-    def __enter__(self) -> Self:
-        return self
-
-    def __exit__(self, *exc_details) -> None:
-        # When we exit, we need to keep flushing whatever's left
-        # until there's nothing left in our items buffer.
-        while self._items_buffer:
-            self._flush()
+        self._max_workers = max_workers
+        self._ordered = ordered
+        self._key_attrs = key_attrs
+        self._retry = retry
+        self._cache = cache
+        self._on_flush = on_flush
+        self._in_flight: dict[Any, set[Hashable]] = {}
 
     def condition(
         self,
         key: dict,
-        cond_expr: str,
+        cond_expr: str | Condition,
         *,
         table_name: str | None = None,
         expr_attr_names: dict | None = None,
         expr_attr_values: dict | None = None,
         return_on_cond_fail: Literal['ALL_OLD', 'NONE'] = 'NONE',
         exc_cls: Type[Exception] | None = None,
-    ) -> None:
-        attrs: dict = {}
-
-        if expr_attr_names:
-            attrs['ExpressionAttributeNames'] = expr_attr_names
-
-        if expr_attr_values:
-            attrs['ExpressionAttributeValues'] = serialize(expr_attr_values)
-
-        if return_on_cond_fail:
-            attrs['ReturnValuesOnConditionCheckFailure'] = return_on_cond_fail
-
-        self._add_op_and_process(
+    ) -> Any:
+        started_at = time.perf_counter()
+        return self._add_op_and_process(
             TransactOperation(
                 {
                     'ConditionCheck': dict(
                         TableName=table_name or self._table_name,
                         Key=serialize(key),
-                        ConditionExpression=cond_expr,
-                        **attrs,
+                        **_expr_attrs(
+                            cond_expr,
+                            expr_attr_names,
+                            expr_attr_values,
+                            return_on_cond_fail,
+                        ),
                     )
                 },
                 exc_cls,
+                started_at=started_at,
             )
         )
 
@@ -123,34 +243,27 @@ class TransactWriter:
         table_name: str | None = None,
         expr_attr_names: dict | None = None,
         expr_attr_values: dict | None = None,
-        cond_expr: str | None = None,
+        cond_expr: str | Condition | None = None,
         return_on_cond_fail: Literal['ALL_OLD', 'NONE'] = 'NONE',
         exc_cls: Type[Exception] | None = None,
-    ) -> None:
-        attrs: dict = {}
-
-        if cond_expr:
-            attrs['ConditionExpression'] = cond_expr
-
-        if expr_attr_names:
-            attrs['ExpressionAttributeNames'] = expr_attr_names
-
-        if expr_attr_values:
-            attrs['ExpressionAttributeValues'] = serialize(expr_attr_values)
-
-        if return_on_cond_fail:
-            attrs['ReturnValuesOnConditionCheckFailure'] = return_on_cond_fail
-
-        self._add_op_and_process(
+    ) -> Any:
+        started_at = time.perf_counter()
+        return self._add_op_and_process(
             TransactOperation(
                 {
                     'Put': dict(
                         TableName=table_name or self._table_name,
                         Item=serialize(item),
-                        **attrs,
+                        **_expr_attrs(
+                            cond_expr,
+                            expr_attr_names,
+                            expr_attr_values,
+                            return_on_cond_fail,
+                        ),
                     )
                 },
                 exc_cls,
+                started_at=started_at,
             ),
         )
 
@@ -159,126 +272,626 @@ class TransactWriter:
         key: dict,
         *,
         table_name: str | None = None,
-        cond_expr: str | None = None,
+        cond_expr: str | Condition | None = None,
         expr_attr_names: dict | None = None,
         expr_attr_values: dict | None = None,
         return_on_cond_fail: Literal['ALL_OLD', 'NONE'] = 'NONE',
         exc_cls: Type[Exception] | None = None,
-    ) -> None:
-        attrs: dict = {}
-
-        if cond_expr:
-            attrs['ConditionExpression'] = cond_expr
-
-        if expr_attr_names:
-            attrs['ExpressionAttributeNames'] = expr_attr_names
-
-        if expr_attr_values:
-            attrs['ExpressionAttributeValues'] = serialize(expr_attr_values)
-
-        if return_on_cond_fail:
-            attrs['ReturnValuesOnConditionCheckFailure'] = return_on_cond_fail
-
-        self._add_op_and_process(
+    ) -> Any:
+        started_at = time.perf_counter()
+        return self._add_op_and_process(
             TransactOperation(
                 {
                     'Delete': dict(
                         TableName=table_name or self._table_name,
                         Key=serialize(key),
-                        **attrs,
+                        **_expr_attrs(
+                            cond_expr,
+                            expr_attr_names,
+                            expr_attr_values,
+                            return_on_cond_fail,
+                        ),
                     )
                 },
                 exc_cls,
+                started_at=started_at,
             ),
         )
 
     def update(
         self,
         key: dict,
-        update_expr: str,
+        update_expr: str | UpdateExpr,
         *,
-        cond_expr: str | None = None,
+        cond_expr: str | Condition | None = None,
         table_name: str | None = None,
         expr_attr_names: dict | None = None,
         expr_attr_values: dict | None = None,
         return_on_cond_fail: Literal['ALL_OLD', 'NONE'] = 'NONE',
         exc_cls: Type[Exception] | None = None,
-    ) -> None:
-        attrs: dict = {}
-
-        if cond_expr:
-            attrs['ConditionExpression'] = cond_expr
-
-        if expr_attr_names:
-            attrs['ExpressionAttributeNames'] = expr_attr_names
+    ) -> Any:
+        started_at = time.perf_counter()
+        actions = condition = None
+
+        if isinstance(update_expr, UpdateExpr):
+            if isinstance(cond_expr, Condition):
+                if update_expr.condition is not None:
+                    cond_expr = update_expr.condition & cond_expr
+
+                # Recompile both into one placeholder namespace
+                update_expr = UpdateExpr(*update_expr.actions, cond=cond_expr)
+            elif cond_expr and update_expr.condition is not None:
+                raise ValueError(
+                    'cond_expr must be a Condition when update_expr has one'
+                )
 
-        if expr_attr_values:
-            attrs['ExpressionAttributeValues'] = serialize(expr_attr_values)
+            if not (expr_attr_names or expr_attr_values or isinstance(cond_expr, str)):
+                actions = update_expr.actions
+                condition = update_expr.condition
 
-        if return_on_cond_fail:
-            attrs['ReturnValuesOnConditionCheckFailure'] = return_on_cond_fail
+            cond_expr = update_expr.get('cond_expr', cond_expr)
+            expr_attr_names = _merge(update_expr['expr_attr_names'], expr_attr_names)
+            expr_attr_values = _merge_values(
+                update_expr['expr_attr_values'], expr_attr_values
+            )
+            update_expr = update_expr['update_expr']
 
-        self._add_op_and_process(
+        return self._add_op_and_process(
             TransactOperation(
                 {
                     'Update': dict(
                         TableName=table_name or self._table_name,
                         Key=serialize(key),
                         UpdateExpression=update_expr,
-                        **attrs,
+                        **_expr_attrs(
+                            cond_expr,
+                            expr_attr_names,
+                            expr_attr_values,
+                            return_on_cond_fail,
+                        ),
                     )
                 },
                 exc_cls,
+                actions=actions,
+                condition=condition,
+                started_at=started_at,
             )
         )
 
-    def _add_op_and_process(self, op: TransactOperation) -> None:
+    @abstractmethod
+    def _add_op_and_process(self, op: TransactOperation) -> Any: ...
+
+    def _buffer(self, op: TransactOperation) -> None:
+        if op.size > ITEM_MAX_BYTES:
+            raise ItemTooLargeError(
+                f'Operation is {op.size} bytes, over the {ITEM_MAX_BYTES} bytes limit',
+                size=op.size,
+            )
+
         self._items_buffer.append(op)
+        self._buffer_size += op.size
+
+    def _should_flush(self) -> bool:
+        return (
+            len(self._items_buffer) >= self._flush_amount
+            or self._buffer_size >= TRANSACT_WRITE_MAX_BYTES
+        )
+
+    def _next_chunk(self) -> list[TransactOperation]:
+        """
+        Take as many operations as fit in a single request, up to
+        `flush_amount` operations and the 4 MB aggregate size limit.
+
+        DynamoDB rejects a transaction that touches the same item twice, so
+        an operation on a key already in the chunk is merged into the earlier
+        one when possible, or moved to the next chunk otherwise.
+        """
+        chunk: list[TransactOperation] = []
+        index: dict[Hashable, int] = {}
+        deferred: list[TransactOperation] = []
+        deferred_keys: set[Hashable] = set()
+        size = 0
+        consumed = 0
+        consumed_size = 0
+
+        for op in self._items_buffer:
+            key = _operation_key(op.operation, self._key_attrs)
+
+            if key is not None and key in deferred_keys:
+                # Keep the order of operations on a deferred key
+                deferred.append(op)
+            elif key is not None and key in index:
+                first = chunk[index[key]]
+                merged = _coalesce(first, op, self._key_attrs)
+
+                if (
+                    merged
+                    and size - first.size + merged.size <= TRANSACT_WRITE_MAX_BYTES
+                ):
+                    merged.encode_time += first.encode_time + op.encode_time
+                    chunk[index[key]] = merged
+                    size += merged.size - first.size
+                else:
+                    deferred.append(op)
+                    deferred_keys.add(key)
+            elif len(chunk) >= self._flush_amount or (
+                chunk and size + op.size > TRANSACT_WRITE_MAX_BYTES
+            ):
+                break
+            else:
+                if key is not None:
+                    index[key] = len(chunk)
+
+                chunk.append(op)
+                size += op.size
+
+            consumed += 1
+            consumed_size += op.size
+
+        self._items_buffer = deferred + self._items_buffer[consumed:]
+        self._buffer_size -= consumed_size - sum(op.size for op in deferred)
+        return chunk
+
+    def _conflicts(self, items_to_send: list[TransactOperation]) -> tuple[set, list]:
+        """
+        Return the keys touched by a chunk and, in `ordered` mode,
+        the in-flight chunks it has to wait for.
+        """
+        keys = {_operation_key(op.operation, self._key_attrs) for op in items_to_send}
+
+        if not self._ordered:
+            return keys, []
+
+        # `None` is an operation whose key is unknown,
+        # so it conflicts with every other chunk
+        return keys, [
+            in_flight
+            for in_flight, in_flight_keys in self._in_flight.items()
+            if None in keys or None in in_flight_keys or keys & in_flight_keys
+        ]
+
+    def _request(self, items_to_send: list[TransactOperation]) -> dict:
+        request: dict = {'TransactItems': [item.operation for item in items_to_send]}
+
+        if self._retry:
+            # The same token is sent on every attempt, so a retry of
+            # a transaction that did commit is a no-op
+            request['ClientRequestToken'] = str(uuid4())
+
+        if self._on_flush:
+            request['ReturnConsumedCapacity'] = 'INDEXES'
+            request['ReturnItemCollectionMetrics'] = 'SIZE'
+
+        return request
+
+    def _flush_stats(self, items_to_send: list[TransactOperation]) -> FlushStats:
+        return FlushStats(
+            operations=len(items_to_send),
+            payload_bytes=sum(op.size for op in items_to_send),
+            attempts=0,
+            cancellation_codes=[],
+            serialize_time=sum(op.encode_time for op in items_to_send),
+            network_time=0,
+            elapsed=0,
+            consumed_wcu={},
+            item_collection_metrics={},
+            committed=False,
+        )
+
+    def _record(self, stats: FlushStats, sent_at: float, response: dict) -> None:
+        """Add an attempt's response, or its cancellation, to the stats."""
+        stats['attempts'] += 1
+        stats['network_time'] += time.perf_counter() - sent_at
+        stats['cancellation_codes'].extend(
+            reason.get('Code', 'None')
+            for reason in response.get('CancellationReasons', [])
+            if reason.get('Code', 'None') != 'None'
+        )
+
+        for capacity in response.get('ConsumedCapacity', []):
+            _add_capacity(stats['consumed_wcu'], capacity)
+
+        for table_name, metrics in response.get('ItemCollectionMetrics', {}).items():
+            stats['item_collection_metrics'].setdefault(table_name, []).extend(metrics)
+
+    def _report(self, stats: FlushStats, started_at: float) -> None:
+        if self._on_flush:
+            stats['elapsed'] = time.perf_counter() - started_at
+            self._on_flush(stats)
+
+    def _retry_delay(self, err: Any, attempt: int) -> float | None:
+        if not self._retry:
+            return None
+
+        codes = [
+            reason.get('Code', 'None')
+            for reason in err.response.get('CancellationReasons', [])
+        ]
+        return self._retry.delay(codes, attempt)
+
+    def _canceled(
+        self,
+        err: Any,
+        items_to_send: list[TransactOperation],
+    ) -> Exception:
+        error_msg = err.response.get('Error', {}).get('Message') or 'Unknown'
+        cancellations = err.response.get('CancellationReasons', [])
+        reasons = []
+
+        for idx, reason in enumerate(cancellations):
+            if 'Message' not in reason:
+                continue
+
+            item = items_to_send[idx]
+
+            if self._cache and 'Item' in reason:
+                # With `ALL_OLD`, the reason holds the current item
+                (body,) = item.operation.values()
+
+                with suppress(KeyError):
+                    key = _key(body, self._key_attrs)
+                    self._cache.refresh(body['TableName'], key, reason['Item'])
+            cancellation_reason = TransactionCanceledReason(
+                code=reason['Code'],  # type: ignore
+                message=reason['Message'],
+                operation=item.operation,
+                old_item=LazyItem(reason.get('Item', {})),
+            )
+
+            if self._fail_fast:
+                exc_cls = item.exc_cls or TransactionOperationFailed
+                return _exc_for_reason(exc_cls, error_msg, cancellation_reason)
+
+            reasons.append(cancellation_reason)
+
+        return TransactionCanceledException(error_msg, reasons=reasons)
+
+    def _committed(self, items_to_send: list[TransactOperation]) -> None:
+        """Bring the cache up to date with a committed chunk."""
+        if not self._cache:
+            return
+
+        for op in items_to_send:
+            ((kind, body),) = op.operation.items()
+
+            if kind == 'ConditionCheck':
+                continue
+
+            try:
+                key = _key(body, self._key_attrs)
+            except KeyError:
+                # A put without the key attributes can't be cached
+                continue
+
+            if kind == 'Put':
+                self._cache.refresh(body['TableName'], key, body['Item'])
+            else:
+                self._cache.invalidate(body['TableName'], key)
+
+
+class TransactWriter(BaseTransactWriter):
+    """
+    Buffer transactional writes and send them in `transact_write_items` calls
+    of up to `flush_amount` operations.
+
+    With `max_workers` greater than 1, chunks are sent concurrently over a
+    thread pool with at most `max_workers` calls in flight. Chunks don't
+    commit atomically with each other, so a failed chunk doesn't prevent
+    the chunks already in flight from being written. In `ordered` mode,
+    a chunk that touches a key used by an in-flight chunk waits for it to
+    finish first. Keys of `put` items are read from `key_attrs`.
+
+    `on_flush` is called with the `FlushStats` of every chunk, committed or
+    not. Time spent serializing operations (`serialize_time`) is reported
+    apart from time spent in `transact_write_items` calls (`network_time`),
+    and consumed WCU are reported per table and per `table/index`.
+    """
+
+    _executor: ThreadPoolExecutor | None = None
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_details) -> None:
+        try:
+            # When we exit, we need to keep flushing whatever's left
+            # until there's nothing left in our items buffer.
+            while self._items_buffer:
+                self._flush()
+        finally:
+            self._drain()
+
+    def _add_op_and_process(self, op: TransactOperation) -> None:
+        self._buffer(op)
         self._flush_if_needed()
 
     def _flush_if_needed(self) -> None:
-        if len(self._items_buffer) >= self._flush_amount:
+        if self._should_flush():
             self._flush()
 
     def _flush(self) -> bool:
-        items_to_send = self._items_buffer[: self._flush_amount]
-        self._items_buffer = self._items_buffer[self._flush_amount :]
+        items_to_send = self._next_chunk()
 
-        transact_items: list[TransactWriteItemTypeDef] = [
-            item.operation  # type: ignore
-            for item in items_to_send
-        ]
+        if self._max_workers > 1:
+            self._submit(items_to_send)
+            return True
+
+        return self._send(items_to_send)
+
+    def _submit(self, items_to_send: list[TransactOperation]) -> None:
+        keys, conflicts = self._conflicts(items_to_send)
+        self._wait(conflicts)
 
+        while len(self._in_flight) >= self._max_workers:
+            done, _ = wait(self._in_flight, return_when=FIRST_COMPLETED)
+            self._wait(done)
+
+        if not self._executor:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self._max_workers,
+                thread_name_prefix='TransactWriter',
+            )
+
+        future = self._executor.submit(self._send, items_to_send)
+        self._in_flight[future] = keys
+
+    def _wait(self, futures) -> None:
+        for future in futures:
+            del self._in_flight[future]
+            # Re-raises the exception mapped by `_send`, if any
+            future.result()
+
+    def _drain(self) -> None:
         try:
-            self._client.transact_write_items(TransactItems=transact_items)
-        except self._client.exceptions.TransactionCanceledException as err:
-            error_msg = jmespath.search('Error.Message || `Unknown`', err.response)
-            cancellations = err.response.get('CancellationReasons', [])
-            reasons = []
-
-            for idx, reason in enumerate(cancellations):
-                if 'Message' not in reason:
-                    continue
-
-                item = items_to_send[idx]
-                cancellation_reason = TransactionCanceledReason(
-                    code=reason['Code'],  # type: ignore
-                    message=reason['Message'],
-                    operation=item.operation,
-                    old_item=deserialize(reason.get('Item', {})),
-                )
+            self._wait(list(self._in_flight))
+        finally:
+            # Don't leave calls running in the background if one of them failed
+            for future in self._in_flight:
+                future.cancel()
+
+            self._in_flight.clear()
+
+            if self._executor:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+
+    def _send(self, items_to_send: list[TransactOperation]) -> bool:
+        started_at = time.perf_counter()
+        request = self._request(items_to_send)
+        stats = self._flush_stats(items_to_send)
+        attempt = 0
+
+        try:
+            while True:
+                attempt += 1
+                sent_at = time.perf_counter()
+
+                try:
+                    response = self._client.transact_write_items(**request)
+                except self._client.exceptions.TransactionCanceledException as err:
+                    self._record(stats, sent_at, err.response)
+                    delay = self._retry_delay(err, attempt)
+
+                    if delay is None:
+                        raise self._canceled(err, items_to_send) from err
+
+                    time.sleep(delay)
+                else:
+                    self._record(stats, sent_at, response)
+                    self._committed(items_to_send)
+                    stats['committed'] = True
+                    return True
+        finally:
+            self._report(stats, started_at)
+
+
+def _coalesce(
+    first: TransactOperation,
+    second: TransactOperation,
+    key_attrs: tuple[str, ...],
+) -> TransactOperation | None:
+    """
+    Merge two operations on the same key into one, or return `None` if
+    they can't be merged without changing what the transaction does.
+    """
+    ((kind, body),) = first.operation.items()
+    ((second_kind, second_body),) = second.operation.items()
+
+    # A condition on the second operation would be evaluated
+    # against the item before the first one is applied
+    if 'ConditionExpression' in second_body:
+        return None
+
+    # DynamoDB rejects updates to key attributes, which must fail on their own
+    # rather than move the item they'd be merged into
+    if second.actions is not None and _paths(second.actions) & (
+        set(key_attrs) | set(second_body.get('Key', {}))
+    ):
+        return None
+
+    match kind, second_kind:
+        case 'Put', 'Put':
+            item = second_body['Item']
+
+        case 'Put', 'Update' if second.actions is not None:
+            item = _apply_actions(body['Item'], second.actions)
+
+            if item is None:
+                return None
+
+        case 'Update', 'Update' if (
+            first.actions is not None and second.actions is not None
+        ):
+            written = _paths(first.actions)
+
+            # Every operand of a single update reads the item as it was
+            # before it, so the second can't read what the first writes
+            if written & (_paths(second.actions) | _reads(second.actions)):
+                return None
+
+            update_expr = UpdateExpr(
+                *first.actions,
+                *second.actions,
+                cond=first.condition,
+                placeholders=CompactPlaceholders,
+            )
+            attrs = _expr_attrs(
+                update_expr.get('cond_expr'),
+                update_expr['expr_attr_names'],
+                update_expr['expr_attr_values'],
+                body.get('ReturnValuesOnConditionCheckFailure'),
+            )
+            return TransactOperation(
+                {
+                    'Update': dict(
+                        TableName=body['TableName'],
+                        Key=body['Key'],
+                        UpdateExpression=update_expr['update_expr'],
+                        **attrs,
+                    )
+                },
+                first.exc_cls,
+                actions=update_expr.actions,
+                condition=first.condition,
+            )
+
+        case _:
+            return None
 
-                if self._fail_fast:
-                    exc_cls = item.exc_cls or TransactionOperationFailed
-                    raise _exc_for_reason(
-                        exc_cls, error_msg, cancellation_reason
-                    ) from err
+    return TransactOperation(
+        {'Put': body | {'Item': item}},
+        first.exc_cls,
+    )
 
-                reasons.append(cancellation_reason)
 
-            raise TransactionCanceledException(error_msg, reasons=reasons) from err
+def _apply_actions(item: dict, actions: list[Expr]) -> dict | None:
+    """Apply plain `SET path = value` and `REMOVE path` actions on top-level
+    attributes to a serialized item, or return `None` for anything else."""
+    item = dict(item)
+
+    for attr in actions:
+        if not _istop_level(attr.path):
+            return None
+
+        if is_plain_set(attr):
+            item[attr.path] = serialize({attr.path: attr.value})[attr.path]
+        elif isinstance(attr, Remove):
+            item.pop(attr.path, None)
         else:
-            return True
+            return None
+
+    return item
+
+
+def _istop_level(path: str) -> bool:
+    return '.' not in path and '[' not in path
+
+
+def _paths(actions: list[Expr]) -> set[str]:
+    # Paths overlap if they share the top-level attribute
+    return {top_level(attr.path) for attr in actions}
+
+
+def _reads(actions: list[Expr]) -> set[str]:
+    """The top-level attributes whose current value the actions read."""
+    return {top_level(path) for attr in actions for path in action_reads(attr)}
+
+
+def _add_capacity(consumed_wcu: dict[str, float], capacity: dict) -> None:
+    # Indexes are reported as `table/index`
+    table_name = capacity['TableName']
+    indexes = capacity.get('GlobalSecondaryIndexes', {}) | capacity.get(
+        'LocalSecondaryIndexes', {}
+    )
+    units = [(table_name, capacity.get('Table', capacity))] + [
+        (f'{table_name}/{index_name}', index) for index_name, index in indexes.items()
+    ]
+
+    for name, consumed in units:
+        wcu = consumed.get('WriteCapacityUnits', consumed.get('CapacityUnits', 0))
+        consumed_wcu[name] = consumed_wcu.get(name, 0) + wcu
+
+
+def _operation_size(operation: dict) -> int:
+    (body,) = operation.values()
+
+    if 'Item' in body:
+        return item_size(body['Item'])
+
+    size = item_size(body['Key'])
+
+    for attr in ('UpdateExpression', 'ConditionExpression'):
+        size += len(body.get(attr, '').encode())
+
+    for name in body.get('ExpressionAttributeNames', {}).values():
+        size += len(name.encode())
+
+    for value in body.get('ExpressionAttributeValues', {}).values():
+        size += attribute_value_size(value)
+
+    return size
+
+
+def _operation_key(
+    operation: dict,
+    key_attrs: tuple[str, ...],
+) -> Hashable | None:
+    (body,) = operation.values()
+
+    try:
+        key = _key(body, key_attrs)
+    except KeyError:
+        return None
+
+    return (body['TableName'], hashable_key(key))
+
+
+def _key(body: dict, key_attrs: tuple[str, ...]) -> dict:
+    if 'Key' in body:
+        return body['Key']
+
+    return {name: body['Item'][name] for name in key_attrs}
+
+
+def _merge(attrs: dict, extra: dict | None) -> dict:
+    return attrs | extra if extra else attrs
+
+
+def _merge_values(values: dict, extra: dict | None) -> dict:
+    # Either side may be `Serialized`, which a plain union would drop
+    if not extra:
+        return values
+
+    return Serialized(serialize(values) | serialize(extra))
+
+
+def _expr_attrs(
+    cond_expr: str | Condition | None,
+    expr_attr_names: dict | None,
+    expr_attr_values: dict | None,
+    return_on_cond_fail: str | None,
+) -> dict:
+    attrs: dict = {}
+
+    if isinstance(cond_expr, Condition):
+        compiled = ConditionExpr(cond_expr)
+        cond_expr = compiled['cond_expr']
+        expr_attr_names = _merge(compiled['expr_attr_names'], expr_attr_names)
+        expr_attr_values = _merge_values(compiled['expr_attr_values'], expr_attr_values)
+
+    if cond_expr:
+        attrs['ConditionExpression'] = cond_expr
+
+    if expr_attr_names:
+        attrs['ExpressionAttributeNames'] = expr_attr_names
+
+    if expr_attr_values:
+        attrs['ExpressionAttributeValues'] = serialize(expr_attr_values)
+
+    if return_on_cond_fail:
+        attrs['ReturnValuesOnConditionCheckFailure'] = return_on_cond_fail
+
+    return attrs
 
 
 def _exc_for_reason(
@@ -1,15 +1,76 @@
+import dataclasses
+import threading
 from datetime import date, datetime
+from decimal import Clamped, Context, Decimal, Inexact, Overflow, Rounded, Underflow
+from enum import Enum
 from ipaddress import IPv4Address
+from types import UnionType
 from typing import (
+    TYPE_CHECKING,
     Any,
+    Callable,
+    Generic,
+    Iterator,
+    Literal,
     Mapping,
+    TypeVar,
+    Union,
+    get_args,
+    get_origin,
+    get_type_hints,
+    is_typeddict,
 )
 from uuid import UUID
 
-from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
+if TYPE_CHECKING:
+    from boto3.dynamodb.types import TypeSerializer
 
-serializer = TypeSerializer()
-deserializer = TypeDeserializer()
+T = TypeVar('T')
+
+# Same as `boto3.dynamodb.types.DYNAMODB_CONTEXT`. boto3 takes a while to
+# import, so it's only loaded for the values the fast paths don't handle.
+DYNAMODB_CONTEXT = Context(
+    Emin=-128,
+    Emax=126,
+    prec=38,
+    traps=[Clamped, Overflow, Inexact, Rounded, Underflow],
+)
+_serializer: 'TypeSerializer | None' = None
+
+
+def __getattr__(name: str) -> Any:
+    # Kept for callers of the boto3 objects this module used to create on import
+    if name == 'serializer':
+        return _type_serializer()
+
+    if name == 'deserializer':
+        from boto3.dynamodb.types import TypeDeserializer
+
+        return TypeDeserializer()
+
+    if name == 'Binary':
+        from boto3.dynamodb.types import Binary
+
+        return Binary
+
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
+def _type_serializer() -> 'TypeSerializer':
+    global _serializer
+
+    if _serializer is None:
+        from boto3.dynamodb.types import TypeSerializer
+
+        _serializer = TypeSerializer()
+
+    return _serializer
+
+
+def _binary(value: bytes) -> Any:
+    from boto3.dynamodb.types import Binary
+
+    return Binary(value)
 
 
 def _serialize_to_basic_types(data: Any) -> str | dict | set | list:
@@ -53,11 +114,807 @@ def _serialize_to_basic_types(data: Any) -> str | dict | set | list:
             return data
 
 
+# Types are resolved to a handler once and cached by their exact class,
+# so serializing a value costs a dict lookup instead of a `match` cascade.
+#
+# Each entry is `(handler, to_basic)`, where `handler` returns the wire-format
+# AttributeValue and `to_basic` converts a scalar into the hashable value used
+# to build number/string/binary sets. `to_basic` is `_CONTAINER` for dicts,
+# lists, tuples and sets and `None` for types the fast path doesn't know, which
+# are delegated to boto3's `TypeSerializer`.
+_CONTAINER: Any = object()
+_handlers: dict[type, tuple[Callable[[Any], dict], Any]] = {}
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+def _number(value: Any) -> str:
+    # Integers up to 38 digits are exactly representable in DynamoDB's
+    # decimal context, so `str()` matches what boto3 would produce.
+    if type(value) is int and -(10**38) < value < 10**38:
+        return str(value)
+
+    number = str(DYNAMODB_CONTEXT.create_decimal(value))
+
+    if number in ('Infinity', 'NaN'):
+        raise TypeError('Infinity and NaN not supported')
+
+    return number
+
+
+def _serialize_fallback(value: Any) -> dict:
+    return _type_serializer().serialize(_serialize_to_basic_types(value))
+
+
+def _serialize_null(value: None) -> dict:
+    return {'NULL': True}
+
+
+def _serialize_bool(value: bool) -> dict:
+    return {'BOOL': value}
+
+
+def _serialize_number(value: int | Decimal) -> dict:
+    return {'N': _number(value)}
+
+
+def _serialize_str(value: str) -> dict:
+    return {'S': value}
+
+
+def _serialize_bytes(value: bytes) -> dict:
+    return {'B': value}
+
+
+def _serialize_isoformat(value: date) -> dict:
+    return {'S': value.isoformat()}
+
+
+def _serialize_as_str(value: Any) -> dict:
+    return {'S': str(value)}
+
+
+def _serialize_basic_set(values: set) -> dict:
+    types = {type(v) for v in values}
+
+    if types == {str}:
+        return {'SS': list(values)}
+
+    if types <= {int, Decimal}:
+        return {'NS': [_number(v) for v in values]}
+
+    if types == {bytes}:
+        return {'BS': list(values)}
+
+    return _type_serializer().serialize(values)
+
+
+def _serialize_list(value: list | tuple) -> dict:
+    if not value:
+        return {'L': []}
+
+    basics = []
+    has_container = False
+    has_unknown = False
+
+    for v in value:
+        _, to_basic = _handler_for(type(v))
+
+        if to_basic is _CONTAINER:
+            has_container = True
+        elif to_basic is None:
+            has_unknown = True
+        else:
+            basics.append(to_basic(v))
+
+    # Any nested container turns the whole value into a list, since
+    # its converted form is either a dict, a list or an unhashable set.
+    if has_container:
+        return {'L': [_serialize_value(v) for v in value]}
+
+    if has_unknown:
+        return _serialize_fallback(value)
+
+    return _serialize_basic_set(set(basics))
+
+
+def _serialize_set(value: set) -> dict:
+    if not value:
+        return {'L': []}
+
+    basics = set()
+
+    for v in value:
+        _, to_basic = _handler_for(type(v))
+
+        if to_basic is None or to_basic is _CONTAINER:
+            return _serialize_fallback(value)
+
+        basics.add(to_basic(v))
+
+    return _serialize_basic_set(basics)
+
+
+def _serialize_lazy_item(value: 'LazyItem') -> dict:
+    return {'M': dict(value.raw)}
+
+
+def _serialize_dict(value: dict) -> dict:
+    return {'M': {k: _serialize_value(v) for k, v in value.items()}}
+
+
+def _resolve_handler(cls: type) -> tuple[Callable[[Any], dict], Any]:
+    # Order matters: `bool` is a subclass of `int` and
+    # `datetime` is a subclass of `date`.
+    if cls is type(None):
+        return _serialize_null, _identity
+
+    if issubclass(cls, Serialized):
+        return _identity, _CONTAINER
+
+    if issubclass(cls, LazyItem):
+        return _serialize_lazy_item, _CONTAINER
+
+    if issubclass(cls, bool):
+        return _serialize_bool, _identity
+
+    if issubclass(cls, (int, Decimal)):
+        return _serialize_number, _identity
+
+    if issubclass(cls, str):
+        return _serialize_str, _identity
+
+    if cls is bytes:
+        return _serialize_bytes, _identity
+
+    if issubclass(cls, date):
+        return _serialize_isoformat, lambda v: v.isoformat()
+
+    if issubclass(cls, (UUID, IPv4Address)):
+        return _serialize_as_str, str
+
+    if issubclass(cls, dict):
+        return _serialize_dict, _CONTAINER
+
+    if issubclass(cls, (list, tuple)):
+        return _serialize_list, _CONTAINER
+
+    if issubclass(cls, set):
+        return _serialize_set, _CONTAINER
+
+    return _serialize_fallback, None
+
+
+def _handler_for(cls: type) -> tuple[Callable[[Any], dict], Any]:
+    try:
+        return _handlers[cls]
+    except KeyError:
+        handler = _handlers[cls] = _resolve_handler(cls)
+        return handler
+
+
+def _serialize_value(value: Any) -> dict:
+    cls = type(value)
+
+    try:
+        handler, _ = _handlers[cls]
+    except KeyError:
+        handler, _ = _handler_for(cls)
+
+    return handler(value)
+
+
+class Serialized(dict):
+    """
+    Marks an item, or a single AttributeValue, that is already in wire format.
+
+    `serialize` passes it through untouched, so items copied from a stream
+    record or a low-level query skip a round trip through Python types.
+
+    ```python
+    transact.put(Serialized(record['dynamodb']['NewImage']))
+    ```
+    """
+
+
 def serialize(data: Mapping[str, Any]) -> dict:
-    return {
-        k: serializer.serialize(_serialize_to_basic_types(v)) for k, v in data.items()
-    }
+    if isinstance(data, Serialized):
+        return data
+
+    if isinstance(data, LazyItem):
+        return dict(data.raw)
+
+    return {k: _serialize_value(v) for k, v in data.items()}
+
+
+def hashable_key(key: Mapping[str, Any]) -> tuple:
+    """
+    Return a hashable identity for a serialized key, so keys can be
+    compared and used in sets and dicts.
+    """
+    # Key attributes are scalars (S, N or B), so each one
+    # flattens into a `(name, type, value)` triple
+    return tuple(sorted((name, *next(iter(av.items()))) for name, av in key.items()))
+
+
+def _number_size(value: str) -> int:
+    # Leading and trailing zeros are trimmed, and
+    # every two significant digits take one byte
+    digits = value.lstrip('-').split('e')[0].split('E')[0].replace('.', '')
+    return (len(digits.strip('0')) + 1) // 2 + 1
+
+
+def attribute_value_size(value: Mapping[str, Any]) -> int:
+    """
+    Return the size DynamoDB accounts for a wire-format AttributeValue,
+    excluding its name.
+
+    - https://docs.aws.amazon.com/amazondynamodb/latest/developerguide/CapacityUnitCalculations.html
+    """
+    for dynamodb_type, v in value.items():
+        match dynamodb_type:
+            case 'S':
+                return len(v.encode())
+            case 'N':
+                return _number_size(v)
+            case 'B':
+                return len(v)
+            case 'BOOL' | 'NULL':
+                return 1
+            case 'SS':
+                return sum(len(x.encode()) for x in v)
+            case 'NS':
+                return sum(_number_size(x) for x in v)
+            case 'BS':
+                return sum(len(x) for x in v)
+            case 'L':
+                # 3 bytes of overhead, plus 1 byte per element
+                return 3 + sum(attribute_value_size(x) + 1 for x in v)
+            case 'M':
+                return 3 + sum(
+                    len(k.encode()) + attribute_value_size(x) + 1 for k, x in v.items()
+                )
+
+    return 0
+
+
+def item_size(item: Mapping[str, Any]) -> int:
+    """Return the size DynamoDB accounts for a wire-format item."""
+    return sum(len(k.encode()) + attribute_value_size(v) for k, v in item.items())
+
+
+NumberMode = Literal['decimal', 'exact']
+
+
+def _decimal(value: str) -> Decimal:
+    return DYNAMODB_CONTEXT.create_decimal(value)
+
+
+def _int(value: str) -> int:
+    try:
+        return int(value)
+    except ValueError:
+        pass
+
+    # Exponent form, e.g. `1E+3`
+    number = _decimal(value)
+
+    if number != number.to_integral_value():
+        raise ValueError(f'{value} is not an integer')
+
+    return int(number)
+
+
+def _exact(value: str) -> int | float | Decimal:
+    # Integral numbers become `int`, and fractional numbers become `float`
+    # only when the conversion doesn't lose precision.
+    number = DYNAMODB_CONTEXT.create_decimal(value)
+
+    if number == number.to_integral_value():
+        return int(number)
+
+    as_float = float(number)
+
+    if Decimal(as_float) == number:
+        return as_float
+
+    return number
+
+
+_number_decoders: dict[str, Callable[[str], Any]] = {
+    'decimal': _decimal,
+    'exact': _exact,
+}
+
+
+def _deserialize_value(value: Mapping[str, Any], number: Callable[[str], Any]) -> Any:
+    for dynamodb_type, v in value.items():
+        break
+    else:
+        raise TypeError(
+            'Value must be a nonempty dictionary whose key is a valid dynamodb type.'
+        )
+
+    match dynamodb_type:
+        case 'S':
+            return v
+        case 'N':
+            return number(v)
+        case 'M':
+            return {k: _deserialize_value(x, number) for k, x in v.items()}
+        case 'L':
+            return [_deserialize_value(x, number) for x in v]
+        case 'BOOL':
+            return v
+        case 'NULL':
+            return None
+        case 'SS':
+            return set(v)
+        case 'NS':
+            return set(map(number, v))
+        case 'B':
+            return _binary(v)
+        case 'BS':
+            return set(map(_binary, v))
+        case _:
+            raise TypeError(f'Dynamodb type {dynamodb_type} is not supported')
+
+
+def deserialize(
+    data: Mapping[str, Any],
+    *,
+    number: NumberMode = 'decimal',
+) -> dict:
+    decode = _number_decoders[number]
+    return {k: _deserialize_value(v, decode) for k, v in data.items()}
+
+
+class LazyItem(Mapping[str, Any]):
+    """
+    A read-only item that keeps the wire-format AttributeValues and decodes
+    each attribute only when it is first accessed.
+
+    Decoded values are cached, so repeated reads don't pay the cost again.
+    """
+
+    __slots__ = ('_data', '_cache', '_number')
+
+    def __init__(
+        self,
+        data: Mapping[str, Any],
+        *,
+        number: NumberMode = 'decimal',
+    ) -> None:
+        self._data = data
+        self._cache: dict[str, Any] = {}
+        self._number = _number_decoders[number]
+
+    @property
+    def raw(self) -> Mapping[str, Any]:
+        """The wire-format item, as returned by DynamoDB."""
+        return self._data
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return self._cache[key]
+        except KeyError:
+            pass
+
+        value = self._cache[key] = _deserialize_value(self._data[key], self._number)
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._data
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}({dict(self)!r})'
+
+
+class Codec(Generic[T]):
+    """
+    A pair of encode/decode functions generated for a registered TypedDict or
+    dataclass. Field types are resolved once at registration, so encoding and
+    decoding skip per-value type dispatch entirely.
+    """
+
+    __slots__ = ('cls', 'encode', 'decode')
+
+    def __init__(
+        self,
+        cls: type[T],
+        encode: Callable[[T], dict],
+        decode: Callable[[Mapping[str, Any]], T],
+    ) -> None:
+        self.cls = cls
+        self.encode = encode
+        self.decode = decode
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}({self.cls.__qualname__})'
+
+
+_codecs: dict[type, Codec] = {}
+# Reentrant, as registering a type registers the types of its fields
+_codecs_lock = threading.RLock()
+# Types registered by the outermost `register` call still compiling
+_compiling: list[type] = []
+
+
+def register(cls: type[T]) -> Codec[T]:
+    """
+    Compile a specialised encoder/decoder for a TypedDict or dataclass.
+
+    Raises `TypeError` if a field's type can't be stored in DynamoDB, so
+    schema mismatches are caught at import time instead of on write.
+    """
+    with _codecs_lock:
+        try:
+            return _codecs[cls]
+        except KeyError:
+            pass
+
+        # Registered before compiling, so a type that refers to itself,
+        # e.g. `children: list['Node']`, resolves to the codec being built
+        codec = _codecs[cls] = Codec(cls, _uncompiled, _uncompiled)
+        outermost = not _compiling
+        _compiling.append(cls)
+
+        try:
+            compiled = _Codegen().compile(cls)
+        except BaseException:
+            if outermost:
+                # Codecs compiled along the way may refer to one that failed
+                for registered in _compiling:
+                    del _codecs[registered]
+
+            raise
+        finally:
+            if outermost:
+                _compiling.clear()
+
+        codec.encode = compiled.encode
+        codec.decode = compiled.decode
+        return codec
+
+
+def _uncompiled(value: Any) -> Any:
+    raise RuntimeError('codec is still being compiled')
+
+
+def _as_list(value: Mapping[str, Any]) -> list:
+    # Lists written by `serialize` may be stored as sets,
+    # so decoders accept both representations.
+    for dynamodb_type, v in value.items():
+        match dynamodb_type:
+            case 'L':
+                return v
+            case 'SS':
+                return [{'S': x} for x in v]
+            case 'NS':
+                return [{'N': x} for x in v]
+            case 'BS':
+                return [{'B': x} for x in v]
+
+    raise TypeError(f'Expected a list or set, got {value!r}')
+
+
+def _float(value: float) -> str:
+    return _number(Decimal(repr(value)))
+
+
+_bare_generics: dict[type, Any] = {
+    list: list[Any],
+    tuple: tuple[Any, ...],
+    set: set[Any],
+    frozenset: frozenset[Any],
+    dict: dict[str, Any],
+}
+
+
+class _Field:
+    __slots__ = ('name', 'type', 'required', 'init')
+
+    def __init__(self, name: str, tp: Any, *, required: bool, init: bool = True):
+        self.name = name
+        self.type = tp
+        self.required = required
+        self.init = init
+
+
+class _Codegen:
+    def __init__(self) -> None:
+        self.namespace: dict[str, Any] = {
+            '_number': _number,
+            '_float': _float,
+            '_decimal': _decimal,
+            '_int': _int,
+            '_as_list': _as_list,
+            '_serialize_value': _serialize_value,
+            '_deserialize_value': _deserialize_value,
+        }
+        self._depth = 0
+
+    def compile(self, cls: type) -> Codec:
+        if is_typeddict(cls):
+            hints = get_type_hints(cls)
+            fields = [
+                _Field(name, tp, required=name in cls.__required_keys__)
+                for name, tp in hints.items()
+            ]
+            getter = 'obj[{!r}]'
+            construct = None
+        elif dataclasses.is_dataclass(cls):
+            hints = get_type_hints(cls)
+            fields = [
+                _Field(
+                    f.name,
+                    hints[f.name],
+                    required=f.default is dataclasses.MISSING
+                    and f.default_factory is dataclasses.MISSING,
+                    init=f.init,
+                )
+                for f in dataclasses.fields(cls)
+            ]
+            getter = 'obj.{}'
+            construct = self.ref(cls)
+        else:
+            raise TypeError(f'{cls!r} is not a TypedDict or a dataclass')
+
+        encode_lines = ['def encode(obj):', '    item = {']
+        decode_lines = ['def decode(item):', '    obj = {']
+        encode_optional = []
+        decode_optional = []
+
+        for field in fields:
+            try:
+                encoder = self.encoder(field.type, getter.format(field.name))
+                decoder = self.decoder(field.type, f'item[{field.name!r}]')
+            except TypeError as err:
+                raise TypeError(f'{cls.__qualname__}.{field.name}: {err}') from None
+
+            key = repr(field.name)
+
+            if field.required or construct:
+                encode_lines.append(f'        {key}: {encoder},')
+            else:
+                encode_optional += [
+                    f'    if {key} in obj:',
+                    f'        item[{key}] = {encoder}',
+                ]
+
+            if not field.init:
+                continue
+
+            if field.required:
+                decode_lines.append(f'        {key}: {decoder},')
+            else:
+                decode_optional += [
+                    f'    if {key} in item:',
+                    f'        obj[{key}] = {decoder}',
+                ]
+
+        encode_lines += ['    }', *encode_optional, '    return item']
+        decode_lines += [
+            '    }',
+            *decode_optional,
+            f'    return {construct}(**obj)' if construct else '    return obj',
+        ]
+
+        namespace = self.namespace
+        source = '\n'.join(encode_lines + [''] + decode_lines)
+        exec(compile(source, f'<dynamodx codec {cls.__qualname__}>', 'exec'), namespace)
+
+        return Codec(cls, namespace['encode'], namespace['decode'])
+
+    def ref(self, obj: Any) -> str:
+        name = f'_ref{len(self.namespace)}'
+        self.namespace[name] = obj
+        return name
+
+    def var(self) -> str:
+        self._depth += 1
+        return f'_x{self._depth}'
+
+    def encoder(self, tp: Any, v: str) -> str:
+        origin, args = get_origin(tp), get_args(tp)
+
+        if origin in (Union, UnionType):
+            inner = [a for a in args if a is not type(None)]
+
+            if len(inner) != 1 or len(inner) == len(args):
+                raise TypeError(f'unsupported union {tp!r}')
+
+            return f"({{'NULL': True}} if {v} is None else {self.encoder(inner[0], v)})"
+
+        if origin is Literal:
+            return self.encoder(_literal_type(tp), v)
+
+        if tp is Any:
+            return f'_serialize_value({v})'
+
+        if tp is type(None):
+            return "{'NULL': True}"
+
+        if isinstance(tp, type) and issubclass(tp, Enum):
+            return self.encoder(_enum_type(tp), f'{v}.value')
+
+        if tp is str:
+            return f"{{'S': {v}}}"
+
+        if tp is bool:
+            return f"{{'BOOL': {v}}}"
+
+        if tp is float:
+            return f"{{'N': _float({v})}}"
+
+        if tp is bytes:
+            return f"{{'B': {v}}}"
+
+        if isinstance(tp, type):
+            if issubclass(tp, str):
+                return f"{{'S': str({v})}}"
+
+            if issubclass(tp, (int, Decimal)):
+                return f"{{'N': _number({v})}}"
+
+            if issubclass(tp, date):
+                return f"{{'S': {v}.isoformat()}}"
+
+            if issubclass(tp, (UUID, IPv4Address)):
+                return f"{{'S': str({v})}}"
+
+            if is_typeddict(tp) or dataclasses.is_dataclass(tp):
+                # Looked up on call, as the codec may still be compiling
+                return f"{{'M': {self.ref(register(tp))}.encode({v})}}"
+
+        if tp in _bare_generics:
+            return self.encoder(_bare_generics[tp], v)
+
+        if origin in (list, tuple):
+            if origin is tuple and (len(args) != 2 or args[1] is not Ellipsis):
+                raise TypeError(f'only variadic tuples are supported, got {tp!r}')
+
+            x = self.var()
+            return f"{{'L': [{self.encoder(args[0], x)} for {x} in {v}]}}"
+
+        if origin in (set, frozenset):
+            if args[0] is Any:
+                return f'_serialize_value({v})'
+
+            x = self.var()
+            kind, element = _set_element(args[0], x)
+            return f"({{{kind!r}: [{element} for {x} in {v}]}} if {v} else {{'L': []}})"
+
+        if origin is dict:
+            if args[0] is not str:
+                raise TypeError(f'map keys must be str, got {tp!r}')
+
+            k, x = self.var(), self.var()
+            return (
+                f"{{'M': {{{k}: {self.encoder(args[1], x)} "
+                f'for {k}, {x} in {v}.items()}}}}'
+            )
+
+        raise TypeError(f'unsupported type {tp!r}')
+
+    def decoder(self, tp: Any, v: str) -> str:
+        origin, args = get_origin(tp), get_args(tp)
+
+        if origin in (Union, UnionType):
+            inner = [a for a in args if a is not type(None)]
+            return f"(None if 'NULL' in {v} else {self.decoder(inner[0], v)})"
+
+        if origin is Literal:
+            return self.decoder(_literal_type(tp), v)
+
+        if tp is Any:
+            return f'_deserialize_value({v}, _decimal)'
+
+        if tp is type(None):
+            return 'None'
+
+        if isinstance(tp, type) and issubclass(tp, Enum):
+            return f'{self.ref(tp)}({self.decoder(_enum_type(tp), v)})'
+
+        if tp is str:
+            return f"{v}['S']"
+
+        if tp is bool:
+            return f"{v}['BOOL']"
+
+        if tp is int:
+            return f"_int({v}['N'])"
+
+        if tp is float:
+            return f"float({v}['N'])"
+
+        if tp is bytes:
+            return f"{v}['B']"
+
+        if isinstance(tp, type):
+            # Subclasses are encoded like their base type, see `encoder`
+            if issubclass(tp, str):
+                return f"{self.ref(tp)}({v}['S'])"
+
+            if issubclass(tp, int):
+                return f"{self.ref(tp)}(_int({v}['N']))"
+
+            if issubclass(tp, Decimal):
+                decimal = f"_decimal({v}['N'])"
+                return decimal if tp is Decimal else f'{self.ref(tp)}({decimal})'
+
+            if issubclass(tp, (date, UUID, IPv4Address)):
+                parse = tp.fromisoformat if issubclass(tp, date) else tp
+                return f"{self.ref(parse)}({v}['S'])"
+
+            if is_typeddict(tp) or dataclasses.is_dataclass(tp):
+                return f"{self.ref(register(tp))}.decode({v}['M'])"
+
+        if tp in _bare_generics:
+            return self.decoder(_bare_generics[tp], v)
+
+        if origin in (set, frozenset) and args[0] is Any:
+            return f'{origin.__name__}(_deserialize_value({v}, _decimal))'
+
+        if origin in (list, tuple, set, frozenset):
+            x = self.var()
+            inner = self.decoder(args[0], x)
+
+            if origin is list:
+                return f'[{inner} for {x} in _as_list({v})]'
+
+            return f'{origin.__name__}({inner} for {x} in _as_list({v}))'
+
+        if origin is dict:
+            k, x = self.var(), self.var()
+            return (
+                f"{{{k}: {self.decoder(args[1], x)} for {k}, {x} in {v}['M'].items()}}"
+            )
+
+        raise TypeError(f'unsupported type {tp!r}')
+
+
+def _literal_type(tp: Any) -> type:
+    types = {type(a) for a in get_args(tp)}
+
+    if len(types) != 1:
+        raise TypeError(f'literal values must share one type, got {tp!r}')
+
+    return types.pop()
+
+
+def _enum_type(tp: type[Enum]) -> type:
+    return _literal_type(Literal[tuple(m.value for m in tp)])
+
+
+def _set_element(tp: Any, x: str) -> tuple[str, str]:
+    if isinstance(tp, type) and issubclass(tp, Enum):
+        tp, x = _enum_type(tp), f'{x}.value'
+
+    if tp is bool or not isinstance(tp, type):
+        raise TypeError(f'unsupported set element type {tp!r}')
+
+    if issubclass(tp, (int, Decimal)):
+        return 'NS', f'_number({x})'
+
+    if issubclass(tp, str):
+        return 'SS', x if tp is str else f'str({x})'
+
+    if issubclass(tp, (UUID, IPv4Address)):
+        return 'SS', f'str({x})'
+
+    if issubclass(tp, date):
+        return 'SS', f'{x}.isoformat()'
 
+    if tp is bytes:
+        return 'BS', x
 
-def deserialize(data: Mapping[str, Any]) -> dict:
-    return {k: deserializer.deserialize(v) for k, v in data.items()}
+    raise TypeError(f'unsupported set element type {tp!r}')
@@ -0,0 +1,342 @@
+import threading
+import time
+from decimal import Decimal
+from typing import TYPE_CHECKING, Callable, Hashable, Self, TypedDict
+
+from .expressions import (
+    Add,
+    CompactPlaceholders,
+    Delete,
+    Expr,
+    IfNotExistsExpr,
+    Remove,
+    Set,
+    UpdateExpr,
+    action_reads,
+    is_plain_set,
+    top_level,
+)
+from .transact_writer import TRANSACT_WRITE_LIMIT, TransactWriter
+from .types import hashable_key, serialize
+
+if TYPE_CHECKING:
+    from mypy_boto3_dynamodb.client import DynamoDBClient
+else:
+    DynamoDBClient = object
+
+
+class WriteBehindStats(TypedDict):
+    writes: int
+    merged: int
+    updates: int
+    elapsed: float
+
+
+class WriteBehindBuffer:
+    """
+    Merge updates to the same key in memory and write them behind, as one
+    `UpdateExpr` per key, through a `TransactWriter`.
+
+    ```python
+    with WriteBehindBuffer('pytest', client=client, max_delay=0.5) as buffer:
+        buffer.update({'pk': 'PAGE', 'sk': path}, UpdateExpr(Add(views=Decimal(1))))
+    ```
+
+    Increments of the same path (`Add`, `Set(operand='+')` and
+    `if_not_exists(...) + n`) are summed, set additions and deletions are
+    unioned, and a plain `Set` or `Remove` replaces what came before it.
+    An update that can't be merged with the pending one for its key, e.g.
+    one reading an attribute the pending update writes, is sent after it.
+
+    Pending updates are flushed once `max_keys` keys are waiting, every
+    `max_delay` seconds from a background thread, and on exit. Writes are
+    acknowledged before they reach DynamoDB, so they are lost if the
+    process dies first. A flush that fails raises, from the next call when
+    it ran in the background. `on_flush` is called with the `WriteBehindStats`
+    of every flush, where `merged` counts the writes that didn't need an
+    update of their own. All methods are thread-safe.
+    """
+
+    def __init__(
+        self,
+        table_name: str,
+        *,
+        client: DynamoDBClient,
+        max_keys: int = TRANSACT_WRITE_LIMIT,
+        max_delay: float | None = 1.0,
+        max_workers: int = 1,
+        key_attrs: tuple[str, ...] = ('pk', 'sk'),
+        on_flush: Callable[[WriteBehindStats], None] | None = None,
+    ) -> None:
+        if max_keys < 1:
+            raise ValueError('max_keys must be at least 1')
+
+        self._table_name = table_name
+        self._client = client
+        self._max_keys = max_keys
+        self._max_delay = max_delay
+        self._max_workers = max_workers
+        self._key_attrs = key_attrs
+        self._on_flush = on_flush
+        self._lock = threading.Lock()
+        # Keeps flushes in order, so an update sealed for a key
+        # is always written before the next one for that key
+        self._flush_lock = threading.Lock()
+        self._pending: dict[Hashable, tuple[str, dict, dict[str, Expr]]] = {}
+        self._sealed: list[tuple[str, dict, list[Expr]]] = []
+        self._writes = 0
+        self._error: Exception | None = None
+        self._stop = threading.Event()
+        self._timer: threading.Thread | None = None
+        self.writes = 0
+        self.merged = 0
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_details) -> None:
+        self.close()
+
+    def update(
+        self,
+        key: dict,
+        update_expr: UpdateExpr,
+        *,
+        table_name: str | None = None,
+    ) -> None:
+        if update_expr.condition:
+            raise ValueError('Conditional updates cannot be written behind')
+
+        self._raise_error()
+        table_name = table_name or self._table_name
+        buffer_key = (table_name, hashable_key(serialize(key)))
+
+        with self._lock:
+            self._start_timer()
+            self._writes += 1
+            entry = self._pending.get(buffer_key)
+
+            if entry is None:
+                actions = _merge_actions({}, update_expr.actions)
+            else:
+                actions = _merge_actions(entry[2], update_expr.actions)
+
+                if actions is None:
+                    # Written after the pending update, in a later flush
+                    self._sealed.append((table_name, key, list(entry[2].values())))
+                    del self._pending[buffer_key]
+                    actions = _merge_actions({}, update_expr.actions)
+
+            if actions is None:
+                raise ValueError('Update actions overlap or depend on each other')
+
+            self._pending[buffer_key] = (table_name, key, actions)
+            should_flush = len(self._pending) + len(self._sealed) >= self._max_keys
+
+        if should_flush:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write every pending update now."""
+        with self._flush_lock:
+            with self._lock:
+                updates = self._sealed + [
+                    (table_name, key, list(actions.values()))
+                    for table_name, key, actions in self._pending.values()
+                ]
+                writes = self._writes
+                self._sealed = []
+                self._pending = {}
+                self._writes = 0
+
+            if not updates:
+                return
+
+            started_at = time.perf_counter()
+
+            with TransactWriter(
+                self._table_name,
+                client=self._client,
+                max_workers=self._max_workers,
+                key_attrs=self._key_attrs,
+            ) as transact:
+                for table_name, key, actions in updates:
+                    transact.update(
+                        key,
+                        UpdateExpr(*actions, placeholders=CompactPlaceholders),
+                        table_name=table_name,
+                    )
+
+            stats = WriteBehindStats(
+                writes=writes,
+                merged=writes - len(updates),
+                updates=len(updates),
+                elapsed=time.perf_counter() - started_at,
+            )
+
+            with self._lock:
+                self.writes += stats['writes']
+                self.merged += stats['merged']
+
+            if self._on_flush:
+                self._on_flush(stats)
+
+    def close(self) -> None:
+        """Stop the background flushes and write what's left."""
+        self._stop.set()
+
+        if self._timer:
+            self._timer.join()
+            self._timer = None
+
+        self.flush()
+        self._raise_error()
+
+    def _start_timer(self) -> None:
+        # Callers hold the lock
+        if self._timer or not self._max_delay or self._stop.is_set():
+            return
+
+        self._timer = threading.Thread(
+            target=self._run,
+            name='WriteBehindBuffer',
+            daemon=True,
+        )
+        self._timer.start()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._max_delay):
+            try:
+                self.flush()
+            except Exception as err:
+                with self._lock:
+                    # The next update starts a new timer
+                    self._error = err
+                    self._timer = None
+                return
+
+    def _raise_error(self) -> None:
+        if self._error:
+            err, self._error = self._error, None
+            raise err
+
+
+def _merge_actions(pending: dict[str, Expr], actions: list[Expr]) -> dict | None:
+    """
+    Return the actions of `pending` followed by `actions` as a single
+    update, or `None` if they can't be written as one.
+    """
+    merged = dict(pending)
+    # Every operand of a single update reads the item as it was before it,
+    # so an action can't read what an earlier one writes
+    written = {top_level(path) for path in merged}
+
+    for action in actions:
+        path = action.path
+        reads = {top_level(p) for p in action_reads(action) if p != path}
+
+        if reads & written:
+            return None
+
+        if path in merged:
+            combined = _combine(merged[path], action)
+
+            if combined is None:
+                return None
+
+            merged[path] = combined
+        elif top_level(path) in written:
+            # DynamoDB rejects overlapping paths in one update
+            return None
+        else:
+            merged[path] = action
+
+        written.add(top_level(path))
+
+    return merged
+
+
+def _combine(first: Expr, second: Expr) -> Expr | None:
+    """Merge two actions on the same path, or return `None` if they
+    can't be written as one."""
+    path = second.path
+
+    if isinstance(second, Remove) or is_plain_set(second):
+        return second
+
+    match first, second:
+        case Add(), Add() if isinstance(first.value, set) and isinstance(
+            second.value, set
+        ):
+            return Add(**{path: first.value | second.value})
+
+        case Delete(), Delete():
+            return Delete(**{path: first.value | second.value})
+
+    delta = _delta(second)
+
+    if delta is None:
+        return None
+
+    if is_plain_set(first) and _is_number(first.value):
+        return Set(**{path: first.value + delta})
+
+    match first:
+        case Add() if _is_number(first.value):
+            return Add(**{path: Decimal(first.value + delta)})
+
+        case Set(value=IfNotExistsExpr()) if first.value.path == path:
+            increment = first.value.r_value or 0
+
+            if first.value.operand == '-':
+                increment = -increment
+
+            return Set(
+                **{path: _if_not_exists(path, first.value.value, increment + delta)}
+            )
+
+        case Set() if first.operand in ('+', '-') and _is_number(first.value):
+            return _increment(path, _delta(first) + delta)  # type: ignore
+
+    return None
+
+
+def _delta(action: Expr) -> Decimal | int | None:
+    """The amount an increment adds to its own path."""
+    value = action.value
+
+    match action:
+        case Add() if _is_number(value):
+            return value
+
+        case Set(operand='+') if _is_number(value):
+            return value
+
+        case Set(operand='-') if _is_number(value):
+            return -value
+
+        case Set(value=IfNotExistsExpr(path=action.path)):
+            increment = value.r_value or 0
+            return -increment if value.operand == '-' else increment
+
+    return None
+
+
+def _increment(path: str, delta: Decimal | int) -> Set:
+    if delta < 0:
+        return Set(**{path: -delta}, operand='-')
+
+    return Set(**{path: delta}, operand='+')
+
+
+def _if_not_exists(
+    path: str, default: Decimal | int, delta: Decimal | int
+) -> IfNotExistsExpr:
+    if delta < 0:
+        return IfNotExistsExpr(path, default, r_value=-delta, operand='-')  # type: ignore
+
+    return IfNotExistsExpr(path, default, r_value=delta, operand='+')  # type: ignore
+
+
+def _is_number(value: object) -> bool:
+    return isinstance(value, (int, Decimal)) and not isinstance(value, bool)
@@ -1,9 +1,12 @@
-from typing import TYPE_CHECKING, Generator
+import asyncio
+import os
+from typing import TYPE_CHECKING, Generator, Iterable
 
 import boto3
 import jsonlines
 import pytest
 
+from dynamodx.fake import FakeClient
 from dynamodx.types import serialize
 
 if TYPE_CHECKING:
@@ -18,7 +21,13 @@ def dynamodb_client() -> Generator[DynamoDBClient, None, None]:
     pk = 'pk'
     sk = 'sk'
 
-    client = boto3.client('dynamodb', endpoint_url='http://localhost:8000')
+    # Set DYNAMODB_ENDPOINT_URL=http://localhost:8000 to run against DynamoDB Local
+    endpoint_url = os.environ.get('DYNAMODB_ENDPOINT_URL')
+    client = (
+        boto3.client('dynamodb', endpoint_url=endpoint_url)
+        if endpoint_url
+        else FakeClient()
+    )
     client.create_table(
         AttributeDefinitions=[
             {'AttributeName': pk, 'AttributeType': 'S'},
@@ -45,3 +54,134 @@ def dynamodb_seeds(dynamodb_client):
     with jsonlines.open('tests/seeds.jsonl') as lines:
         for line in lines:
             dynamodb_client.put_item(TableName='pytest', Item=serialize(line))
+
+
+class FlakyClient:
+    """Leaves one key or request unprocessed in the first `failures` calls."""
+
+    def __init__(self, failures: int) -> None:
+        self.failures = failures
+        self.calls: list[dict] = []
+
+    def batch_get_item(self, RequestItems: dict) -> dict:
+        self.calls.append(RequestItems)
+        table_name, request = next(iter(RequestItems.items()))
+        keys = request['Keys']
+
+        if len(self.calls) > self.failures:
+            return {'Responses': {table_name: keys}}
+
+        return {
+            'Responses': {table_name: keys[1:]},
+            'UnprocessedKeys': {table_name: request | {'Keys': keys[:1]}},
+        }
+
+    def batch_write_item(self, RequestItems: dict) -> dict:
+        self.calls.append(RequestItems)
+
+        if len(self.calls) > self.failures:
+            return {}
+
+        table_name, requests = next(iter(RequestItems.items()))
+        return {'UnprocessedItems': {table_name: requests[:1]}}
+
+
+@pytest.fixture
+def flaky_client(monkeypatch) -> type[FlakyClient]:
+    monkeypatch.setattr('time.sleep', lambda _: None)
+    return FlakyClient
+
+
+class TransactionCanceledError(Exception):
+    def __init__(self, response: dict) -> None:
+        super().__init__(response['Error']['Message'])
+        self.response = response
+
+
+class TransactClient:
+    """
+    Serves `get_item` from `items`, and cancels transactions:
+
+    - conditional operations on a key in `items` fail with the stored item,
+    - the last operation of the first `conflicts` calls fails with `code`.
+    """
+
+    class exceptions:
+        TransactionCanceledException = TransactionCanceledError
+
+    def __init__(
+        self,
+        items: Iterable[dict] = (),
+        *,
+        code: str = 'TransactionConflict',
+        conflicts: int = 0,
+    ) -> None:
+        self.items = {(i['pk'], i['sk']): serialize(i) for i in items}
+        self.code = code
+        self.conflicts = conflicts
+        self.calls: list[dict] = []
+        self.gets = 0
+
+    def get_item(self, Key: dict, **kwargs) -> dict:
+        self.gets += 1
+        item = self.items.get((Key['pk']['S'], Key['sk']['S']))
+        return {'Item': item} if item else {}
+
+    def transact_write_items(self, TransactItems: list, **kwargs) -> dict:
+        self.calls.append({'TransactItems': TransactItems} | kwargs)
+        reasons = [self._reason(op) for op in TransactItems]
+
+        if len(self.calls) <= self.conflicts:
+            reasons[-1] = {'Code': self.code, 'Message': 'Cancelled'}
+
+        if all(reason['Code'] == 'None' for reason in reasons):
+            return {}
+
+        raise TransactionCanceledError(
+            {
+                'Error': {'Message': 'Transaction cancelled'},
+                'CancellationReasons': reasons,
+            }
+        )
+
+    def _reason(self, op: dict) -> dict:
+        (body,) = op.values()
+        key = body.get('Key', body.get('Item'))
+        item = self.items.get((key['pk']['S'], key['sk']['S']))
+
+        if 'ConditionExpression' not in body or not item:
+            return {'Code': 'None'}
+
+        return {
+            'Code': 'ConditionalCheckFailed',
+            'Message': 'The conditional request failed',
+            'Item': item,
+        }
+
+
+class AsyncTransactClient(TransactClient):
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def transact_write_items(self, TransactItems: list, **kwargs) -> dict:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+        try:
+            await asyncio.sleep(0.01)
+            return super().transact_write_items(TransactItems, **kwargs)
+        finally:
+            self.in_flight -= 1
+
+
+@pytest.fixture
+def transact_client(monkeypatch) -> type[TransactClient]:
+    monkeypatch.setattr('time.sleep', lambda _: None)
+    return TransactClient
+
+
+@pytest.fixture
+def async_transact_client() -> type[AsyncTransactClient]:
+    return AsyncTransactClient
@@ -0,0 +1,105 @@
+import asyncio
+
+import pytest
+
+from dynamodx.async_transact_writer import AsyncTransactWriter
+from dynamodx.expressions import Attr
+from dynamodx.transact_writer import (
+    RetryPolicy,
+    TransactionCanceledException,
+    TransactionOperationFailed,
+)
+
+
+@pytest.mark.parametrize('client_fixture', ['async_transact_client', 'transact_client'])
+def test_async_transact_write_items(request, client_fixture):
+    client = request.getfixturevalue(client_fixture)()
+
+    async def main():
+        async with AsyncTransactWriter(
+            'pytest',
+            client=client,
+            flush_amount=10,
+            ordered=False,
+        ) as transact:
+            for idx in range(95):
+                await transact.put(
+                    item={'pk': 'USER', 'sk': str(idx)},
+                    cond_expr=Attr('sk').not_exists(),
+                )
+
+    asyncio.run(main())
+
+    assert [len(call['TransactItems']) for call in client.calls] == [10] * 9 + [5]
+
+    if client_fixture == 'async_transact_client':
+        assert client.max_in_flight == 4
+
+
+def test_async_transact_write_items_fails(async_transact_client):
+    class EmailConflictError(TransactionOperationFailed):
+        pass
+
+    client = async_transact_client([{'pk': 'EMAIL', 'sk': 'taken'}])
+
+    async def main():
+        async with AsyncTransactWriter('pytest', client=client) as transact:
+            await transact.put(item={'pk': 'USER', 'sk': '0'})
+            await transact.put(
+                item={'pk': 'EMAIL', 'sk': 'taken'},
+                cond_expr=Attr('sk').not_exists(),
+                exc_cls=EmailConflictError,
+            )
+
+    with pytest.raises(EmailConflictError) as err:
+        asyncio.run(main())
+
+    assert err.value.reason['code'] == 'ConditionalCheckFailed'
+    assert err.value.reason['old_item']['pk'] == 'EMAIL'
+
+
+def test_async_transact_write_items_when_fail_fast_disabled(async_transact_client):
+    client = async_transact_client(
+        [{'pk': 'EMAIL', 'sk': 'taken'}, {'pk': 'USERNAME', 'sk': 'taken'}]
+    )
+
+    async def main():
+        async with AsyncTransactWriter(
+            'pytest',
+            client=client,
+            fail_fast=False,
+        ) as transact:
+            await transact.put(
+                item={'pk': 'EMAIL', 'sk': 'taken'},
+                cond_expr=Attr('sk').not_exists(),
+            )
+            await transact.put(
+                item={'pk': 'USERNAME', 'sk': 'taken'},
+                cond_expr=Attr('sk').not_exists(),
+            )
+
+    with pytest.raises(TransactionCanceledException) as err:
+        asyncio.run(main())
+
+    assert len(err.value.reasons) == 2
+
+
+def test_async_transact_write_items_retries_transient_cancellations(
+    async_transact_client,
+):
+    client = async_transact_client(conflicts=1)
+
+    async def main():
+        async with AsyncTransactWriter(
+            'pytest',
+            client=client,
+            retry=RetryPolicy(backoff_base=0),
+        ) as transact:
+            await transact.put(item={'pk': 'USER', 'sk': '0'})
+
+    asyncio.run(main())
+
+    assert len(client.calls) == 2
+    assert (
+        client.calls[0]['ClientRequestToken'] == client.calls[1]['ClientRequestToken']
+    )
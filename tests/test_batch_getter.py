@@ -0,0 +1,49 @@
+import pytest
+
+from dynamodx.batch_getter import BatchGetter, UnprocessedKeysError
+from dynamodx.batch_writer import BatchWriter
+
+
+def test_batch_get_items(dynamodb_client):
+    with BatchWriter('pytest', client=dynamodb_client) as batch:
+        for idx in range(150):
+            batch.put({'pk': 'USER', 'sk': str(idx), 'name': 'Bilbo Baggins'})
+
+    getter = BatchGetter('pytest', client=dynamodb_client, projection=['sk'])
+    keys = [{'pk': 'USER', 'sk': str(idx)} for idx in range(200)]
+    # Duplicated keys are fetched once
+    items = list(getter.get(keys + keys))
+
+    assert len(items) == 150
+    assert {item['sk'] for item in items} == {str(idx) for idx in range(150)}
+    assert items[0].keys() == {'sk'}
+
+
+def test_batch_get_retries_unprocessed_keys(flaky_client):
+    client = flaky_client(failures=2)
+    getter = BatchGetter('pytest', client=client, max_workers=1)  # type: ignore
+    keys = ({'pk': 'USER', 'sk': str(idx)} for idx in range(250))
+
+    items = list(getter.get(keys))
+
+    assert len(items) == 250
+    assert [len(call['pytest']['Keys']) for call in client.calls] == [
+        100,
+        1,
+        1,
+        100,
+        50,
+    ]
+
+
+def test_batch_get_gives_up(flaky_client):
+    client = flaky_client(failures=100)
+    getter = BatchGetter('pytest', client=client, max_retries=3)  # type: ignore
+
+    with pytest.raises(UnprocessedKeysError) as err:
+        list(getter.get([{'pk': 'USER', 'sk': '0'}]))
+
+    assert len(client.calls) == 4
+    assert err.value.unprocessed_keys['pytest']['Keys'] == [
+        {'pk': {'S': 'USER'}, 'sk': {'S': '0'}}
+    ]
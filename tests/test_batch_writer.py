@@ -0,0 +1,57 @@
+import pytest
+
+from dynamodx.batch_writer import BatchWriter, UnprocessedItemsError
+
+
+def test_batch_write_items(dynamodb_client):
+    stats = []
+
+    with BatchWriter('pytest', client=dynamodb_client, on_batch=stats.append) as batch:
+        for idx in range(30):
+            batch.put({'pk': 'USER', 'sk': str(idx), 'name': 'Bilbo Baggins'})
+
+        # Same key as above, the last request wins
+        batch.put({'pk': 'USER', 'sk': '29', 'name': 'Frodo Baggins'})
+        batch.delete({'pk': 'USER', 'sk': '28'})
+
+    assert [s['items'] for s in stats] == [25, 5]
+
+    items = dynamodb_client.query(
+        TableName='pytest',
+        KeyConditionExpression='pk = :pk',
+        ExpressionAttributeValues={':pk': {'S': 'USER'}},
+    )['Items']
+    assert len(items) == 29
+    assert {'S': 'Frodo Baggins'} in [item['name'] for item in items]
+
+
+def test_batch_write_retries_unprocessed_items(flaky_client):
+    client = flaky_client(failures=2)
+    stats = []
+
+    with BatchWriter('pytest', client=client, on_batch=stats.append) as batch:  # type: ignore
+        batch.put({'pk': 'USER', 'sk': '0'})
+        batch.put({'pk': 'USER', 'sk': '1'})
+
+    assert [len(call['pytest']) for call in client.calls] == [2, 1, 1]
+    assert stats[0]['attempts'] == 3
+    assert stats[0]['unprocessed'] == 2
+
+
+def test_batch_write_gives_up(flaky_client):
+    client = flaky_client(failures=100)
+
+    with pytest.raises(UnprocessedItemsError) as err:
+        with BatchWriter('pytest', client=client, max_retries=3) as batch:  # type: ignore
+            batch.put({'pk': 'USER', 'sk': '0'})
+
+    assert len(client.calls) == 4
+    assert err.value.unprocessed_items == {
+        'pytest': [{'PutRequest': {'Item': {'pk': {'S': 'USER'}, 'sk': {'S': '0'}}}}]
+    }
+
+
+def test_batch_write_requires_key_attrs(flaky_client):
+    with pytest.raises(ValueError):
+        with BatchWriter('pytest', client=flaky_client(failures=0)) as batch:  # type: ignore
+            batch.put({'id': 'USER'})
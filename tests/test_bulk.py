@@ -0,0 +1,203 @@
+import gzip
+import json
+import os
+from decimal import Decimal
+
+import pytest
+
+from dynamodx import __main__ as cli
+from dynamodx.bulk import export_jsonl, import_jsonl
+from dynamodx.types import deserialize, serialize
+
+KEY = {'pk': 'USER', 'sk': '0'}
+
+
+def write_lines(path: str, count: int, start: int = 0) -> None:
+    opener = gzip.open if path.endswith('.gz') else open
+
+    with opener(path, 'wt', encoding='utf-8') as fp:
+        for idx in range(start, start + count):
+            line = {'pk': 'USER', 'sk': str(idx), 'score': 1.5, 'tags': ['a', 'b']}
+            fp.write(json.dumps(line) + '\n')
+
+        # Blank lines are skipped
+        fp.write('\n')
+
+
+def scan_items(client) -> list[dict]:
+    items = client.scan(TableName='pytest')['Items']
+    return [deserialize(item) for item in items]
+
+
+def test_import(dynamodb_client, tmp_path):
+    path = str(tmp_path / 'items.jsonl.gz')
+    write_lines(path, 260)
+    progress = []
+
+    stats = import_jsonl(
+        path,
+        'pytest',
+        client=dynamodb_client,
+        processes=0,
+        max_workers=4,
+        chunk_size=50,
+        on_progress=progress.append,
+    )
+
+    assert stats['lines'] == 261
+    assert stats['items'] == 260
+    # 50-line chunks: 5 of 2 batches, and one of 11 items
+    assert stats['batches'] == 11
+    assert progress[-1]['items'] == 260
+
+    items = scan_items(dynamodb_client)
+    assert len(items) == 260
+    assert items[0]['score'] == Decimal('1.5')
+    assert items[0]['tags'] == {'a', 'b'}
+
+
+def test_import_process_pool(dynamodb_client, tmp_path):
+    paths = [str(tmp_path / 'a.jsonl'), str(tmp_path / 'b.jsonl')]
+    write_lines(paths[0], 30)
+    write_lines(paths[1], 30, start=30)
+
+    stats = import_jsonl(
+        paths,
+        'pytest',
+        client=dynamodb_client,
+        processes=2,
+        chunk_size=10,
+    )
+
+    assert stats['items'] == 60
+    assert len(scan_items(dynamodb_client)) == 60
+
+
+class FailingClient:
+    def __init__(self, client, calls: int) -> None:
+        self._client = client
+        self.calls = calls
+
+    def batch_write_item(self, **kwargs) -> dict:
+        self.calls -= 1
+
+        if self.calls < 0:
+            raise ConnectionError('Connection reset')
+
+        return self._client.batch_write_item(**kwargs)
+
+
+def test_import_resumes_from_checkpoint(dynamodb_client, tmp_path):
+    path = str(tmp_path / 'items.jsonl')
+    checkpoint = str(tmp_path / 'items.ckpt')
+    write_lines(path, 100)
+
+    with pytest.raises(ConnectionError):
+        import_jsonl(
+            path,
+            'pytest',
+            client=FailingClient(dynamodb_client, calls=2),
+            processes=0,
+            max_workers=1,
+            chunk_size=25,
+            checkpoint=checkpoint,
+        )
+
+    with open(checkpoint) as fp:
+        assert json.load(fp)['chunks'] == 2
+
+    stats = import_jsonl(
+        path,
+        'pytest',
+        client=dynamodb_client,
+        processes=0,
+        chunk_size=25,
+        checkpoint=checkpoint,
+    )
+
+    assert stats['skipped_lines'] == 50
+    assert stats['items'] == 50
+    assert len(scan_items(dynamodb_client)) == 100
+    assert not os.path.exists(checkpoint)
+
+    # A checkpoint only resumes the import it was written for
+    with open(checkpoint, 'w') as fp:
+        json.dump({'paths': [path], 'chunk_size': 10, 'chunks': 1, 'lines': 10}, fp)
+
+    with pytest.raises(ValueError):
+        import_jsonl(
+            path, 'pytest', client=dynamodb_client, chunk_size=25, checkpoint=checkpoint
+        )
+
+
+def test_export(dynamodb_client, tmp_path):
+    path = str(tmp_path / 'items.jsonl')
+    write_lines(path, 100)
+    import_jsonl(path, 'pytest', client=dynamodb_client, processes=0)
+
+    stats = export_jsonl(
+        'pytest',
+        str(tmp_path / 'backup'),
+        client=dynamodb_client,
+        segments=3,
+        compress=True,
+    )
+
+    assert stats['items'] == 100
+    assert [os.path.basename(f) for f in stats['files']] == [
+        'segment-0000.jsonl.gz',
+        'segment-0001.jsonl.gz',
+        'segment-0002.jsonl.gz',
+    ]
+
+    lines = []
+
+    for file in stats['files']:
+        with gzip.open(file, 'rt') as fp:
+            lines.extend(json.loads(line)['Item'] for line in fp)
+
+    assert sorted(int(line['sk']['S']) for line in lines) == list(range(100))
+    assert lines[0]['score'] == {'N': '1.5'}
+    assert sorted(lines[0]['tags']['SS']) == ['a', 'b']
+
+
+def test_export_round_trip(dynamodb_client, tmp_path):
+    item = serialize(
+        {
+            'pk': 'USER',
+            'sk': '0',
+            'score': Decimal('1.2345678901234567890123456789'),
+            'big': Decimal('12345678901234567890123456789012345678'),
+            'scores': {Decimal('0.1'), Decimal('-3E+10')},
+            'avatar': b'\x00\xff',
+            'keys': {b'a', b'b'},
+            'nested': {'m': [{'n': Decimal('2.50'), 'ok': True, 'none': None}]},
+        }
+    )
+    # Lists of scalars, which `serialize` would write as sets
+    item['tags'] = {'L': [{'S': 'b'}, {'S': 'a'}, {'S': 'b'}]}
+    item['ranks'] = {'L': [{'N': '3'}, {'N': '1'}, {'B': b'\x01'}]}
+    dynamodb_client.put_item(TableName='pytest', Item=item)
+    backup = str(tmp_path / 'backup')
+    stats = export_jsonl('pytest', backup, client=dynamodb_client, segments=1)
+    dynamodb_client.delete_item(TableName='pytest', Key=serialize(KEY))
+
+    import_jsonl(stats['files'], 'pytest', client=dynamodb_client, processes=0)
+
+    response = dynamodb_client.get_item(TableName='pytest', Key=serialize(KEY))
+    restored = deserialize(response['Item'])
+    assert restored == deserialize(item)
+    assert restored['tags'] == ['b', 'a', 'b']
+
+
+def test_cli(dynamodb_client, tmp_path, monkeypatch, capsys):
+    path = str(tmp_path / 'items.jsonl')
+    write_lines(path, 10)
+    monkeypatch.setattr(cli, 'get_client', lambda **kwargs: dynamodb_client)
+
+    assert cli.main(['import', 'pytest', path, '--processes', '0']) == 0
+    assert cli.main(['export', 'pytest', str(tmp_path / 'backup'), '-s', '2']) == 0
+
+    out = capsys.readouterr().out
+    assert '10 items from 11 lines' in out
+    assert '10 items to 2 files' in out
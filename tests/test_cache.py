@@ -0,0 +1,117 @@
+import threading
+
+import pytest
+
+from dynamodx.cache import ItemCache
+from dynamodx.expressions import Set, UpdateExpr
+from dynamodx.transact_writer import TransactionOperationFailed, TransactWriter
+from dynamodx.types import serialize
+
+
+def test_get_item(transact_client):
+    client = transact_client([{'pk': 'CONFIG', 'sk': '0', 'flag': True}])
+    cache = ItemCache()
+    key = {'pk': 'CONFIG', 'sk': '0'}
+
+    assert cache.get_item('pytest', key, client=client)['flag'] is True  # type: ignore
+    assert cache.get_item('pytest', key, client=client)['flag'] is True  # type: ignore
+    assert cache.get_item('pytest', {'pk': 'CONFIG', 'sk': '1'}, client=client) is None
+    assert cache.get_item('pytest', {'pk': 'CONFIG', 'sk': '1'}, client=client) is None
+    assert client.gets == 2
+    assert cache.stats() == {'size': 2, 'hits': 2, 'misses': 2, 'evictions': 0}
+
+
+def test_get_item_expires(monkeypatch, transact_client):
+    now = 0.0
+    monkeypatch.setattr('time.monotonic', lambda: now)
+    client = transact_client([{'pk': 'CONFIG', 'sk': '0'}])
+    cache = ItemCache(ttl=10)
+
+    cache.get_item('pytest', {'pk': 'CONFIG', 'sk': '0'}, client=client)
+    now = 11.0
+    cache.get_item('pytest', {'pk': 'CONFIG', 'sk': '0'}, client=client)
+
+    assert client.gets == 2
+
+
+def test_evicts_least_recently_used(transact_client):
+    client = transact_client()
+    cache = ItemCache(max_size=2)
+
+    for sk in ('0', '1', '0', '2', '0', '1'):
+        cache.get_item('pytest', {'pk': 'USER', 'sk': sk}, client=client)
+
+    assert client.gets == 4
+    assert cache.stats()['evictions'] == 2
+
+
+def test_transact_writer_updates_cache(transact_client):
+    client = transact_client(
+        [
+            {'pk': 'USER', 'sk': '0', 'name': 'Bilbo'},
+            {'pk': 'USER', 'sk': '1', 'name': 'Frodo'},
+        ]
+    )
+    cache = ItemCache()
+    cache.get_item('pytest', {'pk': 'USER', 'sk': '0'}, client=client)
+    cache.get_item('pytest', {'pk': 'USER', 'sk': '1'}, client=client)
+
+    with TransactWriter('pytest', client=client, cache=cache) as transact:  # type: ignore
+        transact.put(item={'pk': 'USER', 'sk': '0', 'name': 'Bilbo Baggins'})
+        transact.update(
+            key={'pk': 'USER', 'sk': '1'},
+            update_expr=UpdateExpr(Set(name='Frodo Baggins')),
+        )
+
+    item = cache.get_item('pytest', {'pk': 'USER', 'sk': '0'}, client=client)
+    assert item['name'] == 'Bilbo Baggins'  # type: ignore
+    assert client.gets == 2
+
+    # Invalidated, so it's fetched again
+    cache.get_item('pytest', {'pk': 'USER', 'sk': '1'}, client=client)
+    assert client.gets == 3
+
+
+def test_transact_writer_refreshes_cache_on_cancellation(transact_client):
+    client = transact_client([{'pk': 'USER', 'sk': '0', 'version': 2}])
+    cache = ItemCache()
+
+    with pytest.raises(TransactionOperationFailed):
+        with TransactWriter('pytest', client=client, cache=cache) as transact:  # type: ignore
+            transact.update(
+                key={'pk': 'USER', 'sk': '0'},
+                update_expr='SET version = :v',
+                cond_expr='version = :old',
+                expr_attr_values={':v': 2, ':old': 1},
+                return_on_cond_fail='ALL_OLD',
+            )
+
+    item = cache.get_item('pytest', {'pk': 'USER', 'sk': '0'}, client=client)
+    assert item['version'] == 2  # type: ignore
+    assert client.gets == 0
+
+
+def test_invalidation_wins_over_concurrent_read(transact_client):
+    fetching = threading.Event()
+    invalidated = threading.Event()
+
+    class SlowClient(transact_client):
+        def get_item(self, **kwargs) -> dict:
+            fetching.set()
+            invalidated.wait()
+            return super().get_item(**kwargs)
+
+    client = SlowClient([{'pk': 'USER', 'sk': '0'}])
+    cache = ItemCache()
+    key = {'pk': 'USER', 'sk': '0'}
+    # The reader fetches the item before the write, and returns it after
+    reader = threading.Thread(
+        target=lambda: cache.get_item('pytest', key, client=client)
+    )
+    reader.start()
+    fetching.wait()
+    cache.invalidate('pytest', serialize(key))
+    invalidated.set()
+    reader.join()
+
+    assert cache.stats()['size'] == 0
@@ -0,0 +1,43 @@
+import subprocess
+import sys
+
+from dynamodx.client import clear_clients, get_client
+
+
+def test_import_is_lazy():
+    code = (
+        'import sys\n'
+        'import dynamodx.transact_writer, dynamodx.async_transact_writer\n'
+        'import dynamodx.batch_writer, dynamodx.batch_getter, dynamodx.reader\n'
+        'import dynamodx.cache, dynamodx.bulk, dynamodx.client\n'
+        'import dynamodx.write_behind, dynamodx.sharded_counter\n'
+        "print(sorted({'boto3', 'botocore', 'jmespath'} & set(sys.modules)))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, '-c', code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert result.stdout.strip() == '[]'
+
+
+def test_get_client():
+    clear_clients()
+    client = get_client(region_name='us-east-1', endpoint_url='http://localhost:8000')
+    config = client.meta.config
+
+    assert (
+        get_client(region_name='us-east-1', endpoint_url='http://localhost:8000')
+        is client
+    )
+    assert config.max_pool_connections == 16
+    assert config.tcp_keepalive
+    assert config.retries == {'mode': 'standard', 'total_max_attempts': 5}
+
+    larger = get_client(region_name='us-east-1', max_workers=32)
+    assert larger is not client
+    assert larger.meta.config.max_pool_connections == 32
+
+    clear_clients()
+    assert get_client(region_name='us-east-1', max_workers=32) is not larger
@@ -1,14 +1,28 @@
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from decimal import Decimal
 
+import pytest
+from botocore.exceptions import ClientError
+
+from dynamodx import expressions
 from dynamodx.expressions import (
     Add,
+    Attr,
+    CompactPlaceholders,
+    ConditionExpr,
     Delete,
+    ExpressionError,
     Remove,
     Set,
     UpdateExpr,
+    apply,
+    evaluate,
     if_not_exists,
     list_append,
 )
+from dynamodx.types import LazyItem, deserialize, serialize
 
 
 def test_update_expr_exclude_none():
@@ -117,3 +131,465 @@ def test_update_expr_sum():
             ':v_score_r': 1,
         },
     }
+
+
+def test_update_expr_binds_values_to_cached_shape():
+    first = UpdateExpr(
+        Set(name='Bilbo Baggins'),
+        Set(attempts=if_not_exists(attempts=0) + 1),
+        Remove('quantity'),
+    )
+    second = UpdateExpr(
+        Set(name='Frodo Baggins'),
+        Set(attempts=if_not_exists(attempts=10) + 2),
+        Remove('quantity'),
+    )
+
+    assert first['update_expr'] is second['update_expr']
+    assert first['expr_attr_names'] == second['expr_attr_names']
+    assert first['expr_attr_names'] is not second['expr_attr_names']
+    assert second['expr_attr_values'] == {
+        ':v_name': 'Frodo Baggins',
+        ':v_attempts': 10,
+        ':v_attempts_r': 2,
+    }
+
+    # Without a right operand the shape changes
+    assert UpdateExpr(Set(attempts=if_not_exists(attempts=0)))['update_expr'] == (
+        'SET #n_attempts = if_not_exists(#n_attempts, :v_attempts)'
+    )
+
+
+def test_update_expr_cache_is_thread_safe(monkeypatch):
+    monkeypatch.setattr('dynamodx.expressions._CACHE_SIZE', 8)
+    monkeypatch.setattr('dynamodx.expressions._cache', {})
+    # Switch threads often, so evictions race
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+
+    def compile_shapes(worker: int) -> None:
+        for idx in range(500):
+            UpdateExpr(Set(**{f'attr_{worker}_{idx % 50}': idx}))
+
+    try:
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(compile_shapes, range(8)))
+    finally:
+        sys.setswitchinterval(interval)
+
+    assert len(expressions._cache) <= 8
+
+
+def test_update_expr_empty():
+    assert UpdateExpr(Set(name=None)) == {
+        'update_expr': '',
+        'expr_attr_names': {},
+        'expr_attr_values': {},
+    }
+
+
+def test_update_expr_compact_placeholders():
+    expr = UpdateExpr(
+        Set(name='Bilbo Baggins'),
+        Set(score=10, operand='+'),
+        Set(attempts=if_not_exists(attempts=0) + 1),
+        Set(**{'brand.name': 'Shire'}),
+        Set(**{'tags[0]': 'python'}),
+        Add(score=Decimal(5)),
+        Remove('brand.logo[1].url'),
+        placeholders=CompactPlaceholders,
+    )
+    assert expr == {
+        'update_expr': (
+            'SET #a = :a, '
+            '#b = #b + :b, '
+            '#c = if_not_exists(#c, :c) + :d, '
+            '#d.#a = :e, '
+            '#e[0] = :f '
+            'ADD #b :g '
+            'REMOVE #d.#f[1].#g'
+        ),
+        'expr_attr_names': {
+            '#a': 'name',
+            '#b': 'score',
+            '#c': 'attempts',
+            '#d': 'brand',
+            '#e': 'tags',
+            '#f': 'logo',
+            '#g': 'url',
+        },
+        'expr_attr_values': {
+            ':a': 'Bilbo Baggins',
+            ':b': 10,
+            ':c': 0,
+            ':d': 1,
+            ':e': 'Shire',
+            ':f': 'python',
+            ':g': Decimal('5'),
+        },
+    }
+
+
+def test_compact_placeholders_tokens():
+    placeholders = CompactPlaceholders()
+    names = [placeholders.name(f'attr_{idx}') for idx in range(30)]
+
+    assert names[:3] == ['#a', '#b', '#c']
+    assert names[25:28] == ['#z', '#aa', '#ab']
+    assert len(set(names)) == 30
+
+
+def test_condition_expr():
+    cond = (
+        Attr('sk').not_exists()
+        | (Attr('version').lt(3) & Attr('status').is_in('PENDING', 'PAID'))
+        | ~Attr('name').begins_with('Bilbo')
+    ) & Attr('tags').size().between(1, 10)
+
+    assert ConditionExpr(cond) == {
+        'cond_expr': (
+            '(attribute_not_exists(#a) OR (#b < :a AND #c IN (:b, :c)) '
+            'OR NOT (begins_with(#d, :d))) '
+            'AND size(#e) BETWEEN :e AND :f'
+        ),
+        'expr_attr_names': {
+            '#a': 'sk',
+            '#b': 'version',
+            '#c': 'status',
+            '#d': 'name',
+            '#e': 'tags',
+        },
+        'expr_attr_values': {
+            ':a': 3,
+            ':b': 'PENDING',
+            ':c': 'PAID',
+            ':d': 'Bilbo',
+            ':e': 1,
+            ':f': 10,
+        },
+    }
+
+
+def test_condition_expr_compares_attributes():
+    assert ConditionExpr(Attr('updated_at').gt(Attr('created_at'))) == {
+        'cond_expr': '#a > #b',
+        'expr_attr_names': {'#a': 'updated_at', '#b': 'created_at'},
+        'expr_attr_values': {},
+    }
+
+
+def test_update_expr_with_condition():
+    expr = UpdateExpr(
+        Set(version=4),
+        Set(name='Bilbo Baggins'),
+        cond=Attr('version').eq(3),
+    )
+
+    assert expr == {
+        'update_expr': 'SET #a = :a, #b = :b',
+        'cond_expr': '#a = :c',
+        'expr_attr_names': {'#a': 'version', '#b': 'name'},
+        'expr_attr_values': {':a': 4, ':b': 'Bilbo Baggins', ':c': 3},
+    }
+
+
+def test_evaluate_lazy_item():
+    item = LazyItem(serialize({'sk': '0', 'stock': Decimal(3)}))
+
+    assert evaluate(Attr('stock').gte(1), item)
+    assert not evaluate(Attr('stock').gt(3), item)
+    assert not evaluate(Attr('sk').exists(), None)
+
+
+def test_apply_leaves_item_untouched():
+    item = {'friends': [{'name': 'Sam'}], 'n': 1}
+    expr = UpdateExpr(Set(friends=list_append(friends=[{'name': 'Pippin'}])))
+
+    assert apply(expr, item) == {
+        'friends': [{'name': 'Sam'}, {'name': 'Pippin'}],
+        'n': 1,
+    }
+    assert item == {'friends': [{'name': 'Sam'}], 'n': 1}
+
+
+def test_apply_ignores_condition():
+    expr = UpdateExpr(Set(version=2), cond=Attr('version').eq(1))
+
+    assert apply(expr, {}) == {'version': 2}
+    assert not evaluate(expr, {})
+
+
+# Every case is checked against its expected result with `apply` and
+# `evaluate`. The conformance tests also send it to DynamoDB Local, and are
+# skipped without DYNAMODB_ENDPOINT_URL: `FakeClient` evaluates expressions
+# with the same engine, so running them against it would check nothing.
+requires_dynamodb = pytest.mark.skipif(
+    not os.environ.get('DYNAMODB_ENDPOINT_URL'),
+    reason='needs DynamoDB Local, set DYNAMODB_ENDPOINT_URL',
+)
+
+KEY = {'pk': 'conformance', 'sk': '0'}
+
+UPDATES = [
+    pytest.param(Set(name='Frodo'), {}, {'name': 'Frodo'}, id='set'),
+    pytest.param(Set(n=Decimal(2), operand='+'), {'n': 3}, {'n': 5}, id='set-plus'),
+    pytest.param(
+        Set(n=Decimal('0.1'), operand='-'),
+        {'n': 1},
+        {'n': Decimal('0.9')},
+        id='set-minus',
+    ),
+    pytest.param(Set(n=1, operand='+'), {}, ExpressionError, id='set-plus-missing'),
+    pytest.param(Set(n=1, operand='+'), {'n': 'a'}, ExpressionError, id='set-plus-str'),
+    pytest.param(
+        Set(n=if_not_exists(n=0) + 1), {}, {'n': 1}, id='if-not-exists-missing'
+    ),
+    pytest.param(
+        Set(n=if_not_exists(n=0) + 1), {'n': 7}, {'n': 8}, id='if-not-exists-present'
+    ),
+    pytest.param(
+        Set(total=if_not_exists(n=10) - 1), {}, {'total': 9}, id='if-not-exists-other'
+    ),
+    pytest.param(
+        Set(friends=list_append(friends=[{'name': 'Pippin'}])),
+        {'friends': [{'name': 'Sam'}]},
+        {'friends': [{'name': 'Sam'}, {'name': 'Pippin'}]},
+        id='list-append',
+    ),
+    pytest.param(
+        Set(friends=list_append(friends=[{'name': 'Pippin'}])),
+        {},
+        ExpressionError,
+        id='list-append-missing',
+    ),
+    pytest.param(
+        Set(**{'address.city': 'Hobbiton'}),
+        {'address': {'street': 'Bagshot Row'}},
+        {'address': {'street': 'Bagshot Row', 'city': 'Hobbiton'}},
+        id='set-nested',
+    ),
+    pytest.param(
+        Set(**{'address.city': 'Hobbiton'}),
+        {},
+        ExpressionError,
+        id='set-nested-missing',
+    ),
+    pytest.param(
+        Set(**{'friends[5]': {'name': 'Pippin'}}),
+        {'friends': [{'name': 'Sam'}]},
+        {'friends': [{'name': 'Sam'}, {'name': 'Pippin'}]},
+        id='set-index-past-end',
+    ),
+    pytest.param(Add(n=Decimal(2)), {}, {'n': 2}, id='add-missing'),
+    pytest.param(Add(n=Decimal(-2)), {'n': 1}, {'n': -1}, id='add-number'),
+    pytest.param(
+        Add(emails={'b'}), {'emails': {'a'}}, {'emails': {'a', 'b'}}, id='add-set'
+    ),
+    pytest.param(Add(emails={'b'}), {'emails': 'a'}, ExpressionError, id='add-str'),
+    pytest.param(Add(ns={1}), {'ns': {'a'}}, ExpressionError, id='add-set-type'),
+    pytest.param(Remove('name'), {'name': 'Frodo'}, {}, id='remove'),
+    pytest.param(Remove('name'), {}, {}, id='remove-missing'),
+    pytest.param(
+        Remove('friends[0]'),
+        {'friends': [{'name': 'Sam'}, {'name': 'Pippin'}]},
+        {'friends': [{'name': 'Pippin'}]},
+        id='remove-index',
+    ),
+    pytest.param(
+        Delete(emails={'a'}), {'emails': {'a', 'b'}}, {'emails': {'b'}}, id='delete'
+    ),
+    pytest.param(Delete(emails={'a'}), {'emails': {'a'}}, {}, id='delete-last'),
+    pytest.param(Delete(emails={'a'}), {}, {}, id='delete-missing'),
+    pytest.param(
+        Delete(emails={'a'}), {'emails': 'a'}, ExpressionError, id='delete-str'
+    ),
+]
+
+
+@pytest.mark.parametrize(('action', 'item', 'expected'), UPDATES)
+def test_apply_cases(action, item, expected):
+    expr = UpdateExpr(action, placeholders=CompactPlaceholders)
+
+    if expected is ExpressionError:
+        with pytest.raises(ExpressionError):
+            apply(expr, KEY | item)
+    else:
+        assert apply(expr, KEY | item) == KEY | expected
+
+
+@requires_dynamodb
+@pytest.mark.parametrize(('action', 'item', 'expected'), UPDATES)
+def test_apply_conformance(dynamodb_client, action, item, expected):
+    expr = UpdateExpr(action, placeholders=CompactPlaceholders)
+
+    if expected is ExpressionError:
+        with pytest.raises(ClientError) as exc_info:
+            _update_item(dynamodb_client, expr, item)
+
+        assert exc_info.value.response['Error']['Code'] == 'ValidationException'
+    else:
+        assert _update_item(dynamodb_client, expr, item) == KEY | expected
+
+
+OVERLAPPING = UpdateExpr(
+    Set(**{'address.city': 'Hobbiton'}),
+    Remove('address'),
+    placeholders=CompactPlaceholders,
+)
+
+
+def test_apply_overlapping_paths():
+    with pytest.raises(ExpressionError):
+        apply(OVERLAPPING, KEY | {'address': {}})
+
+
+@requires_dynamodb
+def test_apply_overlapping_paths_conformance(dynamodb_client):
+    with pytest.raises(ClientError):
+        _update_item(dynamodb_client, OVERLAPPING, {'address': {}})
+
+
+ITEM = {
+    'name': 'Frodo',
+    'age': 50,
+    'height': Decimal('1.06'),
+    'emails': {'frodo@shire.me'},
+    'tags': ['hobbit', 'ring-bearer'],
+    'friends': [{'name': 'Sam'}, {'name': 'Merry'}],
+    'address': {'city': 'Hobbiton'},
+    'alive': True,
+    'nickname': None,
+}
+
+CONDITIONS = [
+    pytest.param(Attr('name').exists(), True, id='exists'),
+    pytest.param(Attr('ring').exists(), False, id='exists-missing'),
+    pytest.param(Attr('ring').not_exists(), True, id='not-exists'),
+    pytest.param(Attr('address.city').exists(), True, id='exists-nested'),
+    pytest.param(Attr('age').eq(50), True, id='eq'),
+    pytest.param(Attr('age').eq('50'), False, id='eq-other-type'),
+    pytest.param(Attr('age').ne('50'), True, id='ne-other-type'),
+    pytest.param(Attr('ring').ne(1), True, id='ne-missing'),
+    pytest.param(Attr('ring').lt(1), False, id='lt-missing'),
+    pytest.param(Attr('age').lt('60'), False, id='lt-other-type'),
+    pytest.param(Attr('height').gt(1), True, id='gt-decimal'),
+    pytest.param(Attr('name').gte('Frodo'), True, id='gte-str'),
+    pytest.param(Attr('name').lt('frodo'), True, id='lt-str-case'),
+    pytest.param(
+        Attr('tags').eq({'hobbit', 'ring-bearer'}), True, id='eq-set-unordered'
+    ),
+    pytest.param(Attr('friends[0]').eq({'name': 'Sam'}), True, id='eq-map'),
+    pytest.param(Attr('emails').eq({'frodo@shire.me'}), True, id='eq-set'),
+    pytest.param(Attr('nickname').eq(None), True, id='eq-null'),
+    pytest.param(Attr('age').between(40, 50), True, id='between'),
+    pytest.param(Attr('age').between(51, 60), False, id='between-outside'),
+    pytest.param(Attr('age').is_in(10, 50), True, id='in'),
+    pytest.param(Attr('age').is_in('50'), False, id='in-other-type'),
+    pytest.param(Attr('name').begins_with('Fro'), True, id='begins-with'),
+    pytest.param(Attr('age').begins_with('5'), False, id='begins-with-number'),
+    pytest.param(Attr('name').contains('rod'), True, id='contains-str'),
+    pytest.param(Attr('emails').contains('frodo@shire.me'), True, id='contains-set'),
+    pytest.param(Attr('tags').contains('hob'), False, id='contains-set-partial'),
+    pytest.param(Attr('friends').contains({'name': 'Sam'}), True, id='contains-list'),
+    pytest.param(Attr('age').attribute_type('N'), True, id='attribute-type'),
+    pytest.param(Attr('alive').attribute_type('S'), False, id='attribute-type-other'),
+    pytest.param(Attr('name').size().eq(5), True, id='size-str'),
+    pytest.param(Attr('tags').size().eq(2), True, id='size-set'),
+    pytest.param(Attr('friends').size().gte(2), True, id='size-list'),
+    pytest.param(Attr('address').size().eq(1), True, id='size-map'),
+    pytest.param(Attr('friends[1].name').eq('Merry'), True, id='index'),
+    pytest.param(Attr('friends[5]').exists(), False, id='index-past-end'),
+    pytest.param(Attr('age').gt(Attr('height')), True, id='compare-attrs'),
+    pytest.param(Attr('age').eq(50) & Attr('ring').exists(), False, id='and'),
+    pytest.param(Attr('age').eq(1) | Attr('name').exists(), True, id='or'),
+    pytest.param(~Attr('ring').exists(), True, id='not'),
+]
+
+
+@pytest.mark.parametrize(('cond', 'expected'), CONDITIONS)
+def test_evaluate_cases(cond, expected):
+    assert evaluate(ConditionExpr(cond), KEY | ITEM) is expected
+    assert evaluate(cond, KEY | ITEM) is expected
+
+
+@requires_dynamodb
+@pytest.mark.parametrize(('cond', 'expected'), CONDITIONS)
+def test_evaluate_conformance(dynamodb_client, cond, expected):
+    assert _conditional_put(dynamodb_client, ConditionExpr(cond), ITEM) is expected
+
+
+INVALID_OPERAND = Attr('age').size().eq(2)
+
+
+def test_evaluate_invalid_operand():
+    with pytest.raises(ExpressionError):
+        evaluate(ConditionExpr(INVALID_OPERAND), KEY | ITEM)
+
+
+@requires_dynamodb
+def test_evaluate_invalid_operand_conformance(dynamodb_client):
+    with pytest.raises(ClientError) as exc_info:
+        _conditional_put(dynamodb_client, ConditionExpr(INVALID_OPERAND), ITEM)
+
+    assert exc_info.value.response['Error']['Code'] == 'ValidationException'
+
+
+MISSING_ITEM = [
+    (Attr('sk').not_exists(), True),
+    (Attr('sk').exists(), False),
+    (Attr('version').ne(1), True),
+    (Attr('version').eq(1), False),
+]
+
+
+@pytest.mark.parametrize(('cond', 'expected'), MISSING_ITEM)
+def test_evaluate_missing_item(cond, expected):
+    assert evaluate(ConditionExpr(cond), None) is expected
+
+
+@requires_dynamodb
+@pytest.mark.parametrize(('cond', 'expected'), MISSING_ITEM)
+def test_evaluate_missing_item_conformance(dynamodb_client, cond, expected):
+    assert _conditional_put(dynamodb_client, ConditionExpr(cond), None) is expected
+
+
+def _update_item(client, expr: dict, item: dict) -> dict:
+    client.put_item(TableName='pytest', Item=serialize(KEY | item))
+    response = client.update_item(
+        TableName='pytest',
+        Key=serialize(KEY),
+        UpdateExpression=expr['update_expr'],
+        ReturnValues='ALL_NEW',
+        **_placeholders(expr),
+    )
+    return deserialize(response['Attributes'])
+
+
+def _conditional_put(client, expr: dict, item: dict | None) -> bool:
+    if item is not None:
+        client.put_item(TableName='pytest', Item=serialize(KEY | item))
+
+    try:
+        client.put_item(
+            TableName='pytest',
+            Item=serialize(KEY),
+            ConditionExpression=expr['cond_expr'],
+            **_placeholders(expr),
+        )
+    except client.exceptions.ConditionalCheckFailedException:
+        return False
+
+    return True
+
+
+def _placeholders(expr: dict) -> dict:
+    # DynamoDB rejects empty placeholder maps
+    kwargs = {}
+
+    if expr['expr_attr_names']:
+        kwargs['ExpressionAttributeNames'] = expr['expr_attr_names']
+
+    if expr['expr_attr_values']:
+        kwargs['ExpressionAttributeValues'] = serialize(expr['expr_attr_values'])
+
+    return kwargs
@@ -0,0 +1,211 @@
+import pytest
+from botocore.exceptions import ClientError
+
+from dynamodx.fake import FakeClient
+from dynamodx.types import serialize
+
+
+@pytest.fixture
+def client() -> FakeClient:
+    client = FakeClient()
+    client.create_table(
+        TableName='pytest',
+        KeySchema=[
+            {'AttributeName': 'pk', 'KeyType': 'HASH'},
+            {'AttributeName': 'sk', 'KeyType': 'RANGE'},
+        ],
+        GlobalSecondaryIndexes=[
+            {
+                'IndexName': 'gsi1',
+                'KeySchema': [
+                    {'AttributeName': 'email', 'KeyType': 'HASH'},
+                ],
+            }
+        ],
+    )
+    return client
+
+
+def test_put_and_get_item(client):
+    item = serialize({'pk': 'USER', 'sk': '0', 'name': 'Bilbo', 'tags': {'a'}})
+    client.put_item(TableName='pytest', Item=item)
+
+    response = client.get_item(
+        TableName='pytest', Key=serialize({'pk': 'USER', 'sk': '0'})
+    )
+    assert response['Item'] == item
+
+    with pytest.raises(client.exceptions.ConditionalCheckFailedException) as err:
+        client.put_item(
+            TableName='pytest',
+            Item=item,
+            ConditionExpression='attribute_not_exists(sk)',
+            ReturnValuesOnConditionCheckFailure='ALL_OLD',
+        )
+
+    assert err.value.response['Item'] == item
+
+
+def test_update_item(client):
+    key = serialize({'pk': 'USER', 'sk': '0'})
+    response = client.update_item(
+        TableName='pytest',
+        Key=key,
+        UpdateExpression='SET #n = :n, visits = if_not_exists(visits, :zero) + :one '
+        'ADD tags :tags',
+        ExpressionAttributeNames={'#n': 'name'},
+        ExpressionAttributeValues=serialize(
+            {':n': 'Bilbo', ':zero': 0, ':one': 1, ':tags': {'a', 'b'}}
+        ),
+        ReturnValues='ALL_NEW',
+    )
+
+    assert response['Attributes']['visits'] == {'N': '1'}
+    assert sorted(response['Attributes']['tags']['SS']) == ['a', 'b']
+
+    with pytest.raises(ClientError) as err:
+        client.update_item(
+            TableName='pytest',
+            Key=key,
+            UpdateExpression='SET pk = :pk',
+            ExpressionAttributeValues=serialize({':pk': 'OTHER'}),
+        )
+
+    assert err.value.response['Error']['Code'] == 'ValidationException'
+
+
+def test_rejects_unused_placeholders(client):
+    with pytest.raises(ClientError) as err:
+        client.put_item(
+            TableName='pytest',
+            Item=serialize({'pk': 'USER', 'sk': '0'}),
+            ConditionExpression='attribute_not_exists(sk)',
+            ExpressionAttributeValues=serialize({':unused': 1}),
+        )
+
+    assert 'unused in expressions' in err.value.response['Error']['Message']
+
+
+def test_transact_write_items_is_all_or_nothing(client):
+    client.put_item(TableName='pytest', Item=serialize({'pk': 'EMAIL', 'sk': 'a@b.c'}))
+
+    with pytest.raises(client.exceptions.TransactionCanceledException) as err:
+        client.transact_write_items(
+            TransactItems=[
+                {
+                    'Put': {
+                        'TableName': 'pytest',
+                        'Item': serialize({'pk': 'USER', 'sk': '0'}),
+                    }
+                },
+                {
+                    'Put': {
+                        'TableName': 'pytest',
+                        'Item': serialize({'pk': 'EMAIL', 'sk': 'a@b.c'}),
+                        'ConditionExpression': 'attribute_not_exists(sk)',
+                        'ReturnValuesOnConditionCheckFailure': 'ALL_OLD',
+                    }
+                },
+            ]
+        )
+
+    assert err.value.response['CancellationReasons'] == [
+        {'Code': 'None'},
+        {
+            'Code': 'ConditionalCheckFailed',
+            'Message': 'The conditional request failed',
+            'Item': {'pk': {'S': 'EMAIL'}, 'sk': {'S': 'a@b.c'}},
+        },
+    ]
+    assert 'Item' not in client.get_item(
+        TableName='pytest', Key=serialize({'pk': 'USER', 'sk': '0'})
+    )
+
+
+def test_transact_write_items_is_idempotent(client):
+    request = {
+        'TransactItems': [
+            {
+                'Update': {
+                    'TableName': 'pytest',
+                    'Key': serialize({'pk': 'COUNTER', 'sk': '0'}),
+                    'UpdateExpression': 'ADD hits :one',
+                    'ExpressionAttributeValues': serialize({':one': 1}),
+                }
+            }
+        ],
+        'ClientRequestToken': 'token',
+    }
+    client.transact_write_items(**request)
+    client.transact_write_items(**request)
+
+    item = client.get_item(
+        TableName='pytest', Key=serialize({'pk': 'COUNTER', 'sk': '0'})
+    )
+    assert item['Item']['hits'] == {'N': '1'}
+
+
+def test_query(client):
+    client.batch_write_item(
+        RequestItems={
+            'pytest': [
+                {'PutRequest': {'Item': serialize({'pk': 'USER', 'sk': str(idx)})}}
+                for idx in range(10)
+            ]
+        }
+    )
+    request = {
+        'TableName': 'pytest',
+        'KeyConditionExpression': 'pk = :pk AND sk BETWEEN :low AND :high',
+        'FilterExpression': 'sk <> :skip',
+        'ExpressionAttributeValues': serialize(
+            {':pk': 'USER', ':low': '2', ':high': '7', ':skip': '5'}
+        ),
+        'ScanIndexForward': False,
+        'Limit': 4,
+    }
+
+    first = client.query(**request)
+    second = client.query(**request, ExclusiveStartKey=first['LastEvaluatedKey'])
+
+    assert [item['sk']['S'] for item in first['Items']] == ['7', '6', '4']
+    assert first['ScannedCount'] == 4
+    assert [item['sk']['S'] for item in second['Items']] == ['3', '2']
+    assert 'LastEvaluatedKey' not in second
+
+
+def test_query_index(client):
+    client.put_item(
+        TableName='pytest',
+        Item=serialize({'pk': 'USER', 'sk': '0', 'email': 'a@b.c'}),
+    )
+
+    response = client.query(
+        TableName='pytest',
+        IndexName='gsi1',
+        KeyConditionExpression='email = :email',
+        ExpressionAttributeValues=serialize({':email': 'a@b.c'}),
+        ProjectionExpression='pk',
+    )
+
+    assert response['Items'] == [{'pk': {'S': 'USER'}}]
+
+
+def test_scan_segments(client):
+    for idx in range(50):
+        client.put_item(TableName='pytest', Item=serialize({'pk': str(idx), 'sk': '0'}))
+
+    items = [
+        item
+        for segment in range(3)
+        for item in client.scan(TableName='pytest', Segment=segment, TotalSegments=3)[
+            'Items'
+        ]
+    ]
+
+    assert len(items) == 50
+
+
+def test_missing_table(client):
+    with pytest.raises(client.exceptions.ResourceNotFoundException):
+        client.get_item(TableName='missing', Key=serialize({'pk': 'USER', 'sk': '0'}))
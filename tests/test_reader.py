@@ -0,0 +1,122 @@
+import pytest
+
+from dynamodx.expressions import Attr
+from dynamodx.reader import Query, Scan
+from dynamodx.types import LazyItem, serialize
+
+
+def test_query(dynamodb_client, dynamodb_seeds):
+    pages = []
+    query = Query(
+        'pytest',
+        Attr('pk').eq('f966f7e5-a9d3-4d0f-8219-dfc12602bffd')
+        & Attr('sk').begins_with('EMAIL#'),
+        client=dynamodb_client,
+        on_page=pages.append,
+    )
+
+    assert [item['sk'] for item in query] == ['EMAIL#bilbo@baggins.com']
+    assert pages[0]['consumed_capacity']['TableName'] == 'pytest'
+
+
+class PagedClient:
+    """Serves `items` in pages of `page_size`, split by `Segment` if given."""
+
+    def __init__(self, items: list[dict], page_size: int) -> None:
+        self.items = [serialize(item) for item in items]
+        self.page_size = page_size
+        self.calls: list[dict] = []
+
+    def query(self, **kwargs) -> dict:
+        self.calls.append(kwargs)
+        return self._page(self.items, kwargs)
+
+    def scan(self, **kwargs) -> dict:
+        self.calls.append(kwargs)
+        segment = kwargs.get('Segment', 0)
+        total = kwargs.get('TotalSegments', 1)
+        return self._page(self.items[segment::total], kwargs)
+
+    def _page(self, items: list[dict], kwargs: dict) -> dict:
+        start = kwargs.get('ExclusiveStartKey', {}).get('idx', 0)
+        page = items[start : start + self.page_size]
+        response: dict = {
+            'Items': page,
+            'Count': len(page),
+            'ScannedCount': len(page),
+            'ConsumedCapacity': {'TableName': kwargs['TableName'], 'CapacityUnits': 1},
+        }
+
+        if start + self.page_size < len(items):
+            response['LastEvaluatedKey'] = {'idx': start + self.page_size}
+
+        return response
+
+
+def test_query_pages():
+    client = PagedClient([{'pk': 'USER', 'sk': str(idx)} for idx in range(25)], 10)
+    pages = []
+    query = Query(
+        'pytest',
+        Attr('pk').eq('USER'),
+        client=client,  # type: ignore
+        filter_expr=Attr('name').not_exists(),
+        projection=['sk'],
+        on_page=pages.append,
+    )
+
+    assert [item['sk'] for item in query] == [str(idx) for idx in range(25)]
+    assert [page['count'] for page in pages] == [10, 10, 5]
+    assert client.calls[0]['KeyConditionExpression'] == '#a = :a'
+    assert client.calls[0]['FilterExpression'] == 'attribute_not_exists(#b)'
+    assert client.calls[0]['ProjectionExpression'] == '#c'
+    assert client.calls[0]['ExpressionAttributeNames'] == {
+        '#a': 'pk',
+        '#b': 'name',
+        '#c': 'sk',
+    }
+    assert client.calls[0]['ExpressionAttributeValues'] == {':a': {'S': 'USER'}}
+
+
+def test_scan_segments():
+    client = PagedClient([{'pk': 'USER', 'sk': str(idx)} for idx in range(100)], 7)
+    scan = Scan('pytest', client=client, segments=4, lazy=True)  # type: ignore
+    items = list(scan)
+
+    assert all(isinstance(item, LazyItem) for item in items)
+    assert sorted(int(item['sk']) for item in items) == list(range(100))
+    assert {call['Segment'] for call in client.calls} == {0, 1, 2, 3}
+
+
+def test_scan_pages_with_stats():
+    client = PagedClient([{'pk': 'USER', 'sk': str(idx)} for idx in range(100)], 7)
+    scan = Scan('pytest', client=client, segments=4)  # type: ignore
+    segments: dict[int, set] = {}
+
+    for stats, page in scan.pages_with_stats():
+        assert stats['count'] == len(page)
+        segments.setdefault(stats['segment'], set()).update(
+            int(item['sk']) for item in page
+        )
+
+    assert segments == {segment: set(range(100)[segment::4]) for segment in range(4)}
+
+
+def test_scan_stops_early():
+    client = PagedClient([{'pk': 'USER', 'sk': str(idx)} for idx in range(100)], 1)
+    scan = Scan('pytest', client=client, max_buffered_pages=1)  # type: ignore
+
+    for _ in scan:
+        break
+
+    # The worker stops once it can't hand over more pages
+    assert len(client.calls) <= 3
+
+
+def test_scan_raises_errors():
+    class FailingClient:
+        def scan(self, **kwargs) -> dict:
+            raise RuntimeError('Boom')
+
+    with pytest.raises(RuntimeError):
+        list(Scan('pytest', client=FailingClient()))  # type: ignore
@@ -0,0 +1,45 @@
+import pytest
+
+from dynamodx.recording import RecordingClient, read_log
+from dynamodx.transact_writer import TransactWriter
+
+
+class Client:
+    class exceptions:
+        class TransactionCanceledException(Exception): ...
+
+    def transact_write_items(self, **kwargs) -> dict:
+        return {}
+
+    def get_item(self, **kwargs) -> dict:
+        raise KeyError('Boom')
+
+
+def test_recording_client(tmp_path):
+    path = str(tmp_path / 'traffic.jsonl.gz')
+
+    with RecordingClient(Client(), path) as client:
+        with TransactWriter('pytest', client=client) as transact:  # type: ignore
+            transact.put(item={'pk': 'USER', 'sk': '0', 'avatar': b'\x89PNG'})
+
+        try:
+            client.get_item(TableName='pytest', Key={})
+        except KeyError:
+            pass
+
+    write, get = read_log(path)
+    assert write['op'] == 'transact_write_items'
+    assert write['error'] is None
+    assert write['params']['TransactItems'][0]['Put']['Item']['avatar'] == {
+        'B': b'\x89PNG'
+    }
+    assert get['op'] == 'get_item'
+    assert get['error'] == 'KeyError'
+
+
+def test_recording_client_keeps_error_after_close(tmp_path):
+    client = RecordingClient(Client(), str(tmp_path / 'traffic.jsonl'))
+    client.close()
+
+    with pytest.raises(KeyError):
+        client.get_item(TableName='pytest', Key={})
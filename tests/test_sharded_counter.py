@@ -0,0 +1,127 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from dynamodx.async_transact_writer import AsyncTransactWriter
+from dynamodx.sharded_counter import ShardedCounter
+from dynamodx.transact_writer import TransactWriter
+from dynamodx.write_behind import WriteBehindBuffer
+
+KEY = {'pk': 'STATS', 'sk': 'VISITS'}
+
+
+def shard_items(client) -> dict:
+    items = client.query(
+        TableName='pytest',
+        KeyConditionExpression='pk = :pk',
+        ExpressionAttributeValues={':pk': {'S': 'STATS'}},
+    )['Items']
+    return {item['sk']['S']: int(item['total']['N']) for item in items}
+
+
+def test_add_and_value(dynamodb_client):
+    counter = ShardedCounter(
+        'pytest',
+        KEY,
+        client=dynamodb_client,
+        shards=4,
+        strategy='round_robin',
+    )
+
+    for _ in range(8):
+        counter.add(1)
+
+    counter.add(-3)
+
+    assert counter.value() == 5
+    assert shard_items(dynamodb_client) == {
+        'VISITS#0': -1,
+        'VISITS#1': 2,
+        'VISITS#2': 2,
+        'VISITS#3': 2,
+    }
+
+
+def test_add_through_writers(dynamodb_client):
+    counter = ShardedCounter('pytest', KEY, client=dynamodb_client, shards=3)
+
+    with TransactWriter('pytest', client=dynamodb_client) as transact:
+        counter.add(2, transact=transact)
+        transact.put({'pk': 'USER', 'sk': '0'})
+
+    with WriteBehindBuffer('pytest', client=dynamodb_client) as buffer:
+        for _ in range(10):
+            counter.add(1, transact=buffer)
+
+    assert counter.value(consistent_read=True) == 12
+
+
+def test_add_through_async_writer(dynamodb_client):
+    counter = ShardedCounter('pytest', KEY, client=dynamodb_client, shards=3)
+
+    async def main():
+        async with AsyncTransactWriter(
+            'pytest', client=dynamodb_client, flush_amount=2
+        ) as transact:
+            for _ in range(5):
+                await counter.add(1, transact=transact)
+
+    asyncio.run(main())
+
+    assert counter.value(consistent_read=True) == 5
+
+
+def test_reshard(dynamodb_client):
+    counter = ShardedCounter(
+        'pytest',
+        KEY,
+        client=dynamodb_client,
+        shards=2,
+        strategy='round_robin',
+    )
+
+    for _ in range(4):
+        counter.add(1)
+
+    counter.reshard(6)
+    assert counter.shards == 6
+
+    for _ in range(6):
+        counter.add(1)
+
+    assert counter.value() == 10
+    assert len(shard_items(dynamodb_client)) == 6
+
+    counter.reshard(4)
+    assert counter.value() == 10
+    assert shard_items(dynamodb_client) == {
+        'VISITS#0': 4,
+        'VISITS#1': 4,
+        'VISITS#2': 1,
+        'VISITS#3': 1,
+    }
+
+
+def test_reshard_with_concurrent_writers(dynamodb_client):
+    counter = ShardedCounter('pytest', KEY, client=dynamodb_client, shards=8)
+    # A writer still using the old shard count
+    writer = ShardedCounter('pytest', KEY, client=dynamodb_client, shards=8)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [executor.submit(writer.add, 1) for _ in range(200)]
+        counter.reshard(2)
+
+        for future in futures:
+            future.result()
+
+    assert counter.value() == 200
+
+    counter.reshard(2)
+    assert counter.value() == 200
+    assert set(shard_items(dynamodb_client)) == {'VISITS#0', 'VISITS#1'}
+
+
+def test_invalid_shards(dynamodb_client):
+    with pytest.raises(ValueError):
+        ShardedCounter('pytest', KEY, client=dynamodb_client, shards=0)
@@ -1,10 +1,14 @@
 import pytest
 
+from dynamodx.expressions import Attr, Set, UpdateExpr, if_not_exists
 from dynamodx.transact_writer import (
+    ItemTooLargeError,
+    RetryPolicy,
     TransactionCanceledException,
     TransactionOperationFailed,
     TransactWriter,
 )
+from dynamodx.types import Serialized, serialize
 
 
 def test_transact_write_items(
@@ -78,3 +82,342 @@ def test_when_fail_fast_disabled(
             )
 
     assert len(err.value.reasons) == 2
+
+
+def test_transact_write_items_with_expressions(
+    dynamodb_seeds,
+    dynamodb_client,
+):
+    user_id = 'f966f7e5-a9d3-4d0f-8219-dfc12602bffd'
+
+    with TransactWriter('pytest', client=dynamodb_client) as transact:
+        transact.update(
+            {'pk': user_id, 'sk': '0'},
+            UpdateExpr(Set(name='Frodo Baggins')),
+            cond_expr=Attr('name').eq('Bilbo Baggins'),
+        )
+        transact.condition(
+            {'pk': 'EMAIL', 'sk': 'bilbo@baggins.com'},
+            Attr('user_id').eq(user_id),
+        )
+
+    item = dynamodb_client.get_item(
+        TableName='pytest',
+        Key={'pk': {'S': user_id}, 'sk': {'S': '0'}},
+    )
+    assert item['Item']['name'] == {'S': 'Frodo Baggins'}
+
+    with pytest.raises(TransactionOperationFailed) as err:
+        with TransactWriter('pytest', client=dynamodb_client) as transact:
+            transact.put(
+                item={'pk': 'EMAIL', 'sk': 'bilbo@baggins.com'},
+                cond_expr=Attr('sk').not_exists(),
+                return_on_cond_fail='ALL_OLD',
+            )
+
+    assert err.value.reason['old_item']['user_id'] == user_id
+
+
+def test_transact_write_serialized_items(dynamodb_client):
+    item = Serialized({'pk': {'S': 'USER'}, 'sk': {'S': '0'}, 'age': {'N': '111'}})
+
+    with TransactWriter('pytest', client=dynamodb_client) as transact:
+        transact.put(item)
+        transact.update(
+            Serialized({'pk': {'S': 'USER'}, 'sk': {'S': '1'}}),
+            'SET #age = :age',
+            expr_attr_names={'#age': 'age'},
+            expr_attr_values={':age': Serialized({'N': '112'})},
+        )
+
+    assert (
+        dynamodb_client.get_item(
+            TableName='pytest',
+            Key={'pk': {'S': 'USER'}, 'sk': {'S': '0'}},
+        )['Item']
+        == item
+    )
+
+
+def test_transact_write_serialized_values_with_expressions(dynamodb_client):
+    key = {'pk': 'USER', 'sk': '0'}
+    dynamodb_client.put_item(TableName='pytest', Item=serialize(key | {'age': 3}))
+
+    with TransactWriter('pytest', client=dynamodb_client) as transact:
+        transact.update(
+            key,
+            UpdateExpr(Set(name='Alice')),
+            cond_expr='#age < :max',
+            expr_attr_names={'#age': 'age'},
+            expr_attr_values=Serialized({':max': {'N': '5'}}),
+        )
+
+    item = dynamodb_client.get_item(TableName='pytest', Key=serialize(key))['Item']
+    assert item['name'] == {'S': 'Alice'}
+
+
+def test_transact_write_items_combines_update_conditions(dynamodb_client):
+    key = {'pk': 'USER', 'sk': '0'}
+    dynamodb_client.put_item(TableName='pytest', Item=serialize(key | {'age': 3}))
+    update_expr = UpdateExpr(Set(name='Alice'), cond=Attr('age').lt(5))
+
+    with pytest.raises(TransactionOperationFailed):
+        with TransactWriter('pytest', client=dynamodb_client) as transact:
+            transact.update(key, update_expr, cond_expr=Attr('age').gt(3))
+
+    with TransactWriter('pytest', client=dynamodb_client) as transact:
+        transact.update(key, update_expr, cond_expr=Attr('age').gt(2))
+
+    item = dynamodb_client.get_item(TableName='pytest', Key=serialize(key))['Item']
+    assert item['name'] == {'S': 'Alice'}
+
+    with pytest.raises(ValueError):
+        with TransactWriter('pytest', client=dynamodb_client) as transact:
+            transact.update(key, update_expr, cond_expr='attribute_exists(pk)')
+
+
+@pytest.mark.parametrize('ordered', [True, False])
+def test_transact_write_items_in_parallel(dynamodb_client, ordered):
+    with TransactWriter(
+        'pytest',
+        client=dynamodb_client,
+        flush_amount=10,
+        max_workers=4,
+        ordered=ordered,
+    ) as transact:
+        for idx in range(100):
+            transact.put(item={'pk': 'USER', 'sk': str(idx)})
+
+    items = dynamodb_client.query(
+        TableName='pytest',
+        KeyConditionExpression='pk = :pk',
+        ExpressionAttributeValues={':pk': {'S': 'USER'}},
+    )['Items']
+    assert len(items) == 100
+
+
+def test_transact_write_items_in_parallel_fails(
+    dynamodb_seeds,
+    dynamodb_client,
+):
+    class EmailConflictError(TransactionOperationFailed):
+        pass
+
+    with pytest.raises(EmailConflictError) as err:
+        with TransactWriter(
+            'pytest',
+            client=dynamodb_client,
+            flush_amount=5,
+            max_workers=4,
+        ) as transact:
+            for idx in range(20):
+                transact.put(item={'pk': 'USER', 'sk': str(idx)})
+
+            transact.put(
+                item={'pk': 'EMAIL', 'sk': 'bilbo@baggins.com'},
+                cond_expr='attribute_not_exists(sk)',
+                return_on_cond_fail='ALL_OLD',
+                exc_cls=EmailConflictError,
+            )
+
+    assert err.value.reason['old_item']['user_id'] == (
+        'f966f7e5-a9d3-4d0f-8219-dfc12602bffd'
+    )
+
+
+def test_transact_write_items_retries_transient_cancellations(transact_client):
+    client = transact_client(conflicts=2)
+
+    with TransactWriter(
+        'pytest',
+        client=client,  # type: ignore
+        retry=RetryPolicy(max_attempts=3),
+    ) as transact:
+        transact.put(item={'pk': 'USER', 'sk': '0'})
+        transact.put(item={'pk': 'USER', 'sk': '1'})
+
+    assert len(client.calls) == 3
+    # The same idempotency token is sent on every attempt
+    assert len({call['ClientRequestToken'] for call in client.calls}) == 1
+
+
+def test_transact_write_items_gives_up_retrying(transact_client):
+    client = transact_client(code='ThrottlingError', conflicts=10)
+
+    with pytest.raises(TransactionOperationFailed) as err:
+        with TransactWriter(
+            'pytest',
+            client=client,  # type: ignore
+            retry=RetryPolicy(max_attempts=3),
+        ) as transact:
+            transact.put(item={'pk': 'USER', 'sk': '0'})
+            transact.put(item={'pk': 'USER', 'sk': '1'})
+
+    assert len(client.calls) == 3
+    assert err.value.reason['code'] == 'ThrottlingError'
+
+
+def test_transact_write_items_never_retries_failed_conditions(transact_client):
+    client = transact_client(code='ConditionalCheckFailed', conflicts=1)
+
+    with pytest.raises(TransactionOperationFailed):
+        with TransactWriter(
+            'pytest',
+            client=client,  # type: ignore
+            retry=RetryPolicy(),
+        ) as transact:
+            transact.put(item={'pk': 'USER', 'sk': '0'})
+            transact.put(item={'pk': 'USER', 'sk': '1'})
+
+    assert len(client.calls) == 1
+
+
+def test_transact_write_items_packs_chunks_by_size(transact_client):
+    client = transact_client()
+    large = 'x' * 300 * 1024
+
+    with TransactWriter('pytest', client=client) as transact:  # type: ignore
+        for idx in range(120):
+            transact.put(item={'pk': 'USER', 'sk': str(idx)})
+
+        # 15 items of ~300 KB don't fit in a single 4 MB request
+        for idx in range(15):
+            transact.put(item={'pk': 'LARGE', 'sk': str(idx), 'data': large})
+
+    assert [len(call['TransactItems']) for call in client.calls] == [100, 33, 2]
+
+
+def test_transact_write_items_rejects_large_items(transact_client):
+    client = transact_client()
+
+    with pytest.raises(ItemTooLargeError) as err:
+        with TransactWriter('pytest', client=client) as transact:  # type: ignore
+            transact.put(item={'pk': 'USER', 'sk': '0', 'data': 'x' * 400 * 1024})
+
+    assert err.value.size > 400 * 1024
+    assert client.calls == []
+
+
+def test_transact_write_items_coalesces_same_key(transact_client):
+    client = transact_client()
+
+    with TransactWriter('pytest', client=client) as transact:  # type: ignore
+        transact.put(item={'pk': 'USER', 'sk': '0', 'name': 'Alice'})
+        transact.update(
+            key={'pk': 'USER', 'sk': '0'},
+            update_expr=UpdateExpr(Set(name='Bob'), Set(age=30)),
+        )
+        transact.update(
+            key={'pk': 'USER', 'sk': '1'},
+            update_expr=UpdateExpr(Set(name='Carol')),
+            cond_expr=Attr('pk').exists(),
+        )
+        transact.update(
+            key={'pk': 'USER', 'sk': '1'},
+            update_expr=UpdateExpr(Set(age=40)),
+        )
+
+    (call,) = client.calls
+    put, update = call['TransactItems']
+    assert put['Put']['Item'] == {
+        'pk': {'S': 'USER'},
+        'sk': {'S': '0'},
+        'name': {'S': 'Bob'},
+        'age': {'N': '30'},
+    }
+    assert update['Update']['UpdateExpression'] == 'SET #a = :a, #b = :b'
+    assert update['Update']['ConditionExpression'] == 'attribute_exists(#c)'
+    assert update['Update']['ExpressionAttributeNames'] == {
+        '#a': 'name',
+        '#b': 'age',
+        '#c': 'pk',
+    }
+
+
+def test_transact_write_items_keeps_dependent_updates_apart(dynamodb_client):
+    key = {'pk': 'USER', 'sk': '0'}
+
+    with TransactWriter('pytest', client=dynamodb_client) as transact:
+        transact.update(key, UpdateExpr(Set(a=1)))
+        # Reads `a` as written by the update before it
+        transact.update(key, UpdateExpr(Set(b=if_not_exists(a=0))))
+
+    item = dynamodb_client.get_item(TableName='pytest', Key=serialize(key))['Item']
+    assert item['b'] == {'N': '1'}
+
+
+def test_transact_write_items_never_merges_key_updates(dynamodb_client):
+    with pytest.raises(TransactionOperationFailed):
+        with TransactWriter('pytest', client=dynamodb_client) as transact:
+            transact.put(item={'pk': 'USER', 'sk': '0', 'name': 'Alice'})
+            transact.update(
+                key={'pk': 'USER', 'sk': '0'},
+                update_expr=UpdateExpr(Set(sk='1')),
+            )
+
+    items = dynamodb_client.scan(TableName='pytest')['Items']
+    assert [item['sk'] for item in items] == [{'S': '0'}]
+
+
+def test_transact_write_items_defers_same_key(transact_client):
+    client = transact_client()
+
+    with TransactWriter('pytest', client=client) as transact:  # type: ignore
+        transact.put(item={'pk': 'USER', 'sk': '0'})
+        transact.delete(key={'pk': 'USER', 'sk': '0'})
+        transact.put(item={'pk': 'USER', 'sk': '0', 'name': 'Alice'})
+        transact.put(item={'pk': 'USER', 'sk': '1'})
+
+    assert [
+        [next(iter(op)) for op in call['TransactItems']] for call in client.calls
+    ] == [['Put', 'Put'], ['Delete'], ['Put']]
+
+
+def test_transact_write_items_reports_flush_stats(transact_client):
+    client = transact_client(conflicts=1)
+    stats = []
+
+    with TransactWriter(
+        'pytest',
+        client=client,  # type: ignore
+        retry=RetryPolicy(),
+        on_flush=stats.append,
+    ) as transact:
+        transact.put(item={'pk': 'USER', 'sk': '0'})
+        transact.put(item={'pk': 'USER', 'sk': '1'})
+
+    (flush,) = stats
+    assert flush['operations'] == 2
+    assert flush['attempts'] == 2
+    assert flush['cancellation_codes'] == ['TransactionConflict']
+    assert flush['committed']
+    assert flush['payload_bytes'] > 0
+    assert flush['elapsed'] >= flush['network_time']
+    assert client.calls[0]['ReturnConsumedCapacity'] == 'INDEXES'
+
+
+def test_transact_write_items_reports_consumed_wcu(transact_client):
+    class Client(transact_client):
+        def transact_write_items(self, **kwargs) -> dict:
+            super().transact_write_items(**kwargs)
+            return {
+                'ConsumedCapacity': [
+                    {
+                        'TableName': 'pytest',
+                        'CapacityUnits': 6.0,
+                        'Table': {'CapacityUnits': 4.0},
+                        'GlobalSecondaryIndexes': {'gsi1': {'CapacityUnits': 2.0}},
+                    }
+                ]
+            }
+
+    stats = []
+
+    with TransactWriter(
+        'pytest',
+        client=Client(),  # type: ignore
+        on_flush=stats.append,
+    ) as transact:
+        transact.put(item={'pk': 'USER', 'sk': '0'})
+
+    assert stats[0]['consumed_wcu'] == {'pytest': 4.0, 'pytest/gsi1': 2.0}
@@ -0,0 +1,422 @@
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from enum import Enum, StrEnum
+from ipaddress import IPv4Address
+from typing import Any, Literal, NotRequired, TypedDict
+from uuid import UUID
+
+import pytest
+from boto3.dynamodb.types import Binary
+
+from dynamodx.types import (
+    LazyItem,
+    Serialized,
+    _serialize_to_basic_types,
+    attribute_value_size,
+    deserialize,
+    deserializer,
+    item_size,
+    register,
+    serialize,
+    serializer,
+)
+
+
+class Color(StrEnum):
+    RED = 'red'
+
+
+class Size(Enum):
+    SMALL = 1
+
+
+def _reference(data: dict) -> dict:
+    return {
+        k: serializer.serialize(_serialize_to_basic_types(v)) for k, v in data.items()
+    }
+
+
+@pytest.mark.parametrize(
+    'value',
+    [
+        None,
+        True,
+        False,
+        0,
+        -12,
+        10**37,
+        Decimal('1.50'),
+        Decimal('-0.000001'),
+        '',
+        'Bilbo Baggins',
+        Color.RED,
+        b'\x00\x01',
+        Binary(b'\x02'),
+        datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc),
+        date(2024, 1, 2),
+        UUID('ff05221a-1c30-486c-8750-d9f27d152e62'),
+        IPv4Address('127.0.0.1'),
+        [],
+        (),
+        set(),
+        ['a', 'b', 'a'],
+        (1, 2, Decimal('3.5')),
+        [b'a', b'b'],
+        [date(2024, 1, 2), 'x'],
+        [UUID('ff05221a-1c30-486c-8750-d9f27d152e62')],
+        {'a', 'b'},
+        {1, 2, 3},
+        {True, 2},
+        [True, False],
+        [{'a': 1}, 'b'],
+        [[1, 2], [3]],
+        [(), 'a'],
+        [{1, 2}, 'a'],
+        [bytearray(b'a')],
+        {'name': 'Bilbo', 'tags': ['a', 'b'], 'nested': {'at': date(2024, 1, 2)}},
+        {'deep': {'deeper': {'deepest': [{'id': 1}, {'id': 2}]}}},
+    ],
+)
+def test_serialize_parity(value):
+    assert serialize({'value': value}) == _reference({'value': value})
+
+
+@pytest.mark.parametrize(
+    'value',
+    [
+        1.5,
+        [1.5],
+        ['a', 1],
+        [None],
+        {'a': 1.5},
+        [{'a': 1}, 1.5],
+        Decimal('Infinity'),
+        Size.SMALL,
+    ],
+)
+def test_serialize_parity_errors(value):
+    with pytest.raises(TypeError):
+        _reference({'value': value})
+
+    with pytest.raises(TypeError):
+        serialize({'value': value})
+
+
+def test_serialize():
+    assert serialize(
+        {
+            'pk': 'USER',
+            'sk': UUID('ff05221a-1c30-486c-8750-d9f27d152e62'),
+            'age': 111,
+            'emails': ['bilbo@baggins.com'],
+            'address': {'city': 'Hobbiton', 'zip': None},
+        }
+    ) == {
+        'pk': {'S': 'USER'},
+        'sk': {'S': 'ff05221a-1c30-486c-8750-d9f27d152e62'},
+        'age': {'N': '111'},
+        'emails': {'SS': ['bilbo@baggins.com']},
+        'address': {'M': {'city': {'S': 'Hobbiton'}, 'zip': {'NULL': True}}},
+    }
+
+
+def test_deserialize_parity():
+    data = serialize(
+        {
+            'pk': 'USER',
+            'age': 111,
+            'price': Decimal('9.99'),
+            'active': True,
+            'deleted_at': None,
+            'avatar': b'\x00',
+            'emails': {'bilbo@baggins.com', 'baggins@bilbo.com'},
+            'scores': {1, 2},
+            'keys': {b'a', b'b'},
+            'address': {'city': 'Hobbiton', 'tags': [{'id': 1}, 'a']},
+        }
+    )
+    assert deserialize(data) == {
+        k: deserializer.deserialize(v) for k, v in data.items()
+    }
+
+
+def test_deserialize_exact_numbers():
+    data = {
+        'count': {'N': '10'},
+        'ratio': {'N': '0.5'},
+        'price': {'N': '9.99'},
+        'scores': {'NS': ['1', '2.25']},
+        'nested': {'L': [{'N': '3'}]},
+    }
+    assert deserialize(data, number='exact') == {
+        'count': 10,
+        'ratio': 0.5,
+        'price': Decimal('9.99'),
+        'scores': {1, 2.25},
+        'nested': [3],
+    }
+
+
+def test_lazy_item():
+    data = serialize({'pk': 'USER', 'sk': '0', 'address': {'city': 'Hobbiton'}})
+    item = LazyItem(data)
+
+    assert len(item) == 3
+    assert list(item) == ['pk', 'sk', 'address']
+    assert 'address' in item
+    assert item.raw is data
+    assert item._cache == {}
+
+    assert item['address'] == {'city': 'Hobbiton'}
+    assert item['address'] is item['address']
+    assert item._cache == {'address': {'city': 'Hobbiton'}}
+    assert item.get('missing') is None
+    assert item == {'pk': 'USER', 'sk': '0', 'address': {'city': 'Hobbiton'}}
+
+    with pytest.raises(KeyError):
+        item['missing']
+
+
+def test_lazy_item_exact_numbers():
+    item = LazyItem({'count': {'N': '10'}}, number='exact')
+    assert item['count'] == 10
+    assert type(item['count']) is int
+
+
+class Address(TypedDict):
+    city: str
+    zip: str | None
+
+
+class User(TypedDict):
+    pk: str
+    sk: str
+    age: int
+    score: Decimal
+    ratio: float
+    active: bool
+    color: Color
+    created_at: datetime
+    birthday: date
+    user_id: UUID
+    ip: IPv4Address
+    emails: set[str]
+    scores: set[int]
+    tags: list[str]
+    address: Address
+    meta: dict[str, int]
+    extra: Any
+    nickname: NotRequired[str]
+
+
+@dataclass
+class Order:
+    pk: str
+    sk: str
+    items: list['OrderItem']
+    status: Literal['PENDING', 'PAID'] = 'PENDING'
+    notes: str | None = None
+
+
+@dataclass
+class OrderItem:
+    sku: str
+    quantity: int
+
+
+def test_register_typeddict():
+    codec = register(User)
+    assert register(User) is codec
+
+    user = User(
+        pk='USER',
+        sk='0',
+        age=111,
+        score=Decimal('9.5'),
+        ratio=0.25,
+        active=True,
+        color=Color.RED,
+        created_at=datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc),
+        birthday=date(2024, 1, 2),
+        user_id=UUID('ff05221a-1c30-486c-8750-d9f27d152e62'),
+        ip=IPv4Address('127.0.0.1'),
+        emails={'bilbo@baggins.com'},
+        scores=set(),
+        tags=['a', 'a'],
+        address={'city': 'Hobbiton', 'zip': None},
+        meta={'visits': 1},
+        extra=[{'n': 1}, 'a'],
+    )
+    item = codec.encode(user)
+
+    assert item == {
+        'pk': {'S': 'USER'},
+        'sk': {'S': '0'},
+        'age': {'N': '111'},
+        'score': {'N': '9.5'},
+        'ratio': {'N': '0.25'},
+        'active': {'BOOL': True},
+        'color': {'S': 'red'},
+        'created_at': {'S': '2024-01-02T03:04:05+00:00'},
+        'birthday': {'S': '2024-01-02'},
+        'user_id': {'S': 'ff05221a-1c30-486c-8750-d9f27d152e62'},
+        'ip': {'S': '127.0.0.1'},
+        'emails': {'SS': ['bilbo@baggins.com']},
+        'scores': {'L': []},
+        'tags': {'L': [{'S': 'a'}, {'S': 'a'}]},
+        'address': {'M': {'city': {'S': 'Hobbiton'}, 'zip': {'NULL': True}}},
+        'meta': {'M': {'visits': {'N': '1'}}},
+        'extra': {'L': [{'M': {'n': {'N': '1'}}}, {'S': 'a'}]},
+    }
+    assert codec.decode(item) == user
+    assert codec.decode(item | {'nickname': {'S': 'bilbo'}})['nickname'] == 'bilbo'
+    assert codec.encode(user | {'nickname': 'bilbo'})['nickname'] == {'S': 'bilbo'}
+
+
+def test_register_dataclass():
+    codec = register(Order)
+    order = Order('ORDER', '1', [OrderItem('ring', 1)])
+
+    item = codec.encode(order)
+    assert item == {
+        'pk': {'S': 'ORDER'},
+        'sk': {'S': '1'},
+        'items': {'L': [{'M': {'sku': {'S': 'ring'}, 'quantity': {'N': '1'}}}]},
+        'status': {'S': 'PENDING'},
+        'notes': {'NULL': True},
+    }
+    assert codec.decode(item) == order
+    assert (
+        codec.decode({k: v for k, v in item.items() if k not in ('status', 'notes')})
+        == order
+    )
+
+
+@dataclass
+class Node:
+    name: str
+    children: list['Node']
+
+
+class Category(TypedDict):
+    name: str
+    parent: 'Category | None'
+
+
+def test_register_self_referencing():
+    codec = register(Node)
+    tree = Node('root', [Node('leaf', []), Node('branch', [Node('leaf', [])])])
+    item = codec.encode(tree)
+
+    assert item['children']['L'][1]['M']['children']['L'][0] == {
+        'M': {'name': {'S': 'leaf'}, 'children': {'L': []}}
+    }
+    assert codec.decode(item) == tree
+
+    category = Category(name='rings', parent=Category(name='jewelry', parent=None))
+    assert register(Category).decode(register(Category).encode(category)) == category
+
+
+class Parent(TypedDict):
+    child: 'Child'
+    values: list[object]
+
+
+class Child(TypedDict):
+    parent: Parent
+
+
+def test_register_rolls_back_failed_recursion():
+    with pytest.raises(TypeError, match='Parent.values'):
+        register(Parent)
+
+    # Not left holding the placeholder of the parent that failed
+    with pytest.raises(TypeError, match='Parent.values'):
+        register(Child)
+
+
+class Email(str):
+    pass
+
+
+class Quantity(int):
+    pass
+
+
+class Price(Decimal):
+    pass
+
+
+class Listing(TypedDict):
+    email: Email
+    quantity: Quantity
+    price: Price
+    aliases: set[Email]
+    count: int
+
+
+def test_register_scalar_subclasses():
+    codec = register(Listing)
+    item = codec.encode(
+        Listing(
+            email=Email('bilbo@baggins.com'),
+            quantity=Quantity(3),
+            price=Price('9.99'),
+            aliases={Email('frodo@baggins.com')},
+            count=1000,
+        )
+    )
+    decoded = codec.decode(item | {'count': {'N': '1E+3'}})
+
+    assert type(decoded['email']) is Email
+    assert type(decoded['quantity']) is Quantity
+    assert type(decoded['price']) is Price
+    assert decoded['aliases'] == {'frodo@baggins.com'}
+    assert decoded['count'] == 1000
+
+    with pytest.raises(ValueError):
+        codec.decode(item | {'count': {'N': '1.5'}})
+
+
+def test_register_reads_items_written_by_serialize():
+    class Tags(TypedDict):
+        tags: list[str]
+
+    assert register(Tags).decode(serialize({'tags': ['a']})) == {'tags': ['a']}
+
+
+def test_register_schema_mismatch():
+    class Invalid(TypedDict):
+        name: str
+        values: list[object]
+
+    with pytest.raises(TypeError, match='Invalid.values'):
+        register(Invalid)
+
+    with pytest.raises(TypeError):
+        register(dict)
+
+
+def test_serialize_passes_through_serialized():
+    item = Serialized({'pk': {'S': 'USER'}, 'sk': {'S': '0'}})
+    assert serialize(item) is item
+
+    lazy = LazyItem(item)
+    assert serialize(lazy) == item
+    assert serialize({'old': lazy, 'name': Serialized({'S': 'Bilbo'})}) == {
+        'old': {'M': item},
+        'name': {'S': 'Bilbo'},
+    }
+
+
+def test_item_size():
+    assert attribute_value_size({'S': 'Bilbo'}) == 5
+    assert attribute_value_size({'S': 'ü'}) == 2
+    assert attribute_value_size({'N': '123'}) == 3
+    assert attribute_value_size({'N': '-0.0012500'}) == 3
+    assert attribute_value_size({'BOOL': True}) == 1
+    assert attribute_value_size({'SS': ['a', 'bc']}) == 3
+    assert attribute_value_size({'L': [{'S': 'a'}, {'NULL': True}]}) == 3 + 2 + 2
+    assert attribute_value_size({'M': {'ab': {'S': 'c'}}}) == 3 + 2 + 1 + 1
+    assert item_size({'pk': {'S': 'USER'}, 'sk': {'S': '0'}}) == 2 + 4 + 2 + 1
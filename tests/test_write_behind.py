@@ -0,0 +1,161 @@
+import time
+from decimal import Decimal
+
+import pytest
+
+from dynamodx.expressions import (
+    Add,
+    Attr,
+    Delete,
+    Remove,
+    Set,
+    UpdateExpr,
+    apply,
+    if_not_exists,
+)
+from dynamodx.transact_writer import TransactionOperationFailed
+from dynamodx.types import deserialize, serialize
+from dynamodx.write_behind import WriteBehindBuffer
+
+KEY = {'pk': 'COUNTER', 'sk': '0'}
+
+
+def get_item(client, key: dict = KEY) -> dict | None:
+    item = client.get_item(TableName='pytest', Key=serialize(key)).get('Item')
+    return deserialize(item) if item else None
+
+
+def test_merge_increments(dynamodb_client):
+    stats = []
+
+    with WriteBehindBuffer(
+        'pytest',
+        client=dynamodb_client,
+        max_delay=None,
+        on_flush=stats.append,
+    ) as buffer:
+        for _ in range(100):
+            buffer.update(KEY, UpdateExpr(Add(views=Decimal(1))))
+            buffer.update(KEY, UpdateExpr(Set(clicks=if_not_exists(clicks=0) + 2)))
+
+        buffer.update(KEY, UpdateExpr(Set(clicks=Decimal(1), operand='-')))
+
+    assert get_item(dynamodb_client) == KEY | {'views': 100, 'clicks': 199}
+    assert [(s['writes'], s['merged'], s['updates']) for s in stats] == [(201, 200, 1)]
+    assert (buffer.writes, buffer.merged) == (201, 200)
+
+
+# Each sequence is written through the buffer and compared with
+# the same updates applied one at a time
+SEQUENCES = [
+    pytest.param(
+        [Set(n=Decimal(5)), Add(n=Decimal(2)), Set(n=if_not_exists(n=0) - 1)],
+        {},
+        id='set-then-increment',
+    ),
+    pytest.param(
+        [Set(n=Decimal(1), operand='+'), Set(n=Decimal(3), operand='-')],
+        {'n': 10},
+        id='plus-minus',
+    ),
+    pytest.param(
+        [Add(n=Decimal(1)), Set(n=Decimal(7))],
+        {'n': 10},
+        id='last-set-wins',
+    ),
+    pytest.param(
+        [Add(emails={'a'}), Add(emails={'b'}), Delete(tags={'x'}), Delete(tags={'y'})],
+        {'tags': {'x', 'y', 'z'}},
+        id='sets',
+    ),
+    pytest.param(
+        [Set(name='Frodo'), Remove('name'), Add(n=Decimal(1))],
+        {'name': 'Bilbo'},
+        id='remove',
+    ),
+    pytest.param(
+        [Add(n=Decimal(1)), Set(total=if_not_exists(n=0) + 1), Add(n=Decimal(1))],
+        {},
+        id='reads-pending',
+    ),
+    pytest.param(
+        [Remove('n'), Add(n=Decimal(1))],
+        {'n': 10},
+        id='cannot-combine',
+    ),
+]
+
+
+@pytest.mark.parametrize(('actions', 'item'), SEQUENCES)
+def test_merge_matches_sequential(dynamodb_client, actions, item):
+    dynamodb_client.put_item(TableName='pytest', Item=serialize(KEY | item))
+    expected = KEY | item
+
+    with WriteBehindBuffer('pytest', client=dynamodb_client, max_delay=None) as buffer:
+        for action in actions:
+            buffer.update(KEY, UpdateExpr(action))
+            expected = apply(UpdateExpr(action), expected)
+
+    assert get_item(dynamodb_client) == expected
+
+
+def test_flush_on_max_keys(dynamodb_client):
+    stats = []
+
+    with WriteBehindBuffer(
+        'pytest',
+        client=dynamodb_client,
+        max_keys=10,
+        max_delay=None,
+        on_flush=stats.append,
+    ) as buffer:
+        for idx in range(25):
+            buffer.update(KEY | {'sk': str(idx)}, UpdateExpr(Add(n=Decimal(2))))
+
+        assert [s['updates'] for s in stats] == [10, 10]
+
+    assert [s['updates'] for s in stats] == [10, 10, 5]
+    assert get_item(dynamodb_client, KEY | {'sk': '24'}) == KEY | {'sk': '24', 'n': 2}
+
+
+def test_flush_on_max_delay(dynamodb_client):
+    with WriteBehindBuffer('pytest', client=dynamodb_client, max_delay=0.01) as buffer:
+        buffer.update(KEY, UpdateExpr(Add(n=Decimal(1))))
+
+        for _ in range(100):
+            if get_item(dynamodb_client):
+                break
+
+            time.sleep(0.01)
+
+        assert get_item(dynamodb_client) == KEY | {'n': 1}
+
+
+def test_background_flush_error(dynamodb_client):
+    buffer = WriteBehindBuffer('pytest', client=dynamodb_client, max_delay=0.01)
+    # `+` fails on a missing attribute
+    buffer.update(KEY, UpdateExpr(Set(n=Decimal(1), operand='+')))
+
+    with pytest.raises(TransactionOperationFailed):
+        for _ in range(100):
+            time.sleep(0.01)
+            buffer.update(KEY | {'sk': '1'}, UpdateExpr(Add(n=Decimal(1))))
+
+    # The error is raised once
+    buffer.close()
+
+
+def test_conditional_update():
+    buffer = WriteBehindBuffer('pytest', client=object(), max_delay=None)
+
+    with pytest.raises(ValueError):
+        buffer.update(KEY, UpdateExpr(Add(n=Decimal(1)), cond=Attr('n').exists()))
+
+
+def test_dependent_updates_stay_apart(dynamodb_client):
+    with WriteBehindBuffer('pytest', client=dynamodb_client) as buffer:
+        buffer.update(KEY, UpdateExpr(Set(a=1)))
+        # The writer mustn't merge them back into one update either
+        buffer.update(KEY, UpdateExpr(Set(b=if_not_exists(a=0))))
+
+    assert get_item(dynamodb_client) == {**KEY, 'a': 1, 'b': 1}